@@ -1,3 +1,10 @@
+from utils.constants import MODO_ADMIN, MODO_DEBUG
+from utils.import_timer import iniciar_cronometro, relatorio_importacao
+
+# Com PB_DEBUG=1, mede as importações desde o início (streamlit incluso na primeira execução)
+if MODO_DEBUG:
+    iniciar_cronometro()
+
 import streamlit as st
 from streamlit_option_menu import option_menu
 
@@ -12,46 +19,25 @@ st.set_page_config(
 )
 
 # =====================
-# IMPORTAÇÃO DOS MÓDULOS
+# REGISTRO DAS PÁGINAS
 # =====================
-from modules.home import home
-from modules.sobre import sobre
-from modules.mapa import mapa
-from modules.dashboard import dashboard_analitico
-from modules.plasticoInsert import inserir_plastico
-from modules.fungoInsert import inserir_fungo
-from modules.simbiose import simbiose
-from modules.predictor import predictor
+# Cada página é importada apenas quando selecionada pela primeira vez
+from utils.pages import PAGINAS, carregar_pagina
+from utils.cache import carregar_bytes, estatisticas_cache, memoria_cache
+from utils.image_pipeline import miniatura
 
 # =====================
 # SIDEBAR — MENU LATERAL
 # =====================
 with st.sidebar:
-    st.image("assets/logo.png", width=120)
+    st.image(carregar_bytes(miniatura("assets/logo.png", 240)), width=120)
     st.markdown("### Plastic Busters")
     st.markdown("IA • Biotecnologia • Remediação")
 
     escolha = option_menu(
         menu_title="Navegação",
-        options=[
-            "Home",
-            "Mapa",
-            "Dashboard",
-            "Preditor",
-            "Inserir Plástico",
-            "Inserir Fungo",
-            "Sobre"
-        ],
-        icons=[
-            "house",
-            "map",
-            "bar-chart",
-            "robot",
-            "box-seam",
-            "bug",
-            "info-circle",
-            
-        ],
+        options=list(PAGINAS),
+        icons=[icone for _, _, icone in PAGINAS.values()],
         menu_icon="cast",
         default_index=0
     )
@@ -62,23 +48,20 @@ with st.sidebar:
 # =====================
 # CONTEÚDO PRINCIPAL
 # =====================
-if escolha == "Home":
-    home()
-
-elif escolha == "Mapa":
-    mapa()
-
-elif escolha == "Dashboard":
-    dashboard_analitico()
+carregar_pagina(escolha)()
 
-elif escolha == "Inserir Plástico":
-    inserir_plastico()
-
-elif escolha == "Inserir Fungo":
-    inserir_fungo()
-
-elif escolha == "Sobre":
-    sobre()
+# =====================
+# DIAGNÓSTICO DE INICIALIZAÇÃO
+# =====================
+if MODO_DEBUG:
+    with st.sidebar.expander("⏱️ Tempo de importação"):
+        st.dataframe(relatorio_importacao(), use_container_width=True, hide_index=True)
 
-elif escolha == "Preditor":
-    predictor()
+with st.sidebar.expander("🗃️ Cache"):
+    memoria = memoria_cache()
+    st.caption(f"Memória: {memoria['usada_mb']} / {memoria['limite_mb']} MB")
+    st.dataframe(estatisticas_cache(), use_container_width=True, hide_index=True)
+    if MODO_ADMIN and st.button("🧹 Remover imagens sem referência"):
+        from core.blob_store import obter_blob_store
+        resumo = obter_blob_store().coletar_lixo()
+        st.caption(f"{resumo['removidos']} blob(s) removido(s), {resumo['liberados_mb']} MB liberados.")
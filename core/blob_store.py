@@ -0,0 +1,152 @@
+"""
+Módulo: blob_store.py
+Descrição: Armazenamento de imagens endereçado por conteúdo (SHA-256, diretórios em shards).
+           Conteúdo idêntico é gravado uma única vez, as gravações são feitas em fluxo e os
+           blobs sem referência de nenhum cadastro são removidos pela coleta de lixo.
+Autor: Samuel
+Data: 2025
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+
+from core.record_store import obter_record_store
+from utils.constants import BLOB_CONFIG
+from utils.logger import registrar_evento, registrar_erro
+
+# =============================================================================
+# 🗃️ Classe Principal — BlobStore
+# =============================================================================
+
+class BlobStore:
+    """
+    Blobs em <dir>/ab/cd/<sha256>. As referências (quais registros usam cada blob) ficam
+    no banco de cadastros e são gravadas na mesma transação do registro.
+    """
+
+    def __init__(self, diretorio: str = None, record_store=None):
+        self.diretorio = diretorio or BLOB_CONFIG["dir"]
+        self.bloco = BLOB_CONFIG["bloco"]
+        self.records = record_store or obter_record_store()
+        os.makedirs(self.diretorio, exist_ok=True)
+
+    def caminho(self, hash_blob: str) -> str:
+        return os.path.join(self.diretorio, hash_blob[:2], hash_blob[2:4], hash_blob)
+
+    def existe(self, hash_blob: str) -> bool:
+        return os.path.exists(self.caminho(hash_blob))
+
+    def _renovar(self, hash_blob: str) -> bool:
+        """
+        Atualiza o mtime de um blob reaproveitado para que a coleta de lixo o trate
+        como recém-gravado durante a carência. False se o blob não existe.
+        """
+        try:
+            os.utime(self.caminho(hash_blob))
+            return True
+        except FileNotFoundError:
+            return False
+
+    # -------------------------------------------------------------------------
+    # ✍️ Escrita em fluxo
+    # -------------------------------------------------------------------------
+    def guardar(self, fluxo) -> str:
+        """
+        Grava o conteúdo de um arquivo aberto (ou UploadedFile do Streamlit) e devolve o hash.
+        Fluxos com seek são lidos uma vez só para o hash: conteúdo repetido não é reescrito.
+        Fluxos sem seek são copiados para um temporário enquanto o hash é calculado.
+        """
+        if hasattr(fluxo, "seek") and getattr(fluxo, "seekable", lambda: True)():
+            fluxo.seek(0)
+            h = hashlib.sha256()
+            for bloco in iter(lambda: fluxo.read(self.bloco), b""):
+                h.update(bloco)
+            hash_blob = h.hexdigest()
+            if not self._renovar(hash_blob):
+                fluxo.seek(0)
+                self._gravar(fluxo, hash_blob)
+            return hash_blob
+        return self._gravar(fluxo)
+
+    def _gravar(self, fluxo, hash_esperado: str = None) -> str:
+        fd, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".tmp")
+        try:
+            h = hashlib.sha256()
+            with os.fdopen(fd, "wb") as saida:
+                for bloco in iter(lambda: fluxo.read(self.bloco), b""):
+                    h.update(bloco)
+                    saida.write(bloco)
+            hash_blob = h.hexdigest()
+            if hash_esperado and hash_blob != hash_esperado:
+                raise IOError("Conteúdo mudou durante a gravação do blob.")
+
+            destino = self.caminho(hash_blob)
+            if self._renovar(hash_blob):
+                os.remove(temporario)
+            else:
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                os.replace(temporario, destino)  # atômico: nunca há blob pela metade
+            return hash_blob
+        except Exception:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+
+    def guardar_arquivo(self, caminho: str) -> str:
+        with open(caminho, "rb") as f:
+            return self.guardar(f)
+
+    # -------------------------------------------------------------------------
+    # 🧹 Coleta de lixo
+    # -------------------------------------------------------------------------
+    def coletar_lixo(self, carencia_s: float = None) -> dict:
+        """
+        Remove blobs sem referência com mais de `carencia_s` segundos (a carência protege
+        uploads recém-gravados cujo registro ainda não foi salvo) e temporários abandonados.
+        """
+        carencia_s = BLOB_CONFIG["carencia_gc"] if carencia_s is None else carencia_s
+        limite = time.time() - carencia_s
+        referenciados = self.records.hashes_referenciados()
+        removidos, liberados = 0, 0
+
+        for raiz, _, arquivos in os.walk(self.diretorio):
+            for nome in arquivos:
+                caminho = os.path.join(raiz, nome)
+                try:
+                    info = os.stat(caminho)
+                    if nome in referenciados or info.st_mtime > limite:
+                        continue
+                    os.remove(caminho)
+                    removidos += 1
+                    liberados += info.st_size
+                except OSError as e:
+                    registrar_erro("BlobStore_GC", e)
+
+        resumo = {"removidos": removidos, "liberados_mb": round(liberados / 1024 / 1024, 2)}
+        registrar_evento(f"BlobStore: coleta de lixo {resumo}")
+        return resumo
+
+    def estatisticas(self) -> dict:
+        total, tamanho = 0, 0
+        for raiz, _, arquivos in os.walk(self.diretorio):
+            for nome in arquivos:
+                if not nome.endswith(".tmp"):
+                    total += 1
+                    tamanho += os.path.getsize(os.path.join(raiz, nome))
+        return {
+            "blobs": total,
+            "tamanho_mb": round(tamanho / 1024 / 1024, 2),
+            "referencias": self.records.total_referencias(),
+        }
+
+
+_instancia = None
+
+
+def obter_blob_store() -> BlobStore:
+    global _instancia
+    if _instancia is None:
+        _instancia = BlobStore()
+    return _instancia
@@ -0,0 +1,236 @@
+"""
+Módulo: bulk_import.py
+Descrição: Importação em lote de fungos e plásticos (CSV/JSONL + imagens em .zip) com
+           validação vetorizada, deduplicação pelo nome científico, gravação numa única
+           transação e relatório de progresso. Inclui a conversão do catálogo de
+           degradadores (dump SQL) em cadastros.
+Autor: Samuel
+Data: 2025
+"""
+
+import io
+import os
+import time
+import zipfile
+
+import pandas as pd
+from core.degraders_catalog import carregar_catalogo_degradadores
+from core.blob_store import obter_blob_store
+from core.record_store import CAMPO_BLOB, chave_nome, obter_record_store
+from core.taxonomy_index import registrar_fungos_na_taxonomia
+from utils.image_pipeline import gerar_miniaturas
+from utils.logger import registrar_evento, registrar_erro
+
+# =============================================================================
+# 📋 Esquemas dos cadastros
+# =============================================================================
+
+CAMPOS_CADASTRO = {
+    "fungos": ["nome_cientifico", "taxonomia", "enzima", "degradacao", "maturacao", "imagem"],
+    "polimeros": ["nome_cientifico", "nome_popular", "estrutura_molecular", "formula",
+                  "aplicacao", "tempo_deterioracao", "imagem"],
+}
+
+TAMANHO_MAX_NOME = 200
+
+# Filos de fungos presentes na linhagem do catálogo (superkingdom:Eukaryota,phylum:...)
+FILOS_FUNGOS = {
+    "Ascomycota", "Basidiomycota", "Mucoromycota", "Chytridiomycota",
+    "Zoopagomycota", "Glomeromycota", "Blastocladiomycota", "Microsporidia",
+}
+
+# =============================================================================
+# 📥 Leitura
+# =============================================================================
+
+def ler_arquivo(arquivo, nome: str = None) -> pd.DataFrame:
+    """
+    Lê CSV ou JSONL (caminho ou arquivo enviado). Tudo como texto: a validação decide.
+    """
+    nome = (nome or getattr(arquivo, "name", None) or str(arquivo)).lower()
+    if nome.endswith((".jsonl", ".ndjson")):
+        df = pd.read_json(arquivo, lines=True, dtype=False)
+    else:
+        df = pd.read_csv(arquivo, dtype=str, keep_default_na=False)
+    df.columns = df.columns.str.strip().str.lower()
+    return df
+
+
+# =============================================================================
+# ✅ Validação e deduplicação
+# =============================================================================
+
+def validar(df: pd.DataFrame, colecao: str, nomes_existentes: set = None) -> dict:
+    """
+    Valida todas as linhas de uma vez (operações por coluna) e separa:
+    validos, invalidos (com motivo), duplicados no próprio arquivo e já cadastrados.
+    """
+    campos = CAMPOS_CADASTRO[colecao]
+    df = df.reindex(columns=campos).fillna("").astype(str).apply(lambda c: c.str.strip())
+    df.index = pd.RangeIndex(2, len(df) + 2, name="linha")  # numeração como no arquivo CSV
+
+    nome = df["nome_cientifico"]
+    motivo = pd.Series("", index=df.index)
+    motivo = motivo.mask(nome.str.len() > TAMANHO_MAX_NOME, f"nome_cientifico com mais de {TAMANHO_MAX_NOME} caracteres")
+    motivo = motivo.mask(nome == "", "nome_cientifico vazio")
+    invalidos = motivo != ""
+
+    chave = nome.map(chave_nome)   # mesma normalização da coluna nome_chave do banco
+    repetidos_arquivo = ~invalidos & chave.duplicated(keep="first")
+    ja_cadastrados = ~invalidos & ~repetidos_arquivo & chave.isin(nomes_existentes or set())
+    validos = ~(invalidos | repetidos_arquivo | ja_cadastrados)
+
+    return {
+        "validos": df[validos],
+        "invalidos": df[invalidos].assign(motivo=motivo[invalidos]),
+        "duplicados_arquivo": df[repetidos_arquivo],
+        "ja_cadastrados": df[ja_cadastrados],
+    }
+
+
+# =============================================================================
+# 🖼️ Imagens do .zip
+# =============================================================================
+
+def _extrair_imagens(zip_imagens, nomes) -> dict:
+    """
+    Grava no BlobStore, em fluxo, as imagens do .zip referenciadas pelos registros.
+    Devolve {nome do arquivo: hash}; imagens repetidas no .zip ocupam um único blob.
+    """
+    hashes = {}
+    if zip_imagens is None:
+        return hashes
+    blobs = obter_blob_store()
+    with zipfile.ZipFile(zip_imagens) as zf:
+        membros = {os.path.basename(m.filename): m for m in zf.infolist() if not m.is_dir()}
+        for nome in set(nomes) & set(membros):
+            with zf.open(membros[nome]) as origem:
+                hashes[nome] = blobs.guardar(origem)
+            gerar_miniaturas(blobs.caminho(hashes[nome]))
+    return hashes
+
+
+# =============================================================================
+# 🚀 Importação
+# =============================================================================
+
+def importar_registros(df: pd.DataFrame, colecao: str, zip_imagens=None, progresso=None) -> dict:
+    """
+    Valida, deduplica e grava os registros numa única transação.
+    `progresso(fracao, mensagem)` é chamado a cada etapa (p.ex. st.progress).
+    Retorna o relatório da importação.
+    """
+    avisar = progresso or (lambda fracao, mensagem: None)
+    inicio = time.perf_counter()
+    relatorio = {"colecao": colecao, "total": len(df), "inseridos": 0, "invalidos": 0,
+                 "duplicados_arquivo": 0, "ja_cadastrados": 0, "imagens": 0,
+                 "imagens_ausentes": 0, "tempo_s": 0.0, "erro": None, "detalhes_invalidos": pd.DataFrame()}
+    try:
+        store = obter_record_store()
+        avisar(0.1, "Validando linhas...")
+        partes = validar(df, colecao, store.nomes_existentes(colecao))
+        validos = partes["validos"]
+
+        avisar(0.4, "Copiando imagens...")
+        referencias = validos.loc[validos["imagem"] != "", "imagem"]
+        encontradas = _extrair_imagens(zip_imagens, referencias)
+        sem_imagem = (validos["imagem"] != "") & ~validos["imagem"].isin(list(encontradas))
+        if zip_imagens is not None:
+            validos = validos.assign(
+                imagem=validos["imagem"].mask(sem_imagem, ""),
+                **{CAMPO_BLOB: validos["imagem"].map(encontradas).fillna("")},
+            )
+
+        avisar(0.7, f"Gravando {len(validos)} registro(s)...")
+        registros = validos.replace({"": None}).to_dict(orient="records")
+        store.inserir_varios(colecao, registros)
+        if colecao == "fungos":
+            registrar_fungos_na_taxonomia(registros)
+
+        relatorio.update(
+            inseridos=len(registros), invalidos=len(partes["invalidos"]),
+            duplicados_arquivo=len(partes["duplicados_arquivo"]), ja_cadastrados=len(partes["ja_cadastrados"]),
+            imagens=len(encontradas), imagens_ausentes=int(sem_imagem.sum()) if zip_imagens is not None else 0,
+            detalhes_invalidos=partes["invalidos"].reset_index(),
+        )
+    except Exception as e:
+        registrar_erro("BulkImport", e)
+        relatorio["erro"] = str(e)
+
+    relatorio["tempo_s"] = round(time.perf_counter() - inicio, 3)
+    avisar(1.0, "Importação concluída.")
+    registrar_evento(
+        f"Importação em lote ({colecao}): {relatorio['inseridos']}/{relatorio['total']} inseridos, "
+        f"{relatorio['ja_cadastrados']} já cadastrados, {relatorio['invalidos']} inválidos "
+        f"em {relatorio['tempo_s']}s."
+    )
+    return relatorio
+
+
+def importar_arquivo(arquivo, colecao: str, zip_imagens=None, progresso=None) -> dict:
+    """
+    Atalho: lê o CSV/JSONL e importa.
+    """
+    try:
+        dados = arquivo.getvalue() if hasattr(arquivo, "getvalue") else None
+        df = ler_arquivo(io.BytesIO(dados) if dados is not None else arquivo, getattr(arquivo, "name", None))
+    except Exception as e:
+        registrar_erro("BulkImport_Leitura", e)
+        return {"colecao": colecao, "total": 0, "inseridos": 0, "erro": f"Arquivo ilegível: {e}"}
+    return importar_registros(df, colecao, zip_imagens, progresso)
+
+
+# =============================================================================
+# 🦠 Conversão do catálogo de degradadores
+# =============================================================================
+
+def _taxonomia(linhagem: pd.Series) -> pd.Series:
+    """
+    "superkingdom:Eukaryota,phylum:Ascomycota,class:...," → "Fungi > Ascomycota > ...".
+    """
+    niveis = ["phylum", "class", "order", "family", "genus"]
+    partes = pd.concat(
+        [linhagem.str.extract(fr"{n}:([^,]+)", expand=False) for n in niveis], axis=1
+    )
+    unidos = partes.fillna("").agg("|".join, axis=1).str.strip("|").str.replace(r"\|+", " > ", regex=True)
+    return "Fungi > " + unidos
+
+
+def registros_do_catalogo(colecao: str) -> pd.DataFrame:
+    """
+    Cadastros derivados do catálogo de degradadores, um por nome científico:
+    fungos (filos de fungos na linhagem) com enzimas e plásticos agregados,
+    ou polímeros com o tempo de deterioração sem fungos.
+    """
+    catalogo = carregar_catalogo_degradadores()
+    if catalogo.empty:
+        return pd.DataFrame(columns=CAMPOS_CADASTRO[colecao])
+
+    if colecao == "polimeros":
+        plasticos = catalogo[catalogo["Plastic"] != ""].drop_duplicates("Plastic")
+        return pd.DataFrame({
+            "nome_cientifico": plasticos["Plastic"],
+            "nome_popular": plasticos["Plastic"],
+            "tempo_deterioracao": plasticos["dec-plastic-sem-fungi"],
+        })
+
+    filo = catalogo["lineage"].str.extract(r"phylum:([^,]+)", expand=False)
+    fungos = catalogo[filo.isin(FILOS_FUNGOS)]
+    unir = lambda c: ", ".join(sorted({v for v in c if v and v.lower() != "no"}))
+    agrupado = fungos.groupby("Microorganism", sort=False).agg(
+        lineage=("lineage", "first"),
+        enzima=("Enzyme", unir),
+        degradacao=("Plastic", unir),
+        maturacao=("dec-plastic-com-fungi", "first"),
+    ).reset_index()
+    return pd.DataFrame({
+        "nome_cientifico": agrupado["Microorganism"],
+        "taxonomia": _taxonomia(agrupado["lineage"]),
+        "enzima": agrupado["enzima"],
+        "degradacao": agrupado["degradacao"],
+        "maturacao": agrupado["maturacao"],
+    })
+
+
+def importar_catalogo(colecao: str, progresso=None) -> dict:
+    return importar_registros(registros_do_catalogo(colecao), colecao, progresso=progresso)
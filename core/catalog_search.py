@@ -0,0 +1,195 @@
+"""
+Módulo: catalog_search.py
+Descrição: Índice de texto completo (SQLite FTS5) sobre o catálogo de degradadores:
+           busca por organismo, plástico, enzima, referência ou local de isolamento,
+           com prefixos, sem distinção de acentos, ranking BM25 e facetas por plástico
+           e ambiente. O índice é sincronizado de forma incremental com o catálogo.
+Autor: Samuel
+Data: 2025
+"""
+
+import hashlib
+import heapq
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+from core.degraders_catalog import carregar_catalogo_degradadores
+from utils.cache import cache_recurso, hash_arquivo
+from utils.constants import CATALOG_SEARCH_CONFIG, DEGRADERS_SQL_PATH
+from utils.logger import registrar_evento, registrar_erro
+
+COLUNAS = list(CATALOG_SEARCH_CONFIG["colunas"])
+
+# =============================================================================
+# 🔎 Classe Principal — BuscaCatalogo
+# =============================================================================
+
+class BuscaCatalogo:
+    """
+    Tabela FTS5 com uma linha por registro distinto do catálogo. A coluna `assinatura`
+    (hash dos campos indexados, não indexada) permite sincronizar só o que mudou.
+    """
+
+    def __init__(self, caminho_db: str = None):
+        self.caminho_db = caminho_db or CATALOG_SEARCH_CONFIG["db"]
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(self.caminho_db)), exist_ok=True)
+
+        conn = self._conexao()
+        with conn:
+            conn.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS catalogo_fts USING fts5(
+                    {", ".join(COLUNAS)}, assinatura UNINDEXED,
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '2 3 4'
+                )
+            """)
+            conn.execute("CREATE TABLE IF NOT EXISTS estado (chave TEXT PRIMARY KEY, valor TEXT)")
+
+    def _conexao(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.caminho_db, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def __len__(self):
+        return self._conexao().execute("SELECT COUNT(*) FROM catalogo_fts").fetchone()[0]
+
+    # -------------------------------------------------------------------------
+    # 🔄 Sincronização incremental
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _assinaturas(df: pd.DataFrame) -> pd.Series:
+        texto = df[COLUNAS].astype(str).agg("\x1f".join, axis=1)
+        return texto.map(lambda t: hashlib.sha1(t.encode("utf-8")).hexdigest())
+
+    def sincronizar(self, catalogo: pd.DataFrame, versao: str = None) -> dict:
+        """
+        Insere os registros novos e remove os que saíram do catálogo, numa transação.
+        Registros idênticos (mesmos campos indexados) entram uma única vez.
+        """
+        conn = self._conexao()
+        if versao and self.versao() == versao:
+            return {"inseridos": 0, "removidos": 0}
+
+        df = catalogo.reindex(columns=COLUNAS).fillna("").astype(str)
+        df = df.assign(assinatura=self._assinaturas(df)).drop_duplicates("assinatura")
+        existentes = dict(conn.execute("SELECT assinatura, rowid FROM catalogo_fts"))
+        atuais = set(df["assinatura"])
+
+        novos = df[~df["assinatura"].isin(list(existentes))]
+        removidos = [rowid for assinatura, rowid in existentes.items() if assinatura not in atuais]
+        with conn:
+            conn.executemany("DELETE FROM catalogo_fts WHERE rowid = ?", [(r,) for r in removidos])
+            conn.executemany(
+                f"INSERT INTO catalogo_fts ({', '.join(COLUNAS)}, assinatura) "
+                f"VALUES ({', '.join('?' * (len(COLUNAS) + 1))})",
+                novos[COLUNAS + ["assinatura"]].itertuples(index=False, name=None)
+            )
+            if versao:
+                conn.execute("INSERT OR REPLACE INTO estado VALUES ('versao', ?)", (versao,))
+        if len(novos) or removidos:
+            conn.execute("INSERT INTO catalogo_fts (catalogo_fts) VALUES ('optimize')")
+        return {"inseridos": len(novos), "removidos": len(removidos)}
+
+    def versao(self):
+        linha = self._conexao().execute("SELECT valor FROM estado WHERE chave = 'versao'").fetchone()
+        return linha[0] if linha else None
+
+    # -------------------------------------------------------------------------
+    # 🔎 Consulta
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def expressao(texto: str) -> str:
+        """
+        Texto livre → consulta FTS5: cada palavra vira um prefixo entre aspas (sem
+        operadores vindos do usuário) e todas precisam aparecer. Palavras de uma letra
+        são ignoradas: casariam com quase todo o catálogo e ficam fora do índice de prefixos.
+        """
+        termos = [t for t in re.findall(r"\w+", texto or "") if len(t) > 1]
+        return " ".join(f'"{t}"*' for t in termos)
+
+    def buscar(self, texto: str, filtros: dict = None, limite: int = None) -> dict:
+        """
+        Resultados ordenados por BM25 (pesos por coluna em CATALOG_SEARCH_CONFIG) e
+        contagens por faceta sobre todos os resultados, antes do limite.
+        `filtros` = {coluna da faceta: valor} restringe resultados e facetas.
+        """
+        limite = limite or CATALOG_SEARCH_CONFIG["limite"]
+        consulta = self.expressao(texto)
+        condicoes, parametros = [], []
+        if consulta:
+            condicoes.append("catalogo_fts MATCH ?")
+            parametros.append(consulta)
+        for coluna, valor in (filtros or {}).items():
+            if coluna in COLUNAS and valor:
+                condicoes.append(f"{coluna} = ?")
+                parametros.append(valor)
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+
+        # Uma única passada pelo índice: rowid, relevância e colunas das facetas de todos os
+        # resultados; as facetas e o corte saem daí, e só os `limite` primeiros são lidos inteiros.
+        pesos = ", ".join(str(p) for p in CATALOG_SEARCH_CONFIG["colunas"].values())
+        relevancia = f"-bm25(catalogo_fts, {pesos})" if consulta else "0.0"
+        nomes_facetas = CATALOG_SEARCH_CONFIG["facetas"]
+        conn = self._conexao()
+        achados = conn.execute(
+            f"SELECT rowid, {relevancia}, {', '.join(nomes_facetas)} FROM catalogo_fts {where}", parametros
+        ).fetchall()
+        facetas = {
+            coluna: pd.DataFrame(
+                Counter(linha[2 + i] for linha in achados).most_common(), columns=["valor", "registros"]
+            )
+            for i, coluna in enumerate(nomes_facetas)
+        }
+
+        topo = heapq.nlargest(limite, achados, key=lambda linha: linha[1]) if consulta else achados[:limite]
+        detalhes = dict(
+            (linha[0], linha[1:]) for linha in conn.execute(
+                f"SELECT rowid, {', '.join(COLUNAS)} FROM catalogo_fts "
+                f"WHERE rowid IN ({', '.join('?' * len(topo))})",
+                [linha[0] for linha in topo]
+            )
+        )
+        resultados = pd.DataFrame(
+            [(*detalhes[linha[0]], round(linha[1], 3)) for linha in topo], columns=COLUNAS + ["relevancia"]
+        )
+        return {"resultados": resultados, "facetas": facetas, "total": len(achados)}
+
+
+# =============================================================================
+# 🧰 Índice do catálogo de degradadores
+# =============================================================================
+
+@cache_recurso(arquivos=("caminho",))
+def obter_busca_catalogo(caminho: str = DEGRADERS_SQL_PATH) -> BuscaCatalogo:
+    """
+    Índice sincronizado com a versão atual do catálogo (pelo hash do arquivo).
+    """
+    busca = BuscaCatalogo()
+    versao = hash_arquivo(caminho)
+    if busca.versao() != versao:
+        inicio = time.perf_counter()
+        resumo = busca.sincronizar(carregar_catalogo_degradadores(caminho), versao)
+        registrar_evento(
+            f"Índice textual do catálogo sincronizado: {resumo['inseridos']} inserido(s), "
+            f"{resumo['removidos']} removido(s) em {time.perf_counter() - inicio:.2f}s."
+        )
+    return busca
+
+
+def buscar_catalogo(texto: str, filtros: dict = None, limite: int = None) -> dict:
+    vazio = {"resultados": pd.DataFrame(columns=COLUNAS + ["relevancia"]), "facetas": {}, "total": 0}
+    try:
+        return obter_busca_catalogo().buscar(texto, filtros, limite)
+    except Exception as e:
+        registrar_erro("CatalogSearch", e)
+        return vazio
@@ -0,0 +1,310 @@
+"""
+Módulo: columnar_store.py
+Descrição: Armazenamento colunar dos datasets processados. Cada dataset é gravado em Parquet
+           particionado (diretórios coluna=valor, ex.: plastic_type=PET) e registrado em um
+           catálogo JSON com as partições, o número de linhas e estatísticas (mín., máx., nulos)
+           de cada arquivo. A leitura projeta só as colunas pedidas e descarta, pelo catálogo,
+           os arquivos que não podem conter linhas que atendam aos filtros. Cada gravação
+           vai para um subdiretório de versão que só passa a valer pelo catálogo.
+Autor: Samuel
+Data: 2025
+"""
+
+import json
+import operator
+import os
+import shutil
+import threading
+import time
+import uuid
+from urllib.parse import quote
+
+import pandas as pd
+from core.dataset_snapshots import registrar_snapshot
+from utils.cache import cache_recurso
+from utils.constants import COLUMNAR_STORE_CONFIG
+from utils.logger import registrar_evento
+
+NULO = "__nulo__"   # nome de diretório para valores de partição ausentes
+
+_OPERADORES = {
+    "=": operator.eq, "==": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+}
+
+# Etapas paralelas do pipeline podem gravar datasets ao mesmo tempo
+_trava_catalogo = threading.Lock()
+
+# =============================================================================
+# 🗂️ Catálogo
+# =============================================================================
+
+@cache_recurso(arquivos=("caminho",))
+def _ler_catalogo(caminho: str) -> dict:
+    with open(caminho, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def catalogo(caminho: str = None) -> dict:
+    """
+    Datasets registrados: {nome: {particoes, colunas, linhas, arquivos: [...]}}.
+    """
+    caminho = caminho or COLUMNAR_STORE_CONFIG["catalogo"]
+    return _ler_catalogo(caminho) if os.path.exists(caminho) else {}
+
+
+def _registrar_no_catalogo(nome: str, entrada: dict, caminho: str):
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            todos = json.load(f)
+    except (OSError, ValueError):
+        todos = {}
+    todos[nome] = entrada
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(todos, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+
+def _estatisticas(df: pd.DataFrame) -> dict:
+    """
+    Mínimo, máximo e nulos por coluna (textos comparados como texto).
+    """
+    estatisticas = {}
+    for coluna in df.columns:
+        serie = df[coluna]
+        info = {"nulos": int(serie.isna().sum())}
+        validos = serie.dropna()
+        if len(validos) and pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+            info.update(min=float(validos.min()), max=float(validos.max()))
+        elif len(validos) and not pd.api.types.is_datetime64_any_dtype(serie):
+            textos = validos.astype(str)
+            info.update(min=textos.min(), max=textos.max())
+        estatisticas[coluna] = info
+    return estatisticas
+
+
+# =============================================================================
+# ✍️ Gravação
+# =============================================================================
+
+def _remover_versoes_antigas(base: str, manter: set):
+    """
+    Apaga de <dir>/<nome>/ o que não está em `manter` (gravações em andamento, ocultas, ficam).
+    """
+    for item in os.listdir(base):
+        if item in manter or item.startswith("."):
+            continue
+        caminho = os.path.join(base, item)
+        if os.path.isdir(caminho):
+            shutil.rmtree(caminho, ignore_errors=True)
+        else:
+            os.remove(caminho)
+
+
+def gravar_dataset(df: pd.DataFrame, nome: str, particoes=None) -> dict:
+    """
+    Grava `df` como Parquet particionado em <dir>/<nome>/<versão>/ e atualiza o catálogo.
+    Cada gravação vai para um subdiretório novo e só passa a valer quando o catálogo
+    aponta para ele: leitores nunca veem catálogo e arquivos de versões diferentes.
+    A versão anterior é mantida (para quem ainda lê pelo catálogo antigo) e as mais
+    velhas são apagadas. Cada conteúdo novo vira um snapshot (core/dataset_snapshots.py).
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    cfg = COLUMNAR_STORE_CONFIG
+    particoes = list(cfg["particoes"].get(nome, []) if particoes is None else particoes)
+    base = os.path.join(cfg["dir"], nome)
+    os.makedirs(base, exist_ok=True)
+    versao = f"v{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    temporario = os.path.join(base, f".{versao}")
+    os.makedirs(temporario)
+
+    try:
+        grupos = df.groupby(particoes, dropna=False, observed=True, sort=True) if particoes else [((), df)]
+        arquivos = []
+        for valores, parte in grupos:
+            valores = valores if isinstance(valores, tuple) else (valores,)
+            particao = {c: (None if pd.isna(v) else str(v)) for c, v in zip(particoes, valores)}
+            diretorios = [f"{c}={NULO if v is None else quote(v, safe='')}" for c, v in particao.items()]
+            relativo = os.path.join(*diretorios, "parte-0.parquet")
+            os.makedirs(os.path.join(temporario, *diretorios), exist_ok=True)
+
+            dados = parte.drop(columns=particoes)
+            tabela = pa.Table.from_pandas(dados, preserve_index=False)
+            pq.write_table(tabela, os.path.join(temporario, relativo), compression=cfg["compressao"])
+            arquivos.append({
+                "caminho": relativo,
+                "particao": particao,
+                "linhas": len(parte),
+                "estatisticas": _estatisticas(dados),
+            })
+
+        os.replace(temporario, os.path.join(base, versao))
+    except Exception:
+        shutil.rmtree(temporario, ignore_errors=True)
+        raise
+
+    entrada = {
+        "caminho": f"{nome}/{versao}",   # relativo ao diretório do catálogo
+        "particoes": particoes,
+        "colunas": {c: str(t) for c, t in df.dtypes.items()},
+        "linhas": len(df),
+        "snapshot": registrar_snapshot(nome, df).get("id"),
+        "arquivos": arquivos,
+        "gravado_em": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    with _trava_catalogo:
+        anterior = catalogo(cfg["catalogo"]).get(nome, {}).get("caminho", "")
+        try:
+            _registrar_no_catalogo(nome, entrada, cfg["catalogo"])
+        except Exception:
+            shutil.rmtree(os.path.join(base, versao), ignore_errors=True)
+            raise
+        _remover_versoes_antigas(base, {versao, os.path.basename(anterior) if "/" in anterior else None})
+    registrar_evento(f"Dataset colunar '{nome}' gravado: {len(df)} linhas em {len(arquivos)} partição(ões).")
+    return entrada
+
+
+# =============================================================================
+# 🔍 Leitura com projeção e poda de partições
+# =============================================================================
+
+def normalizar_filtros(filtros) -> list:
+    """
+    Aceita {coluna: valor | lista} ou [(coluna, operador, valor)] e devolve a forma em tuplas.
+    Operadores: =, ==, !=, <, <=, >, >=, in, not in.
+    """
+    if not filtros:
+        return []
+    if isinstance(filtros, dict):
+        return [
+            (coluna, "in", list(valor)) if isinstance(valor, (list, tuple, set)) else (coluna, "=", valor)
+            for coluna, valor in filtros.items()
+        ]
+    return [tuple(f) for f in filtros]
+
+
+def _comparavel(valor, numerico: bool):
+    return float(valor) if numerico else str(valor)
+
+
+def _tipo_numerico(tipo: str) -> bool:
+    try:
+        return pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(tipo))
+    except TypeError:
+        return False
+
+
+def _pode_conter(arquivo: dict, filtros: list, tipos: dict) -> bool:
+    """
+    False só quando o valor da partição ou o intervalo [mín., máx.] da coluna no arquivo
+    garante que nenhuma linha atende ao filtro.
+    """
+    for coluna, op, valor in filtros:
+        try:
+            if coluna in arquivo["particao"]:
+                atual = arquivo["particao"][coluna]
+                if atual is None:
+                    if op not in ("!=", "not in"):
+                        return False
+                    continue
+                numerico = _tipo_numerico(tipos.get(coluna, "object"))
+                atual = _comparavel(atual, numerico)
+                if op in ("in", "not in"):
+                    presente = atual in {_comparavel(v, numerico) for v in valor}
+                    if presente != (op == "in"):
+                        return False
+                elif not _OPERADORES[op](atual, _comparavel(valor, numerico)):
+                    return False
+                continue
+
+            info = arquivo["estatisticas"].get(coluna, {})
+            if "min" not in info:
+                continue
+            minimo, maximo = info["min"], info["max"]
+            numerico = isinstance(minimo, (int, float))
+            if op in ("=", "=="):
+                v = _comparavel(valor, numerico)
+                if v < minimo or v > maximo:
+                    return False
+            elif op == "in":
+                if not any(minimo <= _comparavel(v, numerico) <= maximo for v in valor):
+                    return False
+            elif op in ("<", "<="):
+                v = _comparavel(valor, numerico)
+                if minimo > v or (op == "<" and minimo == v):
+                    return False
+            elif op in (">", ">="):
+                v = _comparavel(valor, numerico)
+                if maximo < v or (op == ">" and maximo == v):
+                    return False
+        except (KeyError, TypeError, ValueError):
+            continue   # filtro incompatível com a partição/estatística: não poda, filtra na leitura
+    return True
+
+
+def aplicar_filtros(df: pd.DataFrame, filtros) -> pd.DataFrame:
+    """
+    Filtro linha a linha (mesma sintaxe de `normalizar_filtros`).
+    """
+    filtros = normalizar_filtros(filtros)
+    mascara = pd.Series(True, index=df.index)
+    for coluna, op, valor in filtros:
+        serie = df[coluna]
+        if op == "in":
+            mascara &= serie.isin(list(valor))
+        elif op == "not in":
+            mascara &= ~serie.isin(list(valor))
+        elif op in _OPERADORES:
+            mascara &= _OPERADORES[op](serie, valor).fillna(False).astype(bool)
+        else:
+            raise ValueError(f"Operador de filtro desconhecido: {op}")
+    return df[mascara]
+
+
+def ler_dataset(nome: str, colunas=None, filtros=None, caminho_catalogo: str = None) -> pd.DataFrame:
+    """
+    Lê o dataset `nome` (ou o diretório dele) só com as `colunas` pedidas e apenas dos
+    arquivos que podem ter linhas dentro dos `filtros`.
+    """
+    import pyarrow.parquet as pq
+
+    caminho_catalogo = caminho_catalogo or COLUMNAR_STORE_CONFIG["catalogo"]
+    nome = os.path.basename(os.path.normpath(nome))
+    entrada = catalogo(caminho_catalogo).get(nome)
+    if entrada is None:
+        raise KeyError(f"Dataset '{nome}' não está no catálogo colunar.")
+
+    filtros = normalizar_filtros(filtros)
+    tipos = entrada["colunas"]
+    desconhecidas = sorted({f[0] for f in filtros} - set(tipos))
+    if desconhecidas:
+        raise KeyError(f"Filtro em coluna inexistente no dataset '{nome}': {desconhecidas}.")
+    colunas = list(tipos) if colunas is None else [c for c in colunas if c in tipos]
+    necessarias = list(dict.fromkeys(colunas + [f[0] for f in filtros]))
+    fisicas = [c for c in necessarias if c not in entrada["particoes"]]
+
+    selecionados = [a for a in entrada["arquivos"] if _pode_conter(a, filtros, tipos)]
+    base = os.path.join(os.path.dirname(caminho_catalogo), entrada["caminho"])
+    partes = []
+    for arquivo in selecionados:
+        parte = pq.read_table(os.path.join(base, arquivo["caminho"]), columns=fisicas).to_pandas()
+        for coluna, valor in arquivo["particao"].items():
+            if coluna in necessarias:
+                parte[coluna] = valor
+        partes.append(parte)
+
+    if partes:
+        df = pd.concat(partes, ignore_index=True)
+    else:
+        df = pd.DataFrame({c: pd.Series(dtype=object) for c in necessarias})
+    for coluna in entrada["particoes"]:
+        if coluna in df.columns:
+            df[coluna] = df[coluna].astype(tipos[coluna])
+
+    df = aplicar_filtros(df, filtros).reset_index(drop=True)
+    registrar_evento(f"Dataset colunar '{nome}': {len(selecionados)}/{len(entrada['arquivos'])} arquivo(s) lidos, "
+                     f"{len(df)} linha(s), colunas {colunas}.", "debug")
+    return df[colunas]
@@ -7,7 +7,6 @@ Data: 2025
 
 import pandas as pd
 import numpy as np
-from scipy.stats import pearsonr, spearmanr
 from utils.logger import registrar_evento, registrar_erro
 
 # ============================================================================
@@ -50,6 +49,8 @@ def correlacao_personalizada(df: pd.DataFrame, col1: str, col2: str, metodo: str
     Retorna o coeficiente e o p-valor.
     """
     try:
+        from scipy.stats import pearsonr, spearmanr
+
         if col1 not in df.columns or col2 not in df.columns:
             raise KeyError(f"Colunas '{col1}' ou '{col2}' não encontradas no DataFrame.")
 
@@ -1,6 +1,6 @@
 """
 Módulo: data_loader.py
-Descrição: Responsável por carregar dados de múltiplas fontes (CSV, JSON, PDF, DB) e padronizar para DataFrame.
+Descrição: Responsável por carregar dados de múltiplas fontes (CSV, JSON, PDF, DB, Parquet) e padronizar para DataFrame.
 Autor: Samuel
 Data: 2025
 """
@@ -8,7 +8,7 @@ Data: 2025
 import os
 import pandas as pd
 import sqlite3
-import pdfplumber
+from core.columnar_store import aplicar_filtros, catalogo, ler_dataset, normalizar_filtros
 from utils.constants import SUPPORTED_FORMATS, DEFAULT_DB_PATH
 from utils.logger import registrar_evento, registrar_erro
 
@@ -16,21 +16,34 @@ from utils.logger import registrar_evento, registrar_erro
 # 🔍 Função principal de carregamento
 # =============================================================================
 
-def load_data(file_path: str) -> pd.DataFrame:
+def load_data(file_path: str, colunas=None, filtros=None) -> pd.DataFrame:
     """
-    Carrega dados a partir de CSV, JSON, PDF ou Banco de Dados (SQLite).
+    Carrega dados a partir de CSV, JSON, PDF, Banco de Dados (SQLite) ou Parquet.
     Retorna um DataFrame padronizado.
+
+    `colunas` restringe as colunas lidas e `filtros` ({coluna: valor | lista} ou
+    [(coluna, operador, valor)]) as linhas. Em datasets Parquet particionados
+    (diretórios de data/processed/colunar) só as partições necessárias são lidas.
     """
     try:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
 
-        ext = os.path.splitext(file_path)[-1].lower().replace('.', '')
+        ext = "parquet" if os.path.isdir(file_path) else os.path.splitext(file_path)[-1].lower().replace('.', '')
 
         registrar_evento(f"Iniciando leitura do arquivo: {file_path}")
 
+        if ext == "parquet":
+            return _normalize_dataframe(_read_parquet(file_path, colunas, filtros))
+
         if ext == "csv":
-            df = pd.read_csv(file_path, encoding="utf-8")
+            usecols = None
+            if colunas is not None:
+                # usecols falha com colunas ausentes: pede só as que existem no cabeçalho
+                cabecalho = set(pd.read_csv(file_path, encoding="utf-8", nrows=0).columns)
+                pedidas = list(colunas) + [f[0] for f in normalizar_filtros(filtros)]
+                usecols = [c for c in dict.fromkeys(pedidas) if c in cabecalho]
+            df = pd.read_csv(file_path, encoding="utf-8", usecols=usecols)
 
         elif ext == "json":
             df = pd.read_json(file_path, encoding="utf-8")
@@ -44,6 +57,11 @@ def load_data(file_path: str) -> pd.DataFrame:
         else:
             raise ValueError(f"Formato de arquivo não suportado: {ext}. Formatos aceitos: {SUPPORTED_FORMATS}")
 
+        if filtros:
+            df = aplicar_filtros(df, filtros)
+        if colunas is not None:
+            df = df[[c for c in colunas if c in df.columns]]
+
         registrar_evento(f"Arquivo {file_path} carregado com sucesso! ({len(df)} registros)")
         return _normalize_dataframe(df)
 
@@ -62,6 +80,8 @@ def _read_pdf_to_dataframe(file_path: str) -> pd.DataFrame:
     Utiliza pdfplumber.
     """
     try:
+        import pdfplumber
+
         registrar_evento(f"Lendo tabelas do PDF: {file_path}")
         tables = []
         with pdfplumber.open(file_path) as pdf:
@@ -82,6 +102,20 @@ def _read_pdf_to_dataframe(file_path: str) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+def _read_parquet(caminho: str, colunas=None, filtros=None) -> pd.DataFrame:
+    """
+    Datasets do catálogo colunar usam a poda por partição/estatística; demais arquivos
+    Parquet são lidos pelo pyarrow com projeção e filtros.
+    """
+    nome = os.path.basename(os.path.normpath(caminho))
+    if os.path.isdir(caminho) and nome in catalogo():
+        df = ler_dataset(nome, colunas, filtros)
+    else:
+        df = pd.read_parquet(caminho, columns=colunas, filters=normalizar_filtros(filtros) or None)
+    registrar_evento(f"Parquet {caminho} carregado ({len(df)} registros).")
+    return df
+
+
 def _read_from_database(db_path: str) -> pd.DataFrame:
     """
     Lê dados do banco SQLite (tabela padrão ou detectada automaticamente).
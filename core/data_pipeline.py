@@ -1,19 +1,152 @@
+"""
+Módulo: data_pipeline.py
+Descrição: Pipeline de dados do Plastic Buster (raw → staging → processed) sobre o executor
+           incremental de core/pipeline_runner.py. Rodar de novo sem dados novos não refaz
+           nenhuma etapa. Com --baixar, as fontes de DOWNLOAD_CONFIG são atualizadas
+           antes (core/downloader.py) e só o que mudou é reprocessado.
+           Uso: python -m core.data_pipeline [--forcar] [--baixar]
+Autor: Samuel
+Data: 2025
+"""
+
+import argparse
 import os
+
 import pandas as pd
+from core.columnar_store import gravar_dataset
+from core.pipeline_runner import Pipeline
+from core.staging_merge import caminho_esquema, ler_staging, mesclar_staging
+from utils.constants import COLUMNAR_STORE_CONFIG, PIPELINE_CONFIG
+from utils.logger import registrar_evento
+
+RAW = PIPELINE_CONFIG["raw"]
+STAGING = PIPELINE_CONFIG["staging"]
+PROCESSED = PIPELINE_CONFIG["processed"]
+
+MERGED = os.path.join(STAGING, "merged_fungi.csv")
+ESQUEMA = caminho_esquema(MERGED)
+CORRELACOES = os.path.join(PROCESSED, "correlations.csv")
+MATRIZ = os.path.join(PROCESSED, "correlation_matrix.csv")
+SIMBIOSE = os.path.join(PROCESSED, "symbiose_dataset.csv")
+CATALOGO_COLUNAR = COLUMNAR_STORE_CONFIG["catalogo"]
+DATASETS_COLUNARES = [
+    os.path.join(COLUMNAR_STORE_CONFIG["dir"], os.path.splitext(os.path.basename(c))[0])
+    for c in (CORRELACOES, SIMBIOSE)
+]
+
+pipeline = Pipeline("dados")
+
+# =============================================================================
+# 🧪 Dados sintéticos (apenas sob demanda)
+# =============================================================================
 
-def gerar_dados_sinteticos():
-    os.makedirs("data/raw", exist_ok=True)
+def gerar_dados_sinteticos(caminho: str = os.path.join(RAW, "fungi_biodegradation.csv")) -> str:
+    """
+    Cria um pequeno conjunto de exemplo em data/raw. Não roda mais na importação do
+    módulo: só quando o pipeline é executado sem nenhum CSV bruto.
+    """
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
     synthetic_data = """fungus_name,environment,plastic_type,degradation_rate,temperature,ph,oxygen_level,moisture
 Pestalotiopsis microspora,terrestre,PU,0.89,30,7.0,0.8,0.65
 Aspergillus niger,aquatico,LDPE,0.56,28,6.8,0.7,0.75
 Fusarium solani,terrestre,PET,0.72,32,7.4,0.9,0.6
 Penicillium chrysogenum,aquatico,HDPE,0.64,27,6.5,0.85,0.8
 Exophiala dermatitidis,vacuo,PP,0.47,10,7.2,0.1,0.05"""
-    path = "data/raw/fungi_biodegradation.csv"
-    with open(path, "w") as f:
+    with open(caminho, "w") as f:
         f.write(synthetic_data)
-    print(f"[✔] Dados sintéticos criados em {path}")
+    registrar_evento(f"Dados sintéticos criados em {caminho}")
+    return caminho
+
+
+# =============================================================================
+# 🔧 Etapas
+# =============================================================================
+
+@pipeline.etapa("padronizar", entradas=[os.path.join(RAW, "*.csv")], saidas=[MERGED, ESQUEMA])
+def padronizar(*arquivos) -> int:
+    """
+    Une os CSV brutos por chave em uma tabela densa e tipada em staging (core/staging_merge.py).
+    """
+    if not arquivos:
+        raise ValueError(f"Nenhum CSV encontrado em {RAW}.")
+    return mesclar_staging(arquivos, MERGED)
+
+
+@pipeline.etapa("correlacoes", entradas=[MERGED, ESQUEMA], saidas=[CORRELACOES])
+def correlacoes(caminho: str, _esquema: str) -> int:
+    """
+    Médias de degradação, temperatura e pH por fungo × plástico.
+    """
+    colunas = ["fungus_name", "plastic_type", "degradation_rate", "temperature", "ph"]
+    df = ler_staging(caminho, colunas)
+    ausentes = [c for c in colunas if c not in df.columns]
+    if ausentes:
+        raise KeyError(f"Colunas ausentes em staging: {ausentes}")
+    resumo = df.groupby(["fungus_name", "plastic_type"], as_index=False, observed=True)[colunas[2:]].mean()
+    resumo.to_csv(CORRELACOES, index=False)
+    return len(resumo)
+
+
+@pipeline.etapa("matriz_correlacao", entradas=[MERGED, ESQUEMA], saidas=[MATRIZ])
+def matriz_correlacao(caminho: str, _esquema: str) -> int:
+    """
+    Correlação de Pearson entre as variáveis numéricas dos ensaios (independe de `correlacoes`).
+    """
+    from core.correlation import calcular_correlacoes
+
+    df = ler_staging(caminho).dropna(axis=1, how="all")
+    matriz = calcular_correlacoes(df)
+    if matriz.empty:
+        raise ValueError("Não foi possível calcular a matriz de correlação.")
+    matriz.to_csv(MATRIZ)
+    return len(matriz)
+
+
+@pipeline.etapa("simbiose", entradas=[CORRELACOES], saidas=[SIMBIOSE])
+def simbiose(caminho: str) -> int:
+    """
+    Dataset final com o escore simbiótico (0,5·degradação + 0,3·temperatura + 0,2·pH).
+    """
+    df = pd.read_csv(caminho)
+    df["simbiotico_score"] = 0.5 * df["degradation_rate"] + 0.3 * df["temperature"] + 0.2 * df["ph"]
+    df.to_csv(SIMBIOSE, index=False)
+    return len(df)
+
+
+@pipeline.etapa("colunar", entradas=[CORRELACOES, SIMBIOSE], saidas=[CATALOGO_COLUNAR, *DATASETS_COLUNARES])
+def colunar(*arquivos) -> dict:
+    """
+    Publica os datasets processados em Parquet particionado (core/columnar_store.py),
+    lidos por load_data com projeção de colunas e poda de partições.
+    """
+    linhas = {}
+    for caminho in arquivos:
+        nome = os.path.splitext(os.path.basename(caminho))[0]
+        linhas[nome] = gravar_dataset(pd.read_csv(caminho), nome)["linhas"]
+    return linhas
+
+
+# =============================================================================
+# 🚀 Execução
+# =============================================================================
+
+def executar_pipeline(forcar: bool = False, baixar: bool = False) -> pd.DataFrame:
+    """
+    Roda o pipeline incremental e devolve o relatório por etapa. `baixar` atualiza
+    antes os arquivos brutos; fontes inalteradas respondem 304 e não mexem em data/raw.
+    """
+    if baixar:
+        from core.downloader import baixar_fontes
+
+        baixar_fontes()
+    if not pipeline.etapas["padronizar"].arquivos_entrada():
+        gerar_dados_sinteticos()
+    return pipeline.executar(forcar=forcar)
+
 
-# Chame antes do pipeline principal
-if not os.path.exists("data/raw/fungi_biodegradation.csv"):
-    gerar_dados_sinteticos()
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline de dados do Plastic Buster.")
+    parser.add_argument("--forcar", action="store_true", help="refaz todas as etapas")
+    parser.add_argument("--baixar", action="store_true", help="atualiza as fontes brutas antes")
+    argumentos = parser.parse_args()
+    print(executar_pipeline(argumentos.forcar, argumentos.baixar).to_string(index=False))
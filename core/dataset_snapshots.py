@@ -0,0 +1,265 @@
+"""
+Módulo: dataset_snapshots.py
+Descrição: Versionamento dos datasets processados. Cada linha é identificada pelo hash do seu
+           conteúdo e cada versão é gravada só como diferença em relação à anterior: as linhas
+           que entraram (com o conteúdo) e os hashes das que saíram. Qualquer versão é
+           remontada somando as diferenças até ela; o espaço cresce com as mudanças e não com
+           cópias completas. O id da versão é o hash do conteúdo, usado para marcar modelos.
+Autor: Samuel
+Data: 2025
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from utils.constants import SNAPSHOT_CONFIG
+from utils.logger import registrar_evento, registrar_erro
+
+COLUNA_HASH = "_hash"
+COLUNA_N = "_n"       # cópias da linha (positivo) ou cópias removidas
+
+_trava = threading.Lock()
+
+
+def _vazia() -> pd.Series:
+    return pd.Series(dtype=np.int64, index=pd.Index([], dtype=np.uint64))
+
+
+# =============================================================================
+# 🔑 Hash de linhas e id de conteúdo
+# =============================================================================
+
+def esquema(df: pd.DataFrame) -> list:
+    """
+    Nomes e tipos das colunas, na ordem: parte da identidade das linhas e das versões.
+    """
+    return [[str(coluna), str(tipo)] for coluna, tipo in df.dtypes.items()]
+
+
+def _hash_esquema(colunas: list) -> bytes:
+    return hashlib.sha256(json.dumps(colunas, ensure_ascii=False).encode()).digest()
+
+
+def hash_linhas(df: pd.DataFrame) -> np.ndarray:
+    """
+    Hash de 64 bits de cada linha (independe do índice). O esquema entra no hash: a mesma
+    linha sob colunas renomeadas, reordenadas ou de outro tipo é outra linha, então os
+    arquivos de diferenças sempre trazem as linhas com os nomes da versão que as usa.
+    """
+    valores = pd.util.hash_pandas_object(df, index=False).to_numpy(dtype=np.uint64)
+    return valores ^ np.frombuffer(_hash_esquema(esquema(df))[:8], dtype=np.uint64)[0]
+
+
+def _contagem(hashes: np.ndarray) -> pd.Series:
+    return pd.Series(hashes, dtype=np.uint64).value_counts()
+
+
+def id_conteudo(df_ou_contagem, colunas: list = None) -> str:
+    """
+    Id estável do conjunto de linhas (multiconjunto) e do esquema: mesma tabela, em qualquer
+    ordem de linhas, mesmo id; renomear, reordenar ou mudar o tipo de uma coluna muda o id.
+    Para uma contagem já calculada, `colunas` é o esquema (ver `esquema`).
+    """
+    if isinstance(df_ou_contagem, pd.Series):
+        contagem = df_ou_contagem
+    else:
+        contagem, colunas = _contagem(hash_linhas(df_ou_contagem)), esquema(df_ou_contagem)
+    contagem = contagem.sort_index()
+    h = hashlib.sha256(_hash_esquema(colunas or []))
+    h.update(contagem.index.to_numpy(dtype=np.uint64).tobytes())
+    h.update(contagem.to_numpy(dtype=np.int64).tobytes())
+    return h.hexdigest()[:12]
+
+
+# =============================================================================
+# 🗄️ Classe Principal — RepositorioSnapshots
+# =============================================================================
+
+class RepositorioSnapshots:
+    """
+    <dir>/<dataset>/versoes.json + <número>-adicionadas.parquet / <número>-removidas.parquet.
+    """
+
+    def __init__(self, raiz: str = None):
+        self.raiz = raiz or SNAPSHOT_CONFIG["dir"]
+
+    def _caminho(self, nome: str, arquivo: str = "") -> str:
+        return os.path.join(self.raiz, nome, arquivo)
+
+    def _arquivo_delta(self, nome: str, numero: int, tipo: str) -> str:
+        return self._caminho(nome, f"{numero:06d}-{tipo}.parquet")
+
+    # -------------------------------------------------------------------------
+    # 🗒️ Registro de versões
+    # -------------------------------------------------------------------------
+    def versoes(self, nome: str) -> list:
+        try:
+            with open(self._caminho(nome, "versoes.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _gravar_versoes(self, nome: str, versoes: list):
+        caminho = self._caminho(nome, "versoes.json")
+        temporario = caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(versoes, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, caminho)
+
+    def _numero(self, nome: str, versao=None) -> int:
+        """
+        Aceita o número da versão, o id de conteúdo ou None (última).
+        """
+        versoes = self.versoes(nome)
+        if not versoes:
+            raise KeyError(f"Dataset '{nome}' não tem snapshots.")
+        if versao is None:
+            return versoes[-1]["numero"]
+        for v in versoes:
+            if versao in (v["numero"], v["id"]):
+                return v["numero"]
+        raise KeyError(f"Versão '{versao}' não encontrada para '{nome}'.")
+
+    def info(self, nome: str, versao=None) -> dict:
+        """
+        Metadados de uma versão (número, id, origem, linhas, adicionadas, removidas, colunas, tipos).
+        """
+        return self.versoes(nome)[self._numero(nome, versao) - 1]
+
+    def _contagem_em(self, nome: str, numero: int) -> pd.Series:
+        """
+        hash → cópias na versão `numero` (soma das diferenças, lendo só as colunas de hash).
+        """
+        partes = []
+        for n in range(1, numero + 1):
+            for tipo, sinal in (("adicionadas", 1), ("removidas", -1)):
+                caminho = self._arquivo_delta(nome, n, tipo)
+                if os.path.exists(caminho):
+                    delta = pd.read_parquet(caminho, columns=[COLUNA_HASH, COLUNA_N])
+                    partes.append(pd.Series(sinal * delta[COLUNA_N].to_numpy(), index=delta[COLUNA_HASH].to_numpy()))
+        if not partes:
+            return _vazia()
+        contagem = pd.concat(partes).groupby(level=0).sum()
+        return contagem[contagem > 0]
+
+    def registrar(self, nome: str, df: pd.DataFrame, origem: str = "pipeline") -> dict:
+        """
+        Grava `df` como nova versão de `nome`. Se o conteúdo é igual ao da última versão,
+        nada é gravado e a última versão é devolvida.
+        """
+        with _trava:
+            os.makedirs(self._caminho(nome), exist_ok=True)
+            versoes = self.versoes(nome)
+            hashes = hash_linhas(df)
+            atual = _contagem(hashes)
+            ident = id_conteudo(atual, esquema(df))
+            if versoes and versoes[-1]["id"] == ident:
+                return versoes[-1]
+
+            anterior = self._contagem_em(nome, versoes[-1]["numero"]) if versoes else _vazia()
+            diferenca = atual.astype(np.int64).sub(anterior, fill_value=0).astype(np.int64)
+            entram, saem = diferenca[diferenca > 0], -diferenca[diferenca < 0]
+
+            numero = len(versoes) + 1
+            if len(entram):
+                novas = df.assign(**{COLUNA_HASH: hashes})
+                novas = novas[novas[COLUNA_HASH].isin(entram.index)].drop_duplicates(COLUNA_HASH)
+                novas[COLUNA_N] = entram.reindex(novas[COLUNA_HASH].to_numpy()).to_numpy()
+                novas.to_parquet(self._arquivo_delta(nome, numero, "adicionadas"), index=False,
+                                 compression=SNAPSHOT_CONFIG["compressao"])
+            if len(saem):
+                pd.DataFrame({COLUNA_HASH: saem.index.to_numpy(dtype=np.uint64), COLUNA_N: saem.to_numpy()}).to_parquet(
+                    self._arquivo_delta(nome, numero, "removidas"), index=False,
+                    compression=SNAPSHOT_CONFIG["compressao"])
+
+            versao = {
+                "numero": numero,
+                "id": ident,
+                "origem": origem,
+                "criado_em": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "linhas": len(df),
+                "adicionadas": int(entram.sum()),
+                "removidas": int(saem.sum()),
+                "colunas": list(df.columns),
+                "tipos": dict(esquema(df)),
+            }
+            self._gravar_versoes(nome, versoes + [versao])
+
+        registrar_evento(f"Snapshot {nome} v{numero} ({ident}): +{versao['adicionadas']} / -{versao['removidas']} linha(s).")
+        return versao
+
+    # -------------------------------------------------------------------------
+    # 🧩 Materialização e comparação
+    # -------------------------------------------------------------------------
+    def _linhas(self, nome: str, numero: int, hashes) -> pd.DataFrame:
+        """
+        Conteúdo das linhas com os `hashes` dados, buscado nos arquivos de adicionadas.
+        """
+        faltam = set(hashes)
+        partes = []
+        for n in range(numero, 0, -1):
+            caminho = self._arquivo_delta(nome, n, "adicionadas")
+            if not faltam or not os.path.exists(caminho):
+                continue
+            delta = pd.read_parquet(caminho)
+            delta = delta[delta[COLUNA_HASH].isin(faltam)]
+            faltam.difference_update(delta[COLUNA_HASH])
+            partes.append(delta)
+        if not partes:
+            return pd.DataFrame(columns=[COLUNA_HASH])
+        return pd.concat(partes[::-1], ignore_index=True).drop_duplicates(COLUNA_HASH, keep="last")
+
+    def materializar(self, nome: str, versao=None) -> pd.DataFrame:
+        """
+        Tabela completa da versão pedida (None = última).
+        """
+        numero = self._numero(nome, versao)
+        colunas = self.versoes(nome)[numero - 1]["colunas"]
+        contagem = self._contagem_em(nome, numero)
+        linhas = self._linhas(nome, numero, contagem.index)
+        repeticoes = contagem.reindex(linhas[COLUNA_HASH].to_numpy()).to_numpy()
+        linhas = linhas.loc[linhas.index.repeat(repeticoes)]
+        return linhas.reindex(columns=colunas).reset_index(drop=True)
+
+    def comparar(self, nome: str, de, para=None) -> dict:
+        """
+        Linhas que entraram e que saíram entre duas versões.
+        """
+        inicio, fim = self._numero(nome, de), self._numero(nome, para)
+        diferenca = self._contagem_em(nome, fim).sub(self._contagem_em(nome, inicio), fill_value=0)
+        entram, saem = diferenca[diferenca > 0], -diferenca[diferenca < 0]
+
+        def expandir(contagem, numero):
+            linhas = self._linhas(nome, numero, contagem.index)
+            linhas = linhas.loc[linhas.index.repeat(contagem.reindex(linhas[COLUNA_HASH].to_numpy()).to_numpy().astype(int))]
+            return linhas.reindex(columns=self.versoes(nome)[numero - 1]["colunas"]).reset_index(drop=True)
+
+        return {"adicionadas": expandir(entram, fim), "removidas": expandir(saem, inicio)}
+
+    def tabela_versoes(self, nome: str) -> pd.DataFrame:
+        return pd.DataFrame(self.versoes(nome)).drop(columns=["colunas", "tipos"], errors="ignore")
+
+
+# =============================================================================
+# 🔗 Atalhos
+# =============================================================================
+
+def registrar_snapshot(nome: str, df: pd.DataFrame, origem: str = "pipeline") -> dict:
+    try:
+        return RepositorioSnapshots().registrar(nome, df, origem)
+    except Exception as e:
+        registrar_erro("Snapshots", e)
+        return {}
+
+
+def carregar_snapshot(nome: str, versao=None) -> pd.DataFrame:
+    try:
+        return RepositorioSnapshots().materializar(nome, versao)
+    except Exception as e:
+        registrar_erro("Snapshots", e)
+        return pd.DataFrame()
@@ -0,0 +1,179 @@
+"""
+Módulo: decay_simulation.py
+Descrição: Simulação em lote das curvas de decomposição (plástico remanescente × tempo)
+           para todos os pares fungo × plástico, com malha adaptativa e cinética multiestágio.
+Autor: Samuel
+Data: 2025
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from utils.logger import registrar_evento, registrar_erro
+
+# =============================================================================
+# ⚙️ Parâmetros de simulação
+# =============================================================================
+
+# Resistência e eficiência simbiótica baseadas em dados empíricos
+RESISTENCIA_PLASTICO = {
+    "PET (Polietileno tereftalato)": 1.0,
+    "PEAD (Polietileno de alta densidade)": 1.3,
+    "PP (Polipropileno)": 1.2,
+    "PS (Poliestireno)": 1.6
+}
+
+EFICIENCIA_FUNGO = {
+    "Aspergillus niger": 0.9,
+    "Penicillium chrysogenum": 0.85,
+    "Phanerochaete chrysosporium": 0.65,
+    "Trichoderma reesei": 0.75
+}
+
+TAXA_BASE_FUNGO = 0.15     # taxa mensal com fungo (ajustada por eficiência/resistência)
+TAXA_BASE_CONTROLE = 0.05  # taxa mensal sem fungo (ajustada por resistência)
+
+
+# =============================================================================
+# 🧮 Taxas e malha temporal
+# =============================================================================
+
+def matriz_taxas(eficiencia: dict = None, resistencia: dict = None) -> pd.DataFrame:
+    """
+    Taxa efetiva de degradação para cada par (fungos nas linhas, plásticos nas colunas).
+    """
+    eficiencia = eficiencia or EFICIENCIA_FUNGO
+    resistencia = resistencia or RESISTENCIA_PLASTICO
+    k = np.fromiter(eficiencia.values(), dtype=float)
+    r = np.fromiter(resistencia.values(), dtype=float)
+    return pd.DataFrame(TAXA_BASE_FUNGO * np.outer(k, 1 / r), index=list(eficiencia), columns=list(resistencia))
+
+
+def taxas_controle(resistencia: dict = None) -> pd.Series:
+    """
+    Taxa de degradação sem fungo para cada plástico.
+    """
+    resistencia = resistencia or RESISTENCIA_PLASTICO
+    return pd.Series({p: TAXA_BASE_CONTROLE / r for p, r in resistencia.items()})
+
+
+def malha_tempo(horizonte: float = 12, n_pontos: int = 100, taxa_max: float = None) -> np.ndarray:
+    """
+    Malha temporal de 0 a `horizonte` meses.
+    Com `taxa_max`, metade dos pontos é distribuída em decrementos iguais da curva mais
+    rápida (mais pontos onde ela cai depressa) e metade de forma uniforme.
+    """
+    if not taxa_max:
+        return np.linspace(0, horizonte, n_pontos)
+
+    n_uniforme = n_pontos // 2
+    queda_total = 1 - np.exp(-taxa_max * horizonte)
+    fracoes = np.linspace(0, queda_total, n_pontos - n_uniforme)
+    adaptativa = np.minimum(-np.log1p(-fracoes) / taxa_max, horizonte)
+    return np.unique(np.round(np.concatenate([np.linspace(0, horizonte, n_uniforme), adaptativa]), 9))
+
+
+# =============================================================================
+# 📉 Simulação
+# =============================================================================
+
+@lru_cache(maxsize=64)
+def _simular_cacheado(taxas: tuple, tempo: tuple, estagios: tuple) -> np.ndarray:
+    taxas = np.asarray(taxas, dtype=float)
+    t = np.asarray(tempo, dtype=float)
+
+    if not estagios:
+        curvas = np.exp(-np.outer(taxas.reshape(-1), t))
+    else:
+        # Cinética por estágios: taxa constante por trecho, risco acumulado em forma fechada
+        inicios = np.array([inicio for inicio, _ in estagios], dtype=float)
+        multiplicadores = np.array([mult for _, mult in estagios], dtype=float)
+        fins = np.append(inicios[1:], np.inf)
+        duracao = np.clip(t[:, None] - inicios[None, :], 0, fins - inicios)  # (T, estágios)
+
+        # Matriz (curvas × estágios) já traz a taxa final de cada estágio; vetor é escalado
+        taxas_estagio = taxas if taxas.ndim == 2 else taxas[:, None] * multiplicadores
+        curvas = np.exp(-(taxas_estagio @ duracao.T))
+
+    curvas = curvas * 100
+    curvas.setflags(write=False)  # resultado compartilhado pelo cache
+    return curvas
+
+
+def simular_curvas(taxas, tempo, estagios=None) -> np.ndarray:
+    """
+    Plástico remanescente (%) para cada taxa ao longo de `tempo`, em um único array 2-D
+    (curvas × pontos). `estagios` é uma sequência de (início em meses, multiplicador da taxa)
+    para cinética multiestágio, p.ex. ((0, 0.2), (1, 1.0), (8, 0.5)) para fase lag,
+    crescimento ativo e saturação. `taxas` também aceita uma matriz (curvas × estágios)
+    com a taxa final de cada estágio: nesse caso só os inícios de `estagios` são usados
+    e os multiplicadores são ignorados.
+    Resultados são cacheados pelos parâmetros (o array devolvido é somente leitura).
+    """
+    taxas = np.asarray(taxas, dtype=float)
+    if taxas.ndim == 2 and (not estagios or taxas.shape[1] != len(estagios)):
+        raise ValueError("Uma matriz de taxas (curvas × estágios) exige uma coluna por estágio em `estagios`.")
+    chave_taxas = tuple(map(tuple, taxas)) if taxas.ndim == 2 else tuple(taxas.reshape(-1))
+    chave_estagios = tuple((float(i), float(m)) for i, m in estagios) if estagios else ()
+    return _simular_cacheado(chave_taxas, tuple(np.asarray(tempo, dtype=float)), chave_estagios)
+
+
+def simular_pares(eficiencia: dict = None, resistencia: dict = None, horizonte: float = 12,
+                  n_pontos: int = 100, adaptativa: bool = False, estagios=None) -> dict:
+    """
+    Simula todos os pares fungo × plástico e o controle (sem fungo) de uma vez.
+    Retorna {"tempo", "fungos", "plasticos", "com_fungo" (fungos × plásticos × T), "controle" (plásticos × T)};
+    em caso de erro, a mesma estrutura com listas e arrays vazios.
+    """
+    try:
+        taxas = matriz_taxas(eficiencia, resistencia)
+        controle = taxas_controle(resistencia)
+        tempo = malha_tempo(horizonte, n_pontos, taxas.to_numpy().max() if adaptativa else None)
+
+        com_fungo = simular_curvas(taxas.to_numpy().ravel(), tempo, estagios)
+        sem_fungo = simular_curvas(controle.to_numpy(), tempo)
+
+        return {
+            "tempo": tempo,
+            "fungos": list(taxas.index),
+            "plasticos": list(taxas.columns),
+            "com_fungo": com_fungo.reshape(len(taxas.index), len(taxas.columns), -1),
+            "controle": sem_fungo,
+        }
+
+    except Exception as e:
+        registrar_erro("Decay_Simulation", e)
+        return {
+            "tempo": np.empty(0),
+            "fungos": [],
+            "plasticos": [],
+            "com_fungo": np.empty((0, 0, 0)),
+            "controle": np.empty((0, 0)),
+        }
+
+
+def simular_tabela(tabela: pd.DataFrame, horizonte: float = 12, n_pontos: int = 100,
+                   adaptativa: bool = False, estagios=None) -> pd.DataFrame:
+    """
+    Simula curvas para uma tabela de taxas fornecida pelo usuário (colunas `nome` e `taxa`).
+    Retorna formato longo (nome, tempo, remanescente) pronto para gráficos.
+    """
+    try:
+        if not {"nome", "taxa"} <= set(tabela.columns):
+            raise KeyError("A tabela de taxas precisa das colunas 'nome' e 'taxa'.")
+
+        taxas = tabela["taxa"].astype(float).to_numpy()
+        tempo = malha_tempo(horizonte, n_pontos, taxas.max() if adaptativa else None)
+        curvas = simular_curvas(taxas, tempo, estagios)
+
+        registrar_evento(f"Simuladas {len(taxas)} curvas de decomposição ({len(tempo)} pontos).")
+        return pd.DataFrame({
+            "nome": np.repeat(tabela["nome"].to_numpy(), len(tempo)),
+            "tempo": np.tile(tempo, len(taxas)),
+            "remanescente": curvas.ravel(),
+        })
+
+    except Exception as e:
+        registrar_erro("Decay_Simulation", e)
+        return pd.DataFrame(columns=["nome", "tempo", "remanescente"])
@@ -0,0 +1,47 @@
+"""
+Módulo: degraders_catalog.py
+Descrição: Leitura do catálogo de microrganismos degradadores de plástico (dump SQL em
+           data/uploads), carregado uma vez por versão do arquivo.
+Autor: Samuel
+Data: 2025
+"""
+
+import sqlite3
+
+import pandas as pd
+from utils.cache import cache_dados
+from utils.constants import DEGRADERS_SQL_PATH
+from utils.logger import registrar_evento, registrar_erro
+
+# =============================================================================
+# 📚 Carregamento
+# =============================================================================
+
+@cache_dados(ttl=None, arquivos=("caminho",))
+def carregar_catalogo_degradadores(caminho: str = DEGRADERS_SQL_PATH) -> pd.DataFrame:
+    """
+    Executa o dump (CREATE TABLE + INSERT) num SQLite em memória e devolve a tabela.
+    Textos vazios viram string vazia, sem NaN, para facilitar buscas e agrupamentos.
+    """
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            script = f.read()
+
+        conn = sqlite3.connect(":memory:")
+        try:
+            conn.executescript(script)
+            tabela = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' LIMIT 1"
+            ).fetchone()[0]
+            df = pd.read_sql_query(f'SELECT * FROM "{tabela}"', conn)
+        finally:
+            conn.close()
+
+        texto = df.select_dtypes(include="object").columns
+        df[texto] = df[texto].fillna("").apply(lambda c: c.str.strip())
+        registrar_evento(f"Catálogo de degradadores carregado: {len(df)} registros.")
+        return df
+
+    except Exception as e:
+        registrar_erro("DegradersCatalog", e)
+        return pd.DataFrame()
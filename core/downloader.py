@@ -0,0 +1,260 @@
+"""
+Módulo: downloader.py
+Descrição: Download paralelo dos datasets brutos (data/raw) com conexões reaproveitadas,
+           retomada de arquivos parciais por HTTP Range, requisições condicionais
+           (ETag / Last-Modified) para não baixar de novo o que não mudou e conferência
+           de SHA-256. Pode ler de um diretório espelho ou de um servidor substituto
+           (PB_MIRROR_DIR / PB_MIRROR_URL) para execuções offline e testes.
+           Uso: python -m core.downloader [fonte ...]
+Autor: Samuel
+Data: 2025
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from utils.cache import hash_arquivo
+from utils.constants import DOWNLOAD_CONFIG, HTTP_CACHE_CONFIG, PIPELINE_CONFIG
+from utils.logger import registrar_evento, registrar_erro
+
+# Respostas que não adianta repetir
+_DEFINITIVOS = {400, 401, 403, 404, 410}
+
+# =============================================================================
+# 📥 Classe Principal — Downloader
+# =============================================================================
+
+class Downloader:
+    """
+    Baixa as fontes de DOWNLOAD_CONFIG para `destino`. O manifesto guarda, por fonte,
+    os validadores HTTP e o hash do último arquivo baixado.
+    """
+
+    def __init__(self, destino: str = None, fontes: dict = None, manifesto: str = None,
+                 espelho_dir: str = None, espelho_url: str = None, session: requests.Session = None):
+        cfg = DOWNLOAD_CONFIG
+        self.destino = destino or PIPELINE_CONFIG["raw"]
+        self.fontes = fontes or cfg["fontes"]
+        self.manifesto = manifesto or cfg["manifesto"]
+        self.espelho_dir = espelho_dir or cfg["espelho_dir"]
+        self.espelho_url = espelho_url or cfg["espelho_url"]
+        self.timeout = cfg["timeout"]
+        self.bloco = cfg["bloco"]
+
+        if session is None:
+            session = requests.Session()
+            adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=cfg["pool_conexoes"])
+            session.mount("http://", adaptador)
+            session.mount("https://", adaptador)
+        self.session = session
+        self.session.headers.setdefault("User-Agent", HTTP_CACHE_CONFIG["user_agent"])
+        os.makedirs(self.destino, exist_ok=True)
+
+    # -------------------------------------------------------------------------
+    # 🗒️ Manifesto
+    # -------------------------------------------------------------------------
+    def ler_manifesto(self) -> dict:
+        try:
+            with open(self.manifesto, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _gravar_manifesto(self, manifesto: dict):
+        os.makedirs(os.path.dirname(self.manifesto), exist_ok=True)
+        temporario = self.manifesto + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(manifesto, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, self.manifesto)
+
+    # -------------------------------------------------------------------------
+    # 🔐 Conferência
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _conferir(caminho: str, fonte: dict) -> str:
+        sha256 = hash_arquivo(caminho)
+        esperado = fonte.get("sha256")
+        if esperado and sha256 != esperado.lower():
+            raise IOError(f"SHA-256 divergente: esperado {esperado[:12]}…, obtido {sha256[:12]}…")
+        return sha256
+
+    # -------------------------------------------------------------------------
+    # 🪞 Espelho local
+    # -------------------------------------------------------------------------
+    def _do_espelho(self, fonte: dict, destino: str) -> dict:
+        origem = os.path.join(self.espelho_dir, fonte["arquivo"])
+        if not os.path.exists(origem):
+            return {"status": "ausente", "erro": f"{fonte['arquivo']} não está no espelho"}
+        sha256 = self._conferir(origem, fonte)
+        if os.path.exists(destino) and hash_arquivo(destino) == sha256:
+            return {"status": "inalterado", "sha256": sha256, "tamanho": os.path.getsize(destino)}
+
+        fd, temporario = tempfile.mkstemp(dir=self.destino, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as saida, open(origem, "rb") as entrada:
+                shutil.copyfileobj(entrada, saida, self.bloco)
+            os.replace(temporario, destino)
+        except Exception:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+        tamanho = os.path.getsize(destino)
+        return {"status": "espelho", "sha256": sha256, "tamanho": tamanho, "bytes": tamanho, "url": origem}
+
+    # -------------------------------------------------------------------------
+    # 🌐 HTTP (condicional + retomada)
+    # -------------------------------------------------------------------------
+    def _url(self, fonte: dict) -> str:
+        if self.espelho_url:
+            return f"{self.espelho_url.rstrip('/')}/{fonte['arquivo']}"
+        return fonte["url"]
+
+    def _baixar_http(self, fonte: dict, destino: str, anterior: dict) -> dict:
+        url = self._url(fonte)
+        parcial, meta_parcial = destino + ".part", destino + ".part.json"
+        headers = {}
+
+        # Arquivo local igual ao último download (e ao checksum esperado): pergunta ao servidor se mudou
+        esperado = (fonte.get("sha256") or anterior.get("sha256") or "").lower()
+        if os.path.exists(destino) and anterior.get("sha256") == esperado == hash_arquivo(destino):
+            if anterior.get("etag"):
+                headers["If-None-Match"] = anterior["etag"]
+            if anterior.get("last_modified"):
+                headers["If-Modified-Since"] = anterior["last_modified"]
+
+        # Parcial de uma tentativa anterior: pede só o que falta, se o recurso não mudou
+        inicio = 0
+        if os.path.exists(meta_parcial) and os.path.exists(parcial) and os.path.getsize(parcial):
+            with open(meta_parcial, "r", encoding="utf-8") as f:
+                validador = json.load(f)
+            if validador.get("url") == url and (validador.get("etag") or validador.get("last_modified")):
+                inicio = os.path.getsize(parcial)
+                headers["Range"] = f"bytes={inicio}-"
+                headers["If-Range"] = validador.get("etag") or validador["last_modified"]
+
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as resposta:
+            if resposta.status_code == 304:
+                return {**anterior, "status": "inalterado", "bytes": 0}
+            if resposta.status_code == 416:
+                # Faixa inválida (parcial maior que o recurso atual): recomeça do zero
+                for caminho in (parcial, meta_parcial):
+                    if os.path.exists(caminho):
+                        os.remove(caminho)
+                raise IOError("Faixa rejeitada pelo servidor; o download será reiniciado.")
+            resposta.raise_for_status()
+
+            etag = resposta.headers.get("ETag")
+            last_modified = resposta.headers.get("Last-Modified")
+            if resposta.status_code != 206:
+                inicio = 0   # servidor ignorou o Range (ou o recurso mudou): arquivo inteiro
+                with open(meta_parcial, "w", encoding="utf-8") as f:
+                    json.dump({"url": url, "etag": etag, "last_modified": last_modified}, f)
+
+            recebidos = 0
+            with open(parcial, "ab" if inicio else "wb") as saida:
+                for bloco in resposta.iter_content(self.bloco):
+                    saida.write(bloco)
+                    recebidos += len(bloco)
+
+            esperado = resposta.headers.get("Content-Length")
+            if esperado is not None and recebidos != int(esperado):
+                raise IOError(f"Download incompleto: {recebidos} de {esperado} bytes.")
+
+        try:
+            sha256 = self._conferir(parcial, fonte)
+        except IOError:
+            os.remove(parcial)
+            os.remove(meta_parcial)
+            raise
+        os.replace(parcial, destino)
+        os.remove(meta_parcial)
+        return {
+            "status": "retomado" if inicio else "baixado",
+            "bytes": recebidos,
+            "tamanho": os.path.getsize(destino),
+            "sha256": sha256,
+            "etag": etag,
+            "last_modified": last_modified,
+            "url": url,
+        }
+
+    # -------------------------------------------------------------------------
+    # 🚀 Execução
+    # -------------------------------------------------------------------------
+    def baixar(self, nome: str, anterior: dict = None) -> dict:
+        """
+        Baixa uma fonte com novas tentativas (espera exponencial) para falhas transitórias.
+        O arquivo parcial é mantido entre tentativas e retomado de onde parou.
+        """
+        fonte = self.fontes[nome]
+        destino = os.path.join(self.destino, fonte["arquivo"])
+        inicio = time.perf_counter()
+        resultado = {"status": "erro"}
+
+        for tentativa in range(DOWNLOAD_CONFIG["tentativas"]):
+            try:
+                if self.espelho_dir:
+                    resultado = self._do_espelho(fonte, destino)
+                else:
+                    resultado = self._baixar_http(fonte, destino, anterior or {})
+                break
+            except requests.HTTPError as e:
+                codigo = e.response.status_code if e.response is not None else None
+                resultado = {"status": "ausente" if codigo in (404, 410) else "erro", "erro": str(e)}
+                if codigo in _DEFINITIVOS:
+                    break
+            except (requests.RequestException, IOError) as e:
+                resultado = {"status": "erro", "erro": str(e)}
+            time.sleep(DOWNLOAD_CONFIG["espera_base"] * 2 ** tentativa)
+
+        resultado["tempo_s"] = round(time.perf_counter() - inicio, 3)
+        if resultado["status"] in ("erro", "ausente"):
+            registrar_evento(f"Download de {nome} falhou: {resultado.get('erro')}", "warning")
+        else:
+            registrar_evento(f"Download de {nome}: {resultado['status']} ({resultado.get('bytes', 0)} bytes) "
+                             f"em {resultado['tempo_s']}s.")
+        return resultado
+
+    def baixar_todas(self, nomes=None) -> pd.DataFrame:
+        """
+        Baixa as fontes em paralelo e atualiza o manifesto. Retorna um relatório por fonte.
+        """
+        nomes = list(nomes or self.fontes)
+        manifesto = self.ler_manifesto()
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_CONFIG["workers"], thread_name_prefix="download") as pool:
+            futuros = {nome: pool.submit(self.baixar, nome, manifesto.get(nome)) for nome in nomes}
+            resultados = {nome: futuro.result() for nome, futuro in futuros.items()}
+
+        for nome, resultado in resultados.items():
+            if resultado["status"] in ("baixado", "retomado", "espelho"):
+                manifesto[nome] = {
+                    **{k: v for k, v in resultado.items() if k not in ("status", "bytes", "tempo_s")},
+                    "baixado_em": time.strftime("%Y-%m-%d %H:%M:%S"),
+                }
+        self._gravar_manifesto(manifesto)
+
+        return pd.DataFrame([
+            {"fonte": nome, "status": r["status"], "bytes": r.get("bytes", 0), "tempo_s": r["tempo_s"],
+             "sha256": (r.get("sha256") or "")[:12], "erro": r.get("erro", "")}
+            for nome, r in resultados.items()
+        ])
+
+
+def baixar_fontes(nomes=None) -> pd.DataFrame:
+    try:
+        return Downloader().baixar_todas(nomes)
+    except Exception as e:
+        registrar_erro("Downloader", e)
+        return pd.DataFrame()
+
+
+if __name__ == "__main__":
+    print(baixar_fontes(sys.argv[1:] or None).to_string(index=False))
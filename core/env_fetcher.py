@@ -0,0 +1,237 @@
+"""
+Módulo: env_fetcher.py
+Descrição: Busca concorrente (asyncio) de clima atual e nome do local para muitos pontos
+           de uma vez, com limite de concorrência e de taxa por serviço, novas tentativas
+           com backoff e reaproveitamento do cache HTTP em disco.
+Autor: Samuel
+Data: 2025
+"""
+
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from core.http_cache import HttpCache, obter_http_cache
+from utils.constants import ENV_FETCH_CONFIG
+from utils.logger import registrar_evento, registrar_erro
+
+PARAMS_CLIMA = {"current": "temperature_2m,relative_humidity_2m"}
+PARAMS_GEOCODIFICACAO = {"format": "jsonv2"}
+
+# =============================================================================
+# 🚦 Limitadores por serviço
+# =============================================================================
+
+class _LimiteTaxa:
+    """
+    Balde de fichas assíncrono: no máximo `req_por_segundo` em média,
+    com rajada de até `rajada` requisições.
+    """
+
+    def __init__(self, req_por_segundo: float, rajada: int):
+        self.taxa = float(req_por_segundo)
+        self.capacidade = max(1, rajada)
+        self.fichas = float(self.capacidade)
+        self.ultimo = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def adquirir(self):
+        async with self._lock:
+            while True:
+                agora = time.monotonic()
+                self.fichas = min(self.capacidade, self.fichas + (agora - self.ultimo) * self.taxa)
+                self.ultimo = agora
+                if self.fichas >= 1:
+                    self.fichas -= 1
+                    return
+                await asyncio.sleep((1 - self.fichas) / self.taxa)
+
+
+class _Servico:
+    def __init__(self, concorrencia: int, req_por_segundo: float):
+        self.semaforo = asyncio.Semaphore(concorrencia)
+        self.taxa = _LimiteTaxa(req_por_segundo, concorrencia)
+
+
+def _pode_repetir(erro: Exception) -> bool:
+    resposta = getattr(erro, "response", None)
+    if resposta is not None:
+        return resposta.status_code == 429 or resposta.status_code >= 500
+    return isinstance(erro, (requests.ConnectionError, requests.Timeout))
+
+
+def _espera_retry(erro: Exception, tentativa: int) -> float:
+    """
+    Respeita Retry-After (429/503) quando presente; senão, backoff exponencial com jitter.
+    """
+    resposta = getattr(erro, "response", None)
+    if resposta is not None and resposta.headers.get("Retry-After", "").isdigit():
+        return float(resposta.headers["Retry-After"])
+    return ENV_FETCH_CONFIG["espera_base"] * (2 ** tentativa) * (0.5 + random.random())
+
+
+# =============================================================================
+# ⚙️ Busca assíncrona
+# =============================================================================
+
+class BuscadorAmbiental:
+    """
+    Orquestra as requisições de um lote. Pontos com resposta fresca no cache não
+    vão à rede; os demais passam pelo semáforo e pelo balde de fichas do serviço.
+    O clima é pedido em grupos de coordenadas (uma requisição para vários pontos)
+    e cada ponto é gravado no cache individualmente.
+    """
+
+    def __init__(self, cache: HttpCache = None, limites: dict = None):
+        self.cache = cache or obter_http_cache()
+        self.limites = limites or ENV_FETCH_CONFIG["limites"]
+        self.contagem = {"cache": 0, "requisicoes": 0, "tentativas_extras": 0, "falhas": 0}
+
+    async def _com_limites(self, servico: _Servico, executor, funcao, *args):
+        """
+        Executa `funcao` numa thread de I/O respeitando os limites do serviço,
+        com novas tentativas para erros transitórios (rede, 429, 5xx).
+        """
+        loop = asyncio.get_running_loop()
+        tentativas = ENV_FETCH_CONFIG["tentativas"]
+        for tentativa in range(tentativas):
+            try:
+                async with servico.semaforo:
+                    await servico.taxa.adquirir()
+                    self.contagem["requisicoes"] += 1
+                    return await loop.run_in_executor(executor, funcao, *args)
+            except Exception as e:
+                if tentativa + 1 < tentativas and _pode_repetir(e):
+                    self.contagem["tentativas_extras"] += 1
+                    await asyncio.sleep(_espera_retry(e, tentativa))
+                    continue
+                raise
+
+    def _clima_varios(self, pontos: list) -> list:
+        """
+        Uma requisição Open-Meteo para vários pontos; grava cada resposta no cache.
+        """
+        url = self.cache.endpoints["open_meteo"]["url"]
+        params = {
+            **PARAMS_CLIMA,
+            "latitude": ",".join(str(self.cache.arredondar(lat, lon)[0]) for lat, lon in pontos),
+            "longitude": ",".join(str(self.cache.arredondar(lat, lon)[1]) for lat, lon in pontos),
+        }
+        resp = self.cache.session.get(url, params=params, timeout=self.cache.timeout)
+        resp.raise_for_status()
+        respostas = resp.json()
+        if isinstance(respostas, dict):  # um único ponto não vem em lista
+            respostas = [respostas]
+        if len(respostas) != len(pontos):
+            raise ValueError(f"Open-Meteo devolveu {len(respostas)} resposta(s) para {len(pontos)} ponto(s).")
+
+        for (lat, lon), dados in zip(pontos, respostas):
+            self.cache.guardar("open_meteo", lat, lon, PARAMS_CLIMA, dados)
+        return respostas
+
+    async def _clima(self, servico, executor, pontos: list) -> list:
+        resultados, faltantes = [None] * len(pontos), []
+        for i, (lat, lon) in enumerate(pontos):
+            dados, estado = self.cache.consultar("open_meteo", lat, lon, PARAMS_CLIMA)
+            resultados[i] = dados
+            if estado == "fresco":
+                self.contagem["cache"] += 1
+            else:
+                faltantes.append(i)
+
+        tamanho = ENV_FETCH_CONFIG["pontos_por_requisicao_clima"]
+        grupos = [faltantes[i:i + tamanho] for i in range(0, len(faltantes), tamanho)]
+
+        async def buscar_grupo(indices):
+            try:
+                respostas = await self._com_limites(
+                    servico, executor, self._clima_varios, [pontos[i] for i in indices]
+                )
+                for i, dados in zip(indices, respostas):
+                    resultados[i] = dados
+            except Exception as e:
+                self.contagem["falhas"] += 1
+                registrar_erro("EnvFetcher_Clima", e)  # mantém a cópia antiga, se houver
+
+        await asyncio.gather(*(buscar_grupo(g) for g in grupos))
+        return resultados
+
+    async def _nomes(self, servico, executor, pontos: list) -> list:
+        async def buscar(lat, lon):
+            dados, estado = self.cache.consultar("nominatim_reverse", lat, lon, PARAMS_GEOCODIFICACAO)
+            if estado == "fresco":
+                self.contagem["cache"] += 1
+                return dados
+            try:
+                return await self._com_limites(
+                    servico, executor, self.cache.atualizar, "nominatim_reverse", lat, lon, PARAMS_GEOCODIFICACAO
+                )
+            except Exception as e:
+                self.contagem["falhas"] += 1
+                registrar_erro("EnvFetcher_Geocodificacao", e)
+                return dados
+
+        return await asyncio.gather(*(buscar(lat, lon) for lat, lon in pontos))
+
+    async def buscar_lote(self, pontos: list, incluir_nomes: bool = True) -> list:
+        # Semáforos e locks precisam nascer dentro do laço que vai usá-los
+        servicos = {nome: _Servico(**cfg) for nome, cfg in self.limites.items()}
+        with ThreadPoolExecutor(max_workers=ENV_FETCH_CONFIG["threads"], thread_name_prefix="env-fetch") as executor:
+            tarefas = [self._clima(servicos["open_meteo"], executor, pontos)]
+            if incluir_nomes:
+                tarefas.append(self._nomes(servicos["nominatim_reverse"], executor, pontos))
+            respostas = await asyncio.gather(*tarefas)
+
+        linhas = []
+        for i, (lat, lon) in enumerate(pontos):
+            atual = (respostas[0][i] or {}).get("current", {})
+            linha = {
+                "latitude": lat,
+                "longitude": lon,
+                "temperatura": atual.get("temperature_2m"),
+                "umidade": atual.get("relative_humidity_2m"),
+            }
+            if incluir_nomes:
+                linha["local"] = (respostas[1][i] or {}).get("display_name")
+            linhas.append(linha)
+        return linhas
+
+
+def _executar(corrotina):
+    """
+    Roda a corrotina mesmo quando já existe um laço ativo na thread (p.ex. Jupyter).
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(corrotina)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, corrotina).result()
+
+
+def buscar_dados_ambientais(pontos, incluir_nomes: bool = True, cache: HttpCache = None) -> pd.DataFrame:
+    """
+    Temperatura, umidade e (opcionalmente) nome do local para uma lista de (lat, lon)
+    ou um DataFrame com colunas latitude/longitude. Retorna um DataFrame na ordem dos pontos.
+    """
+    try:
+        if isinstance(pontos, pd.DataFrame):
+            pontos = pontos[["latitude", "longitude"]].to_numpy()
+        pontos = [(float(lat), float(lon)) for lat, lon in pontos]
+
+        buscador = BuscadorAmbiental(cache)
+        inicio = time.perf_counter()
+        linhas = _executar(buscador.buscar_lote(pontos, incluir_nomes))
+        registrar_evento(
+            f"Dados ambientais: {len(pontos)} ponto(s) em {time.perf_counter() - inicio:.2f}s "
+            f"(cache={buscador.contagem['cache']}, requisições={buscador.contagem['requisicoes']}, "
+            f"falhas={buscador.contagem['falhas']})"
+        )
+        return pd.DataFrame(linhas)
+
+    except Exception as e:
+        registrar_erro("EnvFetcher", e)
+        return pd.DataFrame()
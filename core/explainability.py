@@ -0,0 +1,175 @@
+"""
+Módulo: explainability.py
+Descrição: Explicabilidade do MLModel — importância por permutação (paralela por feature)
+           e contribuições por predição calculadas a partir dos caminhos das árvores.
+Autor: Samuel
+Data: 2025
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from utils.logger import registrar_evento, registrar_erro
+
+# =============================================================================
+# 🔀 Importância por permutação
+# =============================================================================
+
+# Estado de cada processo trabalhador (enviado uma única vez pelo initializer)
+_ESTADO_WORKER = {}
+
+
+def _inicializar_worker(model, X, y, baseline, n_repeticoes, random_state):
+    _ESTADO_WORKER.update(
+        model=model, X=X, y=y, baseline=baseline,
+        n_repeticoes=n_repeticoes, random_state=random_state
+    )
+
+
+def _quedas_por_feature(indice: int) -> np.ndarray:
+    """
+    Embaralha a coluna `indice` n vezes e devolve a queda de acurácia de cada repetição.
+    As repetições são empilhadas num único lote para uma só chamada de predict.
+    """
+    estado = _ESTADO_WORKER
+    X, y = estado["X"], estado["y"]
+    n_rep, n_amostras = estado["n_repeticoes"], X.shape[0]
+
+    rng = np.random.default_rng(estado["random_state"] + indice)
+    X_lote = np.tile(X, (n_rep, 1))
+    permutacoes = np.argsort(rng.random((n_rep, n_amostras)), axis=1)
+    X_lote[:, indice] = X[permutacoes, indice].ravel()
+
+    acertos = (estado["model"].predict(X_lote) == np.tile(y, n_rep)).reshape(n_rep, n_amostras)
+    return estado["baseline"] - acertos.mean(axis=1)
+
+
+def importancia_permutacao(model, X, y, feature_names=None, n_repeticoes: int = 10,
+                           n_processos: int = None, random_state: int = 42) -> pd.DataFrame:
+    """
+    Calcula a importância por permutação de cada feature (queda média de acurácia).
+    As features são distribuídas entre processos; com n_processos=1 roda em série.
+    """
+    try:
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y)
+        n_features = X.shape[1]
+        feature_names = list(feature_names) if feature_names is not None else [f"f{i}" for i in range(n_features)]
+
+        baseline = float((model.predict(X) == y).mean())
+        n_processos = min(n_processos or os.cpu_count() or 1, n_features)
+        registrar_evento(f"Importância por permutação: {n_features} features, {n_processos} processo(s).")
+
+        args_worker = (model, X, y, baseline, n_repeticoes, random_state)
+        if n_processos <= 1:
+            _inicializar_worker(*args_worker)
+            quedas = [_quedas_por_feature(i) for i in range(n_features)]
+        else:
+            with ProcessPoolExecutor(max_workers=n_processos, initializer=_inicializar_worker,
+                                     initargs=args_worker) as pool:
+                quedas = list(pool.map(_quedas_por_feature, range(n_features)))
+
+        quedas = np.vstack(quedas)
+        resultado = pd.DataFrame({
+            "feature": feature_names,
+            "importancia_media": quedas.mean(axis=1),
+            "importancia_std": quedas.std(axis=1),
+        })
+        return resultado.sort_values("importancia_media", ascending=False).reset_index(drop=True)
+
+    except Exception as e:
+        registrar_erro("Explain_Permutation", e)
+        return pd.DataFrame(columns=["feature", "importancia_media", "importancia_std"])
+
+
+# =============================================================================
+# 🌳 Contribuições por caminho de árvore
+# =============================================================================
+
+def _matriz_contribuicoes(forest):
+    """
+    Monta, para toda a floresta, a matriz esparsa (nós × features·classes) com a variação
+    de probabilidade que cada nó acrescenta em relação ao pai, atribuída à feature do pai.
+    Também devolve o viés (probabilidade média na raiz das árvores).
+    """
+    from scipy import sparse
+
+    n_features = forest.n_features_in_
+    n_classes = forest.n_classes_
+    linhas, colunas, valores, raizes = [], [], [], []
+    deslocamento = 0
+
+    for arvore in forest.estimators_:
+        tree = arvore.tree_
+        n_nos = tree.node_count
+        probs = tree.value[:, 0, :]
+        probs = probs / probs.sum(axis=1, keepdims=True)
+
+        pais = np.full(n_nos, -1)
+        internos = np.flatnonzero(tree.children_left >= 0)
+        pais[tree.children_left[internos]] = internos
+        pais[tree.children_right[internos]] = internos
+
+        filhos = np.flatnonzero(pais >= 0)
+        delta = probs[filhos] - probs[pais[filhos]]
+        feat_pai = tree.feature[pais[filhos]]
+
+        linhas.append(np.repeat(filhos + deslocamento, n_classes))
+        colunas.append((feat_pai[:, None] * n_classes + np.arange(n_classes)).ravel())
+        valores.append(delta.ravel())
+        raizes.append(probs[0])
+        deslocamento += n_nos
+
+    W = sparse.csr_matrix(
+        (np.concatenate(valores), (np.concatenate(linhas), np.concatenate(colunas))),
+        shape=(deslocamento, n_features * n_classes)
+    )
+    return W, np.mean(raizes, axis=0)
+
+
+def contribuicoes_arvores(forest, X, feature_names=None, class_names=None) -> dict:
+    """
+    Decompõe a probabilidade prevista de cada amostra em viés + contribuição por feature
+    (atribuição pelos caminhos de decisão). O cálculo cobre todas as árvores de uma vez:
+    indicadores de caminho (amostras × nós) multiplicados pela matriz de contribuições.
+    Retorna {"vies": (classes,), "contribuicoes": (amostras, features, classes), ...}.
+    """
+    try:
+        X = np.asarray(X, dtype=float)
+        n_features, n_classes = forest.n_features_in_, forest.n_classes_
+
+        indicador, _ = forest.decision_path(X)
+        W, vies = _matriz_contribuicoes(forest)
+        contrib = (indicador @ W).toarray() / len(forest.estimators_)
+
+        return {
+            "vies": vies,
+            "contribuicoes": contrib.reshape(X.shape[0], n_features, n_classes),
+            "features": list(feature_names) if feature_names is not None else list(range(n_features)),
+            "classes": list(class_names) if class_names is not None else list(range(n_classes)),
+        }
+
+    except Exception as e:
+        registrar_erro("Explain_TreePath", e)
+        return {}
+
+
+def resumo_contribuicoes(explicacao: dict, indice_amostra: int = 0, classe=None) -> pd.DataFrame:
+    """
+    Tabela de contribuições de uma amostra para a classe indicada
+    (por padrão, a classe de maior probabilidade). Ordenada por impacto absoluto.
+    """
+    if not explicacao:
+        return pd.DataFrame(columns=["feature", "contribuicao"])
+
+    contrib = explicacao["contribuicoes"][indice_amostra]
+    if classe is None:
+        j = int(np.argmax(explicacao["vies"] + contrib.sum(axis=0)))
+    else:
+        j = explicacao["classes"].index(classe)
+
+    tabela = pd.DataFrame({"feature": explicacao["features"], "contribuicao": contrib[:, j]})
+    ordem = tabela["contribuicao"].abs().sort_values(ascending=False).index
+    return tabela.loc[ordem].reset_index(drop=True)
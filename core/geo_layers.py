@@ -0,0 +1,178 @@
+"""
+Módulo: geo_layers.py
+Descrição: Camadas vetorizadas para os mapas — pontos de amostragem como um único
+           GeoJSON FeatureCollection montado a partir das colunas, agrupamento
+           (cluster) no navegador, popups gerados das propriedades e rarefação
+           por viewport/zoom para conjuntos grandes.
+Autor: Samuel
+Data: 2025
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from utils.constants import GEO_CONFIG
+from utils.logger import registrar_evento, registrar_erro
+
+# =============================================================================
+# 📍 Pontos de amostragem
+# =============================================================================
+
+PONTOS_EXEMPLO = {
+    "latitude": [-23.5, -22.9, -3.1],
+    "longitude": [-46.6, -43.2, -60.0],
+    "temperatura": [26, 28, 31],
+    "umidade": [70, 82, 88],
+    "ph": [6.5, 7.1, 5.8],
+    "oxigenio": [8.2, 7.5, 6.9],
+    "tipo": ["Aquático", "Terrestre", "Aquático"],
+}
+
+
+def carregar_pontos_amostragem(caminho: str = None) -> pd.DataFrame:
+    """
+    Pontos de coleta (JSON em data/processed); sem o arquivo, usa os pontos de exemplo.
+    """
+    caminho = caminho or GEO_CONFIG["pontos_amostragem"]
+    try:
+        if os.path.exists(caminho):
+            with open(caminho, "r", encoding="utf-8") as f:
+                return pd.DataFrame(json.load(f))
+    except Exception as e:
+        registrar_erro("GeoLayers_Pontos", e)
+    return pd.DataFrame(PONTOS_EXEMPLO)
+
+
+# =============================================================================
+# ✂️ Rarefação por viewport e zoom
+# =============================================================================
+
+def pixels_mercator(lat: np.ndarray, lon: np.ndarray, zoom: int):
+    """
+    Coordenadas em pixels do mundo Web Mercator (tiles de 256 px) no zoom dado.
+    """
+    escala = 256 * 2 ** zoom
+    lat = np.clip(lat, -85.0511, 85.0511)
+    x = (lon + 180.0) / 360.0 * escala
+    y = (1.0 - np.arcsinh(np.tan(np.radians(lat))) / np.pi) / 2.0 * escala
+    return x, y
+
+
+def limitar_pontos(df: pd.DataFrame, zoom: int, bbox=None, max_pontos: int = None,
+                   lat_col: str = "latitude", lon_col: str = "longitude") -> pd.DataFrame:
+    """
+    Recorta ao bbox = (oeste, sul, leste, norte) visível e, se ainda houver pontos demais,
+    mantém um único ponto por célula de tela (GEO_CONFIG["pixels_por_celula"]) no zoom atual.
+    Pontos sobrepostos na tela somem primeiro; no zoom máximo praticamente nada é descartado.
+    """
+    max_pontos = max_pontos or GEO_CONFIG["max_pontos"]
+    lat = df[lat_col].to_numpy(dtype=float)
+    lon = df[lon_col].to_numpy(dtype=float)
+    mascara = np.isfinite(lat) & np.isfinite(lon)
+
+    if bbox is not None:
+        oeste, sul, leste, norte = bbox
+        mascara &= (lat >= sul) & (lat <= norte) & (lon >= oeste) & (lon <= leste)
+
+    indices = np.flatnonzero(mascara)
+    if len(indices) > max_pontos:
+        x, y = pixels_mercator(lat[indices], lon[indices], zoom)
+        celula = GEO_CONFIG["pixels_por_celula"]
+        ids = (np.floor(x / celula).astype(np.int64) << 32) | np.floor(y / celula).astype(np.int64)
+        _, primeiros = np.unique(ids, return_index=True)
+        indices = indices[np.sort(primeiros)]
+        if len(indices) > max_pontos:
+            passo = int(np.ceil(len(indices) / max_pontos))
+            indices = indices[::passo]
+
+    return df.iloc[indices]
+
+
+# =============================================================================
+# 🧩 GeoJSON a partir das colunas
+# =============================================================================
+
+def _coluna_json(serie: pd.Series) -> list:
+    """
+    Converte uma coluna para tipos nativos do JSON (NaN/NaT → null, datas → texto ISO 8601)
+    de uma vez só.
+    """
+    valores = serie.to_numpy(dtype=object)
+    nulos = pd.isna(serie).to_numpy()
+    if nulos.any():
+        valores[nulos] = None
+    if pd.api.types.is_float_dtype(serie):
+        valores[~nulos] = np.round(serie.to_numpy()[~nulos], 3)
+    elif pd.api.types.is_datetime64_any_dtype(serie) or pd.api.types.is_timedelta64_dtype(serie):
+        valores[~nulos] = [v.isoformat() for v in serie[~nulos]]
+    return valores.tolist()
+
+
+def feature_collection(df: pd.DataFrame, propriedades=None, lat_col: str = "latitude",
+                       lon_col: str = "longitude") -> dict:
+    """
+    Monta um FeatureCollection de pontos. As coordenadas e propriedades são convertidas
+    por coluna (vetorizado); só a montagem final dos dicionários percorre as linhas.
+    """
+    propriedades = [c for c in (propriedades or df.columns) if c not in (lat_col, lon_col)]
+    casas = GEO_CONFIG["casas_decimais"]
+    lons = np.round(df[lon_col].to_numpy(dtype=float), casas).tolist()
+    lats = np.round(df[lat_col].to_numpy(dtype=float), casas).tolist()
+    colunas = [_coluna_json(df[c]) for c in propriedades]
+
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [x, y]},
+            "properties": dict(zip(propriedades, valores)),
+        }
+        for x, y, *valores in zip(lons, lats, *colunas)
+    ]
+    return {"type": "FeatureCollection", "features": features}
+
+
+# =============================================================================
+# 🗺️ Camada folium com cluster
+# =============================================================================
+
+def camada_pontos(df: pd.DataFrame, campos_popup: dict = None, nome: str = "Pontos de amostragem",
+                  zoom: int = 4, bbox=None, cluster: bool = True):
+    """
+    Camada pronta para adicionar ao mapa (folium ou leafmap.foliumap).
+    `campos_popup` = {coluna: rótulo}; o popup é renderizado no navegador
+    a partir das propriedades de cada feature, sem HTML montado em Python.
+    Com `cluster`, os pontos só são recortados ao `bbox`: o MarkerCluster já agrupa
+    a sobreposição no navegador em qualquer zoom, e rarefazer no `zoom` inicial
+    esconderia pontos que reapareceriam ao aproximar. Sem cluster, a rarefação por
+    `zoom`/`bbox` limita o que vai ao navegador.
+    """
+    import folium
+    from folium.plugins import MarkerCluster
+
+    try:
+        campos_popup = {
+            c: rotulo for c, rotulo in (campos_popup or {c: c for c in df.columns}).items()
+            if c in df.columns and c not in ("latitude", "longitude")
+        }
+        visiveis = limitar_pontos(df, zoom, bbox, max_pontos=max(len(df), 1) if cluster else None)
+        dados = feature_collection(visiveis, list(campos_popup))
+        registrar_evento(f"Camada '{nome}': {len(visiveis)} de {len(df)} ponto(s) enviados ao mapa.")
+
+        geojson = folium.GeoJson(
+            dados,
+            name=nome,
+            marker=folium.CircleMarker(radius=6, fill=True, fill_opacity=0.8, color="#2E8B57"),
+            popup=folium.GeoJsonPopup(fields=list(campos_popup), aliases=list(campos_popup.values())),
+        )
+        if not cluster:
+            return geojson
+
+        grupo = MarkerCluster(name=nome, chunkedLoading=True, spiderfyOnMaxZoom=True)
+        geojson.add_to(grupo)
+        return grupo
+
+    except Exception as e:
+        registrar_erro("GeoLayers_Camada", e)
+        return folium.FeatureGroup(name=nome)
@@ -0,0 +1,188 @@
+"""
+Módulo: heuristic_predictor.py
+Descrição: Heurística de tempo de degradação (plástico × fungo × condições ambientais)
+           vetorizada para lotes de cenários, com interface de linha de comando.
+Autor: Samuel
+Data: 2025
+
+Uso (CLI):
+    python -m core.heuristic_predictor inventario.csv -o estimativas.csv
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+from utils.logger import registrar_evento, registrar_erro
+
+# =============================================================================
+# ⚖️ Pesos heurísticos
+# =============================================================================
+
+TEMPO_BASE = 12  # meses base para decomposição parcial
+
+PESOS_PLASTICOS = {
+    "PET (Polietileno tereftalato)": 1.0,
+    "PEAD (Polietileno de alta densidade)": 1.4,
+    "PP (Polipropileno)": 1.2,
+    "PS (Poliestireno)": 1.8
+}
+
+PESOS_FUNGOS = {
+    "Aspergillus niger": 0.9,
+    "Penicillium chrysogenum": 0.8,
+    "Phanerochaete chrysosporium": 0.6,
+    "Trichoderma reesei": 0.7
+}
+
+# Multiplicador aplicado quando a condição ambiental é favorável
+FATORES_AMBIENTE = {
+    "temperatura_ideal": 0.9,
+    "umidade_ideal": 0.9,
+    "oxigenacao_ideal": 0.85
+}
+
+COLUNAS_CENARIO = ["plastico", "fungo", *FATORES_AMBIENTE]
+
+# Faixas de classificação (limite superior em meses, rótulo)
+NIVEIS_DEGRADACAO = [
+    (3, "🚀 Degradação ultrarrápida — condições ideais!", "#3FC380"),
+    (6, "⚙️ Degradação eficiente — simbionte ativo.", "#F5D76E"),
+    (np.inf, "🐢 Degradação lenta — otimização ambiental recomendada.", "#F64747"),
+]
+
+# Códigos aceitos também pelo plástico popular (ex.: "PET") além do nome completo
+_APELIDOS_PLASTICOS = {nome.split(" ")[0]: nome for nome in PESOS_PLASTICOS}
+
+
+# =============================================================================
+# 🧮 Cálculo vetorizado
+# =============================================================================
+
+def _pesos_por_categoria(valores, pesos: dict, apelidos: dict = None) -> np.ndarray:
+    """
+    Converte rótulos em pesos via códigos categóricos (sem laço Python por linha).
+    Rótulos desconhecidos resultam em NaN.
+    """
+    codigos, unicos = pd.factorize(np.asarray(valores, dtype=object))
+    rotulos = pd.Index(unicos).astype(str).str.strip()
+    if apelidos:
+        rotulos = rotulos.map(lambda r: apelidos.get(r, r))
+
+    # Só os rótulos distintos passam pelo dicionário; o resto é indexação NumPy
+    tabela = np.append(np.fromiter(pesos.values(), dtype=float), np.nan)
+    pesos_unicos = np.append(tabela[pd.Index(list(pesos)).get_indexer(rotulos)], np.nan)
+    return pesos_unicos[codigos]  # -1 (desconhecido ou nulo) aponta para o NaN final
+
+
+def _como_booleano(valores) -> np.ndarray:
+    """
+    Aceita bool, 0/1 ou "Sim"/"Não" (também "true"/"false") e devolve array booleano.
+    Valores ausentes (NaN/None) contam como desfavoráveis.
+    """
+    arr = np.asarray(valores)
+    if arr.dtype == bool:
+        return arr
+    if np.issubdtype(arr.dtype, np.number):
+        return np.nan_to_num(arr, nan=0.0).astype(bool)
+    codigos, unicos = pd.factorize(arr.ravel())
+    verdadeiros = pd.Index(unicos).astype(str).str.strip().str.lower().isin(["sim", "s", "true", "1", "yes"])
+    return np.append(verdadeiros, False)[codigos].reshape(arr.shape)
+
+
+def estimar_tempo_degradacao(plastico, fungo, temperatura_ideal=False,
+                             umidade_ideal=False, oxigenacao_ideal=False) -> np.ndarray:
+    """
+    Estima o tempo de degradação (meses) para um ou muitos cenários.
+    Todos os argumentos aceitam escalares ou arrays (com broadcast NumPy).
+    """
+    fator = np.ones(1)
+    for condicao, peso in zip(
+        (temperatura_ideal, umidade_ideal, oxigenacao_ideal), FATORES_AMBIENTE.values()
+    ):
+        fator = fator * np.where(_como_booleano(condicao), peso, 1.0)
+
+    peso_plastico = _pesos_por_categoria(np.atleast_1d(plastico), PESOS_PLASTICOS, _APELIDOS_PLASTICOS)
+    peso_fungo = _pesos_por_categoria(np.atleast_1d(fungo), PESOS_FUNGOS)
+
+    return TEMPO_BASE * peso_plastico * peso_fungo * fator
+
+
+def estimar_cenarios(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica a heurística a um DataFrame de cenários com as colunas de COLUNAS_CENARIO.
+    Colunas ambientais ausentes são consideradas desfavoráveis.
+    Retorna uma cópia com `tempo_estimado` e `nivel`.
+    """
+    try:
+        faltantes = {"plastico", "fungo"} - set(df.columns)
+        if faltantes:
+            raise KeyError(f"Colunas obrigatórias ausentes: {sorted(faltantes)}")
+
+        resultado = df.copy()
+        resultado["tempo_estimado"] = estimar_tempo_degradacao(
+            df["plastico"].to_numpy(),
+            df["fungo"].to_numpy(),
+            *(df[c].to_numpy() if c in df else False for c in FATORES_AMBIENTE)
+        )
+        resultado["nivel"] = classificar_nivel(resultado["tempo_estimado"].to_numpy())
+        return resultado
+
+    except Exception as e:
+        registrar_erro("Heuristic_Predictor", e)
+        return pd.DataFrame()
+
+
+def classificar_nivel(tempo_estimado) -> np.ndarray:
+    """
+    Rótulo de velocidade de degradação para cada estimativa (NaN → vazio).
+    """
+    tempo = np.asarray(tempo_estimado, dtype=float)
+    limites = np.array([lim for lim, _, _ in NIVEIS_DEGRADACAO])
+    rotulos = np.array([rot for _, rot, _ in NIVEIS_DEGRADACAO] + [""], dtype=object)
+    indices = np.where(np.isnan(tempo), len(limites), np.searchsorted(limites, tempo, side="right"))
+    return rotulos[np.minimum(indices, len(limites))]
+
+
+def nivel_e_cor(tempo_estimado: float):
+    """
+    Rótulo e cor de destaque para uma única estimativa (usado na página Preditor).
+    """
+    for limite, rotulo, cor in NIVEIS_DEGRADACAO:
+        if tempo_estimado < limite:
+            return rotulo, cor
+    return NIVEIS_DEGRADACAO[-1][1], NIVEIS_DEGRADACAO[-1][2]
+
+
+# =============================================================================
+# 🖥️ Linha de comando
+# =============================================================================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Estima o tempo de degradação para um inventário de cenários (CSV)."
+    )
+    parser.add_argument("entrada", help=f"CSV com as colunas: {', '.join(COLUNAS_CENARIO)}")
+    parser.add_argument("-o", "--saida", default="-", help="CSV de saída (padrão: stdout)")
+    parser.add_argument("--sep", default=",", help="Separador do CSV (padrão: ',')")
+    parser.add_argument("--chunksize", type=int, default=500_000,
+                        help="Linhas processadas por bloco (padrão: 500000)")
+    args = parser.parse_args(argv)
+
+    saida = sys.stdout if args.saida == "-" else args.saida
+    total = 0
+    for i, bloco in enumerate(pd.read_csv(args.entrada, sep=args.sep, chunksize=args.chunksize)):
+        resultado = estimar_cenarios(bloco)
+        if resultado.empty and not bloco.empty:
+            print("Falha ao processar o inventário (veja o log).", file=sys.stderr)
+            return 1
+        resultado.to_csv(saida, sep=args.sep, index=False, header=(i == 0), mode="w" if i == 0 else "a")
+        total += len(resultado)
+
+    registrar_evento(f"Heurística aplicada a {total} cenários de {args.entrada}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+Módulo: http_cache.py
+Descrição: Cache persistente (SQLite) de respostas HTTP para geocodificação reversa
+           (Nominatim) e clima (Open-Meteo), com chave por coordenadas arredondadas,
+           TTL por endpoint, stale-while-revalidate e coalescência de requisições.
+Autor: Samuel
+Data: 2025
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+from utils.constants import HTTP_CACHE_CONFIG
+from utils.logger import registrar_evento, registrar_erro
+
+# =============================================================================
+# 🗄️ Classe Principal — HttpCache
+# =============================================================================
+
+class HttpCache:
+    """
+    Cache de respostas JSON em SQLite (modo WAL), compartilhado entre sessões e reinícios.
+
+    - Fresca (idade < ttl): responde do cache.
+    - Velha (ttl <= idade < ttl + stale): responde do cache e revalida em segundo plano.
+    - Expirada ou ausente: busca na rede; se a rede falhar, usa a cópia antiga se houver.
+    Requisições simultâneas para a mesma chave compartilham uma única chamada HTTP.
+    """
+
+    def __init__(self, caminho_db: str = None, endpoints: dict = None, precisao: int = None,
+                 timeout: float = None, session: requests.Session = None):
+        cfg = HTTP_CACHE_CONFIG
+        self.caminho_db = caminho_db or cfg["db"]
+        self.endpoints = endpoints or cfg["endpoints"]
+        self.precisao = cfg["precisao_coordenadas"] if precisao is None else precisao
+        self.timeout = timeout or cfg["timeout"]
+
+        if session is None:
+            # Pool de conexões keep-alive reaproveitado por todas as threads
+            session = requests.Session()
+            adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=cfg["pool_conexoes"])
+            session.mount("http://", adaptador)
+            session.mount("https://", adaptador)
+        self.session = session
+        self.session.headers.setdefault("User-Agent", cfg["user_agent"])
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._em_andamento = {}  # chave -> Future da requisição em curso
+        self._revalidando = set()  # chaves com revalidação já enfileirada ou em curso
+        self._revalidador = ThreadPoolExecutor(max_workers=2, thread_name_prefix="http-cache")
+        self.estatisticas = {"frescos": 0, "velhos": 0, "rede": 0, "falhas": 0, "coalescidos": 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.caminho_db)), exist_ok=True)
+        with self._conexao() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS respostas (
+                    chave TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    corpo TEXT NOT NULL,
+                    armazenado_em REAL NOT NULL
+                )
+            """)
+
+    # -------------------------------------------------------------------------
+    # 🔌 Conexão por thread
+    # -------------------------------------------------------------------------
+    def _conexao(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.caminho_db, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # -------------------------------------------------------------------------
+    # 🔑 Chaves
+    # -------------------------------------------------------------------------
+    def arredondar(self, lat: float, lon: float):
+        return round(float(lat), self.precisao), round(float(lon), self.precisao)
+
+    @staticmethod
+    def _chave(endpoint: str, params: dict) -> str:
+        return endpoint + "?" + "&".join(f"{k}={params[k]}" for k in sorted(params))
+
+    # -------------------------------------------------------------------------
+    # 🌐 Consulta
+    # -------------------------------------------------------------------------
+    def _preparar(self, endpoint: str, lat: float, lon: float, params: dict = None):
+        """
+        Parâmetros da requisição e chave do cache. A própria requisição usa as
+        coordenadas arredondadas: a resposta guardada vale exatamente para todas
+        as consultas que caem na mesma chave. Endpoints sem coordenadas (p.ex. busca
+        por nome) recebem lat/lon = None e usam só os parâmetros.
+        """
+        params = dict(params or {})
+        if lat is not None and lon is not None:
+            nome_lat, nome_lon = self.endpoints[endpoint].get("parametros_coordenadas", ("lat", "lon"))
+            params[nome_lat], params[nome_lon] = self.arredondar(lat, lon)
+        return self._chave(endpoint, params), params
+
+    def consultar(self, endpoint: str, lat: float, lon: float, params: dict = None):
+        """
+        Consulta apenas o disco, sem rede. Retorna (dados, estado), com estado em
+        "fresco", "velho" (dentro da janela stale), "expirado" ou "ausente".
+        """
+        chave, _ = self._preparar(endpoint, lat, lon, params)
+        linha = self._conexao().execute(
+            "SELECT corpo, armazenado_em FROM respostas WHERE chave = ?", (chave,)
+        ).fetchone()
+        if linha is None:
+            return None, "ausente"
+
+        cfg = self.endpoints[endpoint]
+        idade = time.time() - linha[1]
+        if idade < cfg["ttl"]:
+            estado = "fresco"
+        elif idade < cfg["ttl"] + cfg.get("stale", 0):
+            estado = "velho"
+        else:
+            estado = "expirado"
+        return json.loads(linha[0]), estado
+
+    def atualizar(self, endpoint: str, lat: float, lon: float, params: dict = None):
+        """
+        Busca na rede (coalescendo chamadas simultâneas) e grava no cache.
+        Propaga exceções de rede/HTTP para quem quiser aplicar novas tentativas.
+        """
+        chave, params = self._preparar(endpoint, lat, lon, params)
+        return self._buscar_coalescido(endpoint, chave, params)
+
+    def guardar(self, endpoint: str, lat: float, lon: float, params: dict, dados):
+        """
+        Grava uma resposta obtida por fora (p.ex. uma requisição com vários pontos).
+        """
+        chave, _ = self._preparar(endpoint, lat, lon, params)
+        self._gravar(chave, endpoint, dados)
+
+    def buscar_json(self, endpoint: str, lat: float, lon: float, params: dict = None):
+        """
+        Resposta JSON do endpoint para as coordenadas (arredondadas) informadas.
+        Retorna None se não houver rede nem cópia em cache.
+        """
+        dados, estado = self.consultar(endpoint, lat, lon, params)
+        if estado == "fresco":
+            self.estatisticas["frescos"] += 1
+            return dados
+        if estado == "velho":
+            self.estatisticas["velhos"] += 1
+            # Uma revalidação por chave: acertos velhos repetidos não enchem a fila
+            chave, _ = self._preparar(endpoint, lat, lon, params)
+            with self._lock:
+                enfileirar = chave not in self._revalidando
+                self._revalidando.add(chave)
+            if enfileirar:
+                self._revalidador.submit(self._revalidar, chave, endpoint, lat, lon, params)
+            return dados
+
+        try:
+            return self.atualizar(endpoint, lat, lon, params)
+        except Exception as e:
+            self.estatisticas["falhas"] += 1
+            registrar_erro("HttpCache", e)
+            return dados
+
+    def _buscar_coalescido(self, endpoint: str, chave: str, params: dict):
+        with self._lock:
+            futuro = self._em_andamento.get(chave)
+            dono = futuro is None
+            if dono:
+                futuro = Future()
+                self._em_andamento[chave] = futuro
+            else:
+                self.estatisticas["coalescidos"] += 1
+
+        if not dono:
+            return futuro.result()
+
+        try:
+            dados = self._buscar_rede(endpoint, params)
+            self._gravar(chave, endpoint, dados)
+            futuro.set_result(dados)
+            return dados
+        except Exception as e:
+            futuro.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._em_andamento.pop(chave, None)
+
+    def _gravar(self, chave: str, endpoint: str, dados):
+        with self._conexao() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO respostas (chave, endpoint, corpo, armazenado_em) VALUES (?, ?, ?, ?)",
+                (chave, endpoint, json.dumps(dados, ensure_ascii=False), time.time())
+            )
+
+    def _revalidar(self, chave: str, endpoint: str, lat: float, lon: float, params: dict):
+        try:
+            self.atualizar(endpoint, lat, lon, params)
+        except Exception as e:
+            self.estatisticas["falhas"] += 1
+            registrar_erro("HttpCache_Revalidacao", e)
+        finally:
+            with self._lock:
+                self._revalidando.discard(chave)
+
+    def _buscar_rede(self, endpoint: str, params: dict):
+        self.estatisticas["rede"] += 1
+        resp = self.session.get(self.endpoints[endpoint]["url"], params=params, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    # -------------------------------------------------------------------------
+    # 🧹 Manutenção
+    # -------------------------------------------------------------------------
+    def limpar_expirados(self) -> int:
+        """
+        Remove respostas além de ttl + stale. Retorna quantas foram apagadas.
+        """
+        agora, removidas = time.time(), 0
+        with self._conexao() as conn:
+            for nome, cfg in self.endpoints.items():
+                limite = agora - cfg["ttl"] - cfg.get("stale", 0)
+                removidas += conn.execute(
+                    "DELETE FROM respostas WHERE endpoint = ? AND armazenado_em < ?", (nome, limite)
+                ).rowcount
+        registrar_evento(f"HttpCache: {removidas} resposta(s) expirada(s) removida(s).")
+        return removidas
+
+
+# =============================================================================
+# 🧰 Funções de conveniência (instância compartilhada)
+# =============================================================================
+
+_instancia = None
+_instancia_lock = threading.Lock()
+
+
+def obter_http_cache() -> HttpCache:
+    """
+    Instância única do cache para o processo (compartilhada entre sessões do Streamlit).
+    """
+    global _instancia
+    with _instancia_lock:
+        if _instancia is None:
+            _instancia = HttpCache()
+        return _instancia
+
+
+def nome_local(lat: float, lon: float) -> str:
+    """
+    Nome do local pela geocodificação reversa (Nominatim), via cache.
+    """
+    dados = obter_http_cache().buscar_json("nominatim_reverse", lat, lon, {"format": "jsonv2"})
+    if not dados:
+        return "Local não identificado"
+    return dados.get("display_name", "Local desconhecido")
+
+
+def clima_atual(lat: float, lon: float) -> dict:
+    """
+    Temperatura e umidade atuais (Open-Meteo), via cache. Retorna {} sem dados.
+    """
+    dados = obter_http_cache().buscar_json(
+        "open_meteo", lat, lon, {"current": "temperature_2m,relative_humidity_2m"}
+    )
+    return (dados or {}).get("current", {})
+
+
+def idade_clima(atual: dict):
+    """
+    Idade em segundos de uma leitura de clima_atual(), pelo campo "time" (UTC) do
+    Open-Meteo. Retorna None se a leitura não trouxer o horário.
+    """
+    try:
+        leitura = datetime.fromisoformat(atual["time"]).replace(tzinfo=timezone.utc)
+    except (KeyError, TypeError, ValueError):
+        return None
+    return (datetime.now(timezone.utc) - leitura).total_seconds()
+
+
+def geocodificacao_em_cache(nome: str):
+    """
+    Consulta só o cache da busca por nome. Retorna (coordenadas, em_cache): um lugar já
+    consultado e não encontrado volta como (None, True); nunca consultado, (None, False).
+    """
+    params = {"q": nome, "format": "jsonv2", "limit": 1}
+    dados, estado = obter_http_cache().consultar("nominatim_search", None, None, params)
+    if estado == "ausente":
+        return None, False
+    if not dados:
+        return None, True
+    return (float(dados[0]["lat"]), float(dados[0]["lon"])), True
+
+
+def geocodificar(nome: str, somente_cache: bool = False):
+    """
+    (lat, lon) de um nome de lugar (país, cidade) pela busca do Nominatim, via cache.
+    Com somente_cache=True não vai à rede (aceita inclusive respostas antigas).
+    Retorna None se o lugar não for encontrado ou não houver rede nem cache.
+    """
+    cache = obter_http_cache()
+    params = {"q": nome, "format": "jsonv2", "limit": 1}
+    if somente_cache:
+        dados, _ = cache.consultar("nominatim_search", None, None, params)
+    else:
+        dados = cache.buscar_json("nominatim_search", None, None, params)
+    if not dados:
+        return None
+    return float(dados[0]["lat"]), float(dados[0]["lon"])
@@ -7,14 +7,14 @@ Data: 2025
 
 import os
 import sys
-import joblib
+import hashlib
+from collections import OrderedDict
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report, accuracy_score
 from utils.logger import registrar_evento, registrar_erro
-from utils.constants import MODEL_PATH
+from utils.cache import hash_conteudo
+from utils.constants import MODEL_PATH, EXPLAIN_CONFIG
+from core.dataset_snapshots import RepositorioSnapshots, id_conteudo
+from core.explainability import importancia_permutacao, contribuicoes_arvores
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # =============================================================================
 # ⚙️ Classe Principal — MLModel
@@ -29,18 +29,31 @@ class MLModel:
     def __init__(self, model_path: str = MODEL_PATH):
         self.model_path = model_path
         self.model = None
-        self.scaler = StandardScaler()
-        self.label_encoder = LabelEncoder()
+        self.scaler = None          # criados no treino ou carregados do disco
+        self.label_encoder = None
+        self.feature_names = []
+        self.versao = None
+        self.snapshot = None        # dataset/versão usados no treino
+        self._explicacoes = OrderedDict()   # (versão, hash da entrada) -> explicação (LRU)
 
     # -------------------------------------------------------------------------
     # 🧠 Treinamento
     # -------------------------------------------------------------------------
-    def train(self, df: pd.DataFrame, target_col: str):
+    def train(self, df: pd.DataFrame, target_col: str, snapshot: dict = None):
         """
         Treina o modelo de Machine Learning com base no DataFrame fornecido.
+        `snapshot` identifica o dataset versionado de origem; sem ele, o modelo é marcado
+        com o id de conteúdo de `df` (o mesmo usado pelas versões de core/dataset_snapshots).
         """
         try:
+            # sklearn é importado sob demanda (pesado para a inicialização do app)
+            from sklearn.model_selection import train_test_split
+            from sklearn.preprocessing import StandardScaler, LabelEncoder
+            from sklearn.ensemble import RandomForestClassifier
+            from sklearn.metrics import classification_report, accuracy_score
+
             registrar_evento("Iniciando treinamento do modelo...")
+            self.snapshot = snapshot or {"dataset": None, "id": id_conteudo(df)}
 
             if target_col not in df.columns:
                 raise ValueError(f"A coluna alvo '{target_col}' não foi encontrada no DataFrame.")
@@ -50,8 +63,11 @@ class MLModel:
 
             # Encoding de variáveis categóricas
             X = pd.get_dummies(X, drop_first=True)
+            self.feature_names = list(X.columns)
 
             # Normalização
+            self.scaler = StandardScaler()
+            self.label_encoder = LabelEncoder()
             X_scaled = self.scaler.fit_transform(X)
             y_encoded = self.label_encoder.fit_transform(y)
 
@@ -74,12 +90,32 @@ class MLModel:
             # Persistência
             self._save_model()
 
+            # Importância por permutação no conjunto de teste (cacheada pela versão do modelo)
+            self._salvar_explicacoes({
+                "importancia": importancia_permutacao(
+                    self.model, X_test, y_test, self.feature_names,
+                    n_repeticoes=EXPLAIN_CONFIG["n_repeticoes"],
+                    n_processos=EXPLAIN_CONFIG["n_processos"],
+                    random_state=EXPLAIN_CONFIG["random_state"],
+                )
+            })
+
             return acc
 
         except Exception as e:
             registrar_erro("ML_Training", e)
             return None
 
+    def train_snapshot(self, dataset: str, target_col: str, versao=None):
+        """
+        Treina sobre uma versão guardada do dataset (None = última), permitindo
+        retreinar exatamente com os dados de uma execução anterior.
+        """
+        repositorio = RepositorioSnapshots()
+        info = repositorio.info(dataset, versao)
+        df = repositorio.materializar(dataset, info["numero"])
+        return self.train(df, target_col, snapshot={"dataset": dataset, "id": info["id"], "numero": info["numero"]})
+
     # -------------------------------------------------------------------------
     # 🔮 Predição
     # -------------------------------------------------------------------------
@@ -91,9 +127,7 @@ class MLModel:
             if self.model is None:
                 self._load_model()
 
-            df_encoded = pd.get_dummies(df, drop_first=True)
-            df_encoded = df_encoded.reindex(columns=self.model.feature_names_in_, fill_value=0)
-            df_scaled = self.scaler.transform(df_encoded)
+            df_scaled = self._preparar_entrada(df)
 
             preds = self.model.predict(df_scaled)
             preds_decoded = self.label_encoder.inverse_transform(preds)
@@ -105,6 +139,94 @@ class MLModel:
             registrar_erro("ML_Prediction", e)
             return []
 
+    def _preparar_entrada(self, df: pd.DataFrame):
+        """
+        Aplica o mesmo encoding e normalização usados no treino. As dummies são geradas
+        para todas as categorias (uma entrada de uma linha perderia a sua com drop_first);
+        a categoria de referência do treino é descartada pelo reindex.
+        """
+        df_encoded = pd.get_dummies(df)
+        df_encoded = df_encoded.reindex(columns=self.feature_names, fill_value=0)
+        return self.scaler.transform(df_encoded)
+
+    def cobertura_features(self, df: pd.DataFrame) -> float:
+        """
+        Fração das features do modelo que a entrada fornece após o encoding;
+        o restante seria preenchido com 0 por _preparar_entrada.
+        """
+        try:
+            if self.model is None:
+                self._load_model()
+            if not self.feature_names:
+                return 0.0
+            colunas = set(pd.get_dummies(df).columns)
+            return sum(f in colunas for f in self.feature_names) / len(self.feature_names)
+        except Exception as e:
+            registrar_erro("ML_Coverage", e)
+            return 0.0
+
+    # -------------------------------------------------------------------------
+    # 🔎 Explicabilidade
+    # -------------------------------------------------------------------------
+    def importancia_features(self) -> pd.DataFrame:
+        """
+        Retorna a importância por permutação calculada no treino da versão atual do modelo.
+        Não recalcula nada: apenas lê o cache salvo junto ao modelo.
+        """
+        try:
+            if self.model is None:
+                self._load_model()
+            return self._carregar_explicacoes().get("importancia", pd.DataFrame())
+        except Exception as e:
+            registrar_erro("ML_Importance", e)
+            return pd.DataFrame()
+
+    def explicar(self, df: pd.DataFrame) -> dict:
+        """
+        Decompõe cada predição em viés + contribuição por feature (caminhos das árvores).
+        O resultado fica em memória (LRU limitado) por versão do modelo e conteúdo da
+        entrada; a chave considera a ordem das linhas e os nomes das colunas.
+        """
+        try:
+            if self.model is None:
+                self._load_model()
+
+            chave = (self.versao, hash_conteudo(df))
+            if chave in self._explicacoes:
+                self._explicacoes.move_to_end(chave)
+                return self._explicacoes[chave]
+
+            explicacao = contribuicoes_arvores(
+                self.model, self._preparar_entrada(df),
+                self.feature_names, self.label_encoder.classes_
+            )
+            self._explicacoes[chave] = explicacao
+            while len(self._explicacoes) > EXPLAIN_CONFIG["max_explicacoes"]:
+                self._explicacoes.popitem(last=False)
+            return explicacao
+
+        except Exception as e:
+            registrar_erro("ML_Explain", e)
+            return {}
+
+    def _caminho_explicacoes(self) -> str:
+        return os.path.join(self.model_path, f"explicacoes_{self.versao}.pkl")
+
+    def _salvar_explicacoes(self, explicacoes: dict):
+        try:
+            import joblib
+
+            joblib.dump(explicacoes, self._caminho_explicacoes())
+            registrar_evento(f"Explicações salvas para o modelo {self.versao}.")
+        except Exception as e:
+            registrar_erro("ML_SaveExplain", e)
+
+    def _carregar_explicacoes(self) -> dict:
+        import joblib
+
+        caminho = self._caminho_explicacoes()
+        return joblib.load(caminho) if os.path.exists(caminho) else {}
+
     # -------------------------------------------------------------------------
     # 💾 Persistência
     # -------------------------------------------------------------------------
@@ -113,10 +235,17 @@ class MLModel:
         Salva modelo e pré-processadores.
         """
         try:
+            import joblib
+
             os.makedirs(self.model_path, exist_ok=True)
             joblib.dump(self.model, os.path.join(self.model_path, "model.pkl"))
             joblib.dump(self.scaler, os.path.join(self.model_path, "scaler.pkl"))
             joblib.dump(self.label_encoder, os.path.join(self.model_path, "encoder.pkl"))
+            self.versao = self._calcular_versao()
+            joblib.dump(
+                {"feature_names": self.feature_names, "versao": self.versao, "snapshot": self.snapshot},
+                os.path.join(self.model_path, "meta.pkl")
+            )
             registrar_evento(f"Modelo salvo em: {self.model_path}")
         except Exception as e:
             registrar_erro("ML_SaveModel", e)
@@ -126,11 +255,37 @@ class MLModel:
         Carrega modelo treinado previamente.
         """
         try:
+            import joblib
+
             self.model = joblib.load(os.path.join(self.model_path, "model.pkl"))
             self.scaler = joblib.load(os.path.join(self.model_path, "scaler.pkl"))
             self.label_encoder = joblib.load(os.path.join(self.model_path, "encoder.pkl"))
+            caminho_meta = os.path.join(self.model_path, "meta.pkl")
+            if os.path.exists(caminho_meta):
+                meta = joblib.load(caminho_meta)
+                self.feature_names = meta["feature_names"]
+                self.versao = meta["versao"]
+                self.snapshot = meta.get("snapshot")
+            else:
+                # Modelos salvos antes do meta.pkl: nomes das features guardados pelo sklearn no fit
+                nomes = getattr(self.scaler, "feature_names_in_", getattr(self.model, "feature_names_in_", None))
+                if nomes is None:
+                    raise ValueError("meta.pkl ausente e o modelo não guarda os nomes das features.")
+                self.feature_names = list(nomes)
+                self.versao = self._calcular_versao()
+                self.snapshot = None
+                registrar_evento("meta.pkl ausente: features lidas do modelo salvo.", "warning")
             registrar_evento("Modelo carregado com sucesso!")
         except Exception as e:
             registrar_erro("ML_LoadModel", e)
             raise RuntimeError("Falha ao carregar modelo.")
 
+    def _calcular_versao(self) -> str:
+        """
+        Versão do modelo = hash do arquivo model.pkl (muda a cada novo treino).
+        """
+        h = hashlib.sha256()
+        with open(os.path.join(self.model_path, "model.pkl"), "rb") as f:
+            for bloco in iter(lambda: f.read(1 << 20), b""):
+                h.update(bloco)
+        return h.hexdigest()[:12]
@@ -0,0 +1,244 @@
+"""
+Módulo: pipeline_runner.py
+Descrição: Executor de pipelines em grafo (DAG). Cada etapa declara arquivos de entrada e de
+           saída; as dependências saem daí. Etapas cujas entradas, código e saídas não mudaram
+           desde a última execução são puladas, etapas independentes rodam em paralelo e cada
+           execução registra tempo e número de linhas por etapa.
+Autor: Samuel
+Data: 2025
+"""
+
+import fnmatch
+import glob
+import hashlib
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from utils.cache import hash_arquivo
+from utils.constants import PIPELINE_CONFIG
+from utils.logger import registrar_evento, registrar_erro
+
+# =============================================================================
+# 🧱 Etapa
+# =============================================================================
+
+def hash_caminho(caminho: str) -> str:
+    """
+    hash_arquivo para arquivos; para diretórios (p.ex. um dataset Parquet particionado),
+    hash dos caminhos relativos e do conteúdo de todos os arquivos dentro dele.
+    """
+    if not os.path.isdir(caminho):
+        return hash_arquivo(caminho)
+    h = hashlib.sha256()
+    for raiz, diretorios, arquivos in os.walk(caminho):
+        diretorios.sort()
+        for nome in sorted(arquivos):
+            completo = os.path.join(raiz, nome)
+            h.update(os.path.relpath(completo, caminho).encode("utf-8"))
+            h.update(hash_arquivo(completo).encode())
+    return h.hexdigest()
+
+
+class Etapa:
+    """
+    Função + entradas (caminhos ou padrões glob) + saídas. A função recebe as entradas
+    já expandidas e pode devolver o número de linhas gerado (int ou {saída: linhas}).
+    """
+
+    def __init__(self, nome: str, funcao, entradas=(), saidas=()):
+        self.nome = nome
+        self.funcao = funcao
+        self.entradas = list(entradas)
+        self.saidas = list(saidas)
+
+    def arquivos_entrada(self) -> list:
+        arquivos = []
+        for padrao in self.entradas:
+            arquivos.extend(sorted(glob.glob(padrao)) if glob.has_magic(padrao) else [padrao])
+        return arquivos
+
+    def assinatura(self) -> str:
+        """
+        Hash do código da etapa e do conteúdo de cada entrada (arquivo ou diretório;
+        hash_arquivo reaproveita o hash enquanto mtime e tamanho não mudam).
+        """
+        h = hashlib.sha256(inspect.getsource(self.funcao).encode("utf-8"))
+        for caminho in self.arquivos_entrada():
+            h.update(caminho.encode("utf-8"))
+            h.update(hash_caminho(caminho).encode() if os.path.exists(caminho) else b"ausente")
+        return h.hexdigest()
+
+
+# =============================================================================
+# 🕸️ Classe Principal — Pipeline
+# =============================================================================
+
+class Pipeline:
+    """
+    Registro de etapas e execução incremental por níveis do grafo.
+    """
+
+    def __init__(self, nome: str, caminho_estado: str = None, workers: int = None):
+        self.nome = nome
+        self.etapas = {}
+        self.caminho_estado = caminho_estado or PIPELINE_CONFIG["estado"]
+        self.workers = workers or PIPELINE_CONFIG["workers"]
+
+    def etapa(self, nome: str = None, entradas=(), saidas=()):
+        """
+        Decorator: @pipeline.etapa(entradas=[...], saidas=[...]).
+        """
+        def registrar(funcao):
+            self.etapas[nome or funcao.__name__] = Etapa(nome or funcao.__name__, funcao, entradas, saidas)
+            return funcao
+        return registrar
+
+    # -------------------------------------------------------------------------
+    # 🧭 Grafo
+    # -------------------------------------------------------------------------
+    def dependencias(self) -> dict:
+        """
+        etapa → etapas que produzem alguma das suas entradas.
+        """
+        produtor = {os.path.abspath(s): e.nome for e in self.etapas.values() for s in e.saidas}
+        deps = {}
+        for etapa in self.etapas.values():
+            arquivos = set(map(os.path.abspath, etapa.arquivos_entrada()))
+            arquivos |= {os.path.abspath(p) for p in etapa.entradas if not glob.has_magic(p)}
+            # Padrões glob também dependem de saídas ainda não geradas que casariam com eles
+            for padrao in filter(glob.has_magic, etapa.entradas):
+                arquivos |= {s for s in produtor if fnmatch.fnmatch(s, os.path.abspath(padrao))}
+            deps[etapa.nome] = sorted({produtor[a] for a in arquivos if a in produtor} - {etapa.nome})
+        return deps
+
+    def niveis(self) -> list:
+        """
+        Ordenação topológica em níveis: as etapas de um nível não dependem umas das outras.
+        """
+        deps = {nome: set(d) for nome, d in self.dependencias().items()}
+        niveis, feitas = [], set()
+        while len(feitas) < len(deps):
+            nivel = sorted(n for n, d in deps.items() if n not in feitas and d <= feitas)
+            if not nivel:
+                raise ValueError(f"Ciclo entre as etapas: {sorted(set(deps) - feitas)}")
+            niveis.append(nivel)
+            feitas.update(nivel)
+        return niveis
+
+    # -------------------------------------------------------------------------
+    # 💾 Estado da última execução
+    # -------------------------------------------------------------------------
+    def _ler_estado(self) -> dict:
+        try:
+            with open(self.caminho_estado, "r", encoding="utf-8") as f:
+                return json.load(f).get(self.nome, {})
+        except (OSError, ValueError):
+            return {}
+
+    def _gravar_estado(self, estado: dict):
+        try:
+            with open(self.caminho_estado, "r", encoding="utf-8") as f:
+                todos = json.load(f)
+        except (OSError, ValueError):
+            todos = {}
+        todos[self.nome] = estado
+        os.makedirs(os.path.dirname(self.caminho_estado), exist_ok=True)
+        temporario = self.caminho_estado + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(todos, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, self.caminho_estado)
+
+    @staticmethod
+    def _hash_saidas(etapa: Etapa) -> dict:
+        return {s: hash_caminho(s) for s in etapa.saidas if os.path.exists(s)}
+
+    def _atualizada(self, etapa: Etapa, anterior: dict, assinatura: str) -> bool:
+        """
+        Nada a fazer se as entradas e o código são os mesmos e as saídas continuam
+        existindo exatamente como foram gravadas.
+        """
+        return (
+            anterior.get("assinatura") == assinatura
+            and all(os.path.exists(s) for s in etapa.saidas)
+            and anterior.get("saidas") == self._hash_saidas(etapa)
+        )
+
+    # -------------------------------------------------------------------------
+    # 🚀 Execução
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _contar_linhas(etapa: Etapa, retorno) -> dict:
+        if isinstance(retorno, dict):
+            return retorno
+        if isinstance(retorno, int):
+            return {etapa.saidas[0] if etapa.saidas else etapa.nome: retorno}
+        return {}
+
+    def _executar_etapa(self, etapa: Etapa, anterior: dict, forcar: bool) -> dict:
+        assinatura = etapa.assinatura()
+        if not forcar and self._atualizada(etapa, anterior, assinatura):
+            return {**anterior, "status": "pulada", "tempo_s": 0.0}
+
+        inicio = time.perf_counter()
+        try:
+            for saida in etapa.saidas:
+                os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+            retorno = etapa.funcao(*etapa.arquivos_entrada())
+            linhas = self._contar_linhas(etapa, retorno)
+            status = "executada"
+        except Exception as e:
+            registrar_erro(f"Pipeline_{etapa.nome}", e)
+            return {"status": "erro", "erro": str(e), "tempo_s": round(time.perf_counter() - inicio, 3)}
+
+        tempo = round(time.perf_counter() - inicio, 3)
+        registrar_evento(f"Pipeline {self.nome}: etapa '{etapa.nome}' executada em {tempo}s — linhas {linhas}.")
+        # Assinatura recalculada: a etapa pode ter alterado as próprias entradas (ex.: download)
+        return {
+            "status": status, "tempo_s": tempo, "linhas": linhas,
+            "assinatura": etapa.assinatura(), "saidas": self._hash_saidas(etapa),
+            "executada_em": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    def executar(self, forcar: bool = False, somente=None) -> pd.DataFrame:
+        """
+        Executa os níveis em ordem; dentro de um nível as etapas rodam em paralelo.
+        Uma etapa cuja dependência falhou é marcada como "bloqueada" e não roda.
+        `somente` restringe a execução a algumas etapas (as demais ficam como estão).
+        Retorna um relatório com status, tempo e linhas por etapa.
+        """
+        estado = self._ler_estado()
+        deps = self.dependencias()
+        resultado = {}
+        inicio = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"pipeline-{self.nome}") as pool:
+            for nivel in self.niveis():
+                futuros = {}
+                for nome in nivel:
+                    if somente and nome not in somente:
+                        continue
+                    if any(resultado.get(d, {}).get("status") in ("erro", "bloqueada") for d in deps[nome]):
+                        resultado[nome] = {"status": "bloqueada", "tempo_s": 0.0}
+                        continue
+                    futuros[nome] = pool.submit(self._executar_etapa, self.etapas[nome], estado.get(nome, {}), forcar)
+                for nome, futuro in futuros.items():
+                    resultado[nome] = futuro.result()
+
+        for nome, info in resultado.items():
+            if info["status"] == "executada":
+                estado[nome] = {k: v for k, v in info.items() if k != "status"}
+        self._gravar_estado(estado)
+
+        total = round(time.perf_counter() - inicio, 3)
+        executadas = sum(r["status"] == "executada" for r in resultado.values())
+        registrar_evento(f"Pipeline {self.nome}: {executadas}/{len(resultado)} etapa(s) executada(s) em {total}s.")
+        return pd.DataFrame([
+            {"etapa": nome, "status": info["status"], "tempo_s": info.get("tempo_s", 0.0),
+             "linhas": sum(info.get("linhas", {}).values()) if info.get("linhas") else None,
+             "erro": info.get("erro", "")}
+            for nome, info in resultado.items()
+        ])
@@ -0,0 +1,275 @@
+"""
+Módulo: record_store.py
+Descrição: Armazenamento transacional dos cadastros (fungos e polímeros) em SQLite com WAL.
+           Inserções O(1) e atômicas, seguras entre sessões concorrentes, com importação
+           em lote, exportação JSON/JSONL e migração dos antigos arquivos fungos.json /
+           plasticos.json.
+Autor: Samuel
+Data: 2025
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from utils.constants import DB_TABLES, DEFAULT_DB_PATH
+from utils.logger import registrar_evento, registrar_erro
+
+# Campo dos registros com o hash do blob da imagem (ver core/blob_store.py)
+CAMPO_BLOB = "imagem_hash"
+
+
+def chave_nome(nome) -> str:
+    """
+    Forma normalizada do nome científico usada na deduplicação (sem espaços nas pontas,
+    casefold do Python). É gravada na coluna nome_chave e aplicada também aos arquivos
+    importados, para que banco e pandas comparem exatamente a mesma coisa.
+    """
+    return str(nome).strip().casefold()
+
+# =============================================================================
+# 🗄️ Classe Principal — RecordStore
+# =============================================================================
+
+class RecordStore:
+    """
+    Uma tabela por coleção (DB_TABLES). Cada registro guarda o dicionário original em JSON,
+    o nome científico e a sua chave normalizada (nome_chave, indexada), usada para busca
+    e deduplicação.
+    O SQLite cuida do bloqueio do arquivo; o modo WAL deixa leitores e o escritor em paralelo.
+    """
+
+    def __init__(self, caminho_db: str = None):
+        self.caminho_db = caminho_db or DEFAULT_DB_PATH
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(self.caminho_db)), exist_ok=True)
+
+        conn = self._conexao()
+        with conn:
+            for tabela in DB_TABLES.values():
+                conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {tabela} (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        nome_cientifico TEXT,
+                        nome_chave TEXT,
+                        dados TEXT NOT NULL,
+                        criado_em REAL NOT NULL
+                    )
+                """)
+                self._migrar_chave_nome(conn, tabela)
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{tabela}_nome_chave ON {tabela} (nome_chave)")
+            # Contagem de referências dos blobs (imagens) usados pelos registros
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS referencias_blobs (
+                    hash TEXT NOT NULL, tabela TEXT NOT NULL, id_registro INTEGER NOT NULL,
+                    PRIMARY KEY (tabela, id_registro, hash)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_referencias_hash ON referencias_blobs (hash)")
+            # Arquivos JSON legados já importados (gravado na mesma transação dos registros)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS migracoes (
+                    arquivo TEXT PRIMARY KEY, tabela TEXT NOT NULL, registros INTEGER NOT NULL, em REAL NOT NULL
+                )
+            """)
+
+    def _conexao(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.caminho_db, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _migrar_chave_nome(conn, tabela: str):
+        """
+        Bancos criados antes da coluna nome_chave: acrescenta a coluna, preenche com
+        chave_nome (o lower() do SQLite só trata ASCII) e troca o índice NOCASE antigo.
+        """
+        colunas = {linha[1] for linha in conn.execute(f"PRAGMA table_info({tabela})")}
+        if "nome_chave" in colunas:
+            return
+        conn.execute(f"ALTER TABLE {tabela} ADD COLUMN nome_chave TEXT")
+        nomes = conn.execute(f"SELECT id, nome_cientifico FROM {tabela} WHERE nome_cientifico IS NOT NULL").fetchall()
+        conn.executemany(f"UPDATE {tabela} SET nome_chave = ? WHERE id = ?", [(chave_nome(n), i) for i, n in nomes])
+        conn.execute(f"DROP INDEX IF EXISTS idx_{tabela}_nome")
+
+    @staticmethod
+    def _tabela(colecao: str) -> str:
+        if colecao not in DB_TABLES:
+            raise ValueError(f"Coleção desconhecida: {colecao}. Opções: {list(DB_TABLES)}")
+        return DB_TABLES[colecao]
+
+    @staticmethod
+    def _linha(registro: dict, instante: float):
+        nome = (registro.get("nome_cientifico") or "").strip() or None
+        chave = chave_nome(nome) if nome else None
+        return nome, chave, json.dumps(registro, ensure_ascii=False), instante
+
+    # -------------------------------------------------------------------------
+    # ✍️ Escrita
+    # -------------------------------------------------------------------------
+    def _inserir(self, conn, tabela: str, registro: dict, instante: float) -> int:
+        id_registro = conn.execute(
+            f"INSERT INTO {tabela} (nome_cientifico, nome_chave, dados, criado_em) VALUES (?, ?, ?, ?)",
+            self._linha(registro, instante)
+        ).lastrowid
+        if registro.get(CAMPO_BLOB):
+            conn.execute(
+                "INSERT OR IGNORE INTO referencias_blobs VALUES (?, ?, ?)",
+                (registro[CAMPO_BLOB], tabela, id_registro)
+            )
+        return id_registro
+
+    def inserir(self, colecao: str, registro: dict) -> int:
+        """
+        Acrescenta um registro numa transação própria e devolve o id gerado.
+        A referência ao blob da imagem (se houver) entra na mesma transação.
+        """
+        tabela = self._tabela(colecao)
+        conn = self._conexao()
+        with conn:
+            return self._inserir(conn, tabela, registro, time.time())
+
+    def inserir_varios(self, colecao: str, registros) -> list:
+        """
+        Insere todos os registros numa única transação (tudo ou nada) e devolve os ids.
+        """
+        tabela = self._tabela(colecao)
+        agora = time.time()
+        conn = self._conexao()
+        with conn:
+            return [self._inserir(conn, tabela, r, agora) for r in registros]
+
+    def remover(self, colecao: str, id_registro: int) -> bool:
+        tabela = self._tabela(colecao)
+        conn = self._conexao()
+        with conn:
+            conn.execute(
+                "DELETE FROM referencias_blobs WHERE tabela = ? AND id_registro = ?", (tabela, id_registro)
+            )
+            return conn.execute(f"DELETE FROM {tabela} WHERE id = ?", (id_registro,)).rowcount > 0
+
+    # -------------------------------------------------------------------------
+    # 🔗 Referências de blobs
+    # -------------------------------------------------------------------------
+    def contar_referencias(self, hash_blob: str) -> int:
+        return self._conexao().execute(
+            "SELECT COUNT(*) FROM referencias_blobs WHERE hash = ?", (hash_blob,)
+        ).fetchone()[0]
+
+    def hashes_referenciados(self) -> set:
+        return {h for (h,) in self._conexao().execute("SELECT DISTINCT hash FROM referencias_blobs")}
+
+    def total_referencias(self) -> int:
+        return self._conexao().execute("SELECT COUNT(*) FROM referencias_blobs").fetchone()[0]
+
+    # -------------------------------------------------------------------------
+    # 📖 Leitura
+    # -------------------------------------------------------------------------
+    def contar(self, colecao: str) -> int:
+        return self._conexao().execute(f"SELECT COUNT(*) FROM {self._tabela(colecao)}").fetchone()[0]
+
+    def listar(self, colecao: str, com_id: bool = False) -> list:
+        cursor = self._conexao().execute(f"SELECT id, dados FROM {self._tabela(colecao)} ORDER BY id")
+        if com_id:
+            return [{"id": i, **json.loads(d)} for i, d in cursor]
+        return [json.loads(d) for _, d in cursor]
+
+    def buscar_por_nome(self, colecao: str, nome: str) -> list:
+        cursor = self._conexao().execute(
+            f"SELECT dados FROM {self._tabela(colecao)} WHERE nome_chave = ? ORDER BY id",
+            (chave_nome(nome),)
+        )
+        return [json.loads(d) for (d,) in cursor]
+
+    def nomes_existentes(self, colecao: str) -> set:
+        """
+        Chaves (chave_nome) dos nomes científicos já cadastrados, para deduplicação.
+        """
+        cursor = self._conexao().execute(
+            f"SELECT DISTINCT nome_chave FROM {self._tabela(colecao)} WHERE nome_chave IS NOT NULL"
+        )
+        return {n for (n,) in cursor}
+
+    # -------------------------------------------------------------------------
+    # 📦 Exportação e migração
+    # -------------------------------------------------------------------------
+    def exportar_json(self, colecao: str) -> bytes:
+        """
+        Lista de registros no mesmo formato do antigo arquivo JSON.
+        """
+        return json.dumps(self.listar(colecao), ensure_ascii=False, indent=4).encode("utf-8")
+
+    def exportar_jsonl(self, colecao: str) -> bytes:
+        cursor = self._conexao().execute(f"SELECT dados FROM {self._tabela(colecao)} ORDER BY id")
+        return "".join(d + "\n" for (d,) in cursor).encode("utf-8")
+
+    def migrar_json(self, colecao: str, caminho_json: str) -> int:
+        """
+        Importa um arquivo JSON legado (lista de registros) e o renomeia para *.migrado,
+        de modo que a migração rode uma única vez. Um *.migrando deixado por um processo
+        interrompido é retomado; como a marca da migração é gravada na mesma transação
+        dos registros, repetir nunca duplica nada.
+        """
+        em_migracao = caminho_json + ".migrando"
+        if not os.path.exists(em_migracao):
+            if not os.path.exists(caminho_json):
+                return 0
+            # Renomear primeiro é atômico: só uma sessão/processo "ganha" o arquivo
+            try:
+                os.rename(caminho_json, em_migracao)
+            except OSError:
+                return 0
+        try:
+            with open(em_migracao, "r", encoding="utf-8") as f:
+                registros = json.load(f)
+        except FileNotFoundError:
+            return 0   # outra sessão concluiu a migração enquanto isso
+        except Exception as e:
+            registrar_erro("RecordStore_Migracao", e)
+            return 0
+
+        tabela = self._tabela(colecao)
+        conn = self._conexao()
+        try:
+            with conn:
+                # A marca é a primeira escrita: quem chega depois espera o commit e a encontra
+                nova = conn.execute(
+                    "INSERT OR IGNORE INTO migracoes VALUES (?, ?, ?, ?)",
+                    (os.path.abspath(caminho_json), tabela, len(registros), time.time())
+                ).rowcount
+                agora = time.time()
+                total = len([self._inserir(conn, tabela, r, agora) for r in registros]) if nova else 0
+        except Exception as e:
+            registrar_erro("RecordStore_Migracao", e)   # nada foi gravado; *.migrando fica para nova tentativa
+            return 0
+
+        try:
+            os.replace(em_migracao, caminho_json + ".migrado")
+        except FileNotFoundError:
+            pass
+        if total:
+            registrar_evento(f"RecordStore: {total} registro(s) migrados de {caminho_json} para '{colecao}'.")
+        return total
+
+
+# =============================================================================
+# 🧰 Instância compartilhada
+# =============================================================================
+
+_instancia = None
+_instancia_lock = threading.Lock()
+
+
+def obter_record_store() -> RecordStore:
+    global _instancia
+    with _instancia_lock:
+        if _instancia is None:
+            _instancia = RecordStore()
+        return _instancia
@@ -8,7 +8,6 @@ Data: 2025
 import os
 import pandas as pd
 from datetime import datetime
-from fpdf import FPDF
 from utils.logger import registrar_evento, registrar_erro
 from utils.constants import REPORTS_PATH
 
@@ -34,6 +33,8 @@ class ReportGenerator:
         Gera relatório completo em PDF com dados, resultados do modelo e análises simbióticas.
         """
         try:
+            from fpdf import FPDF
+
             registrar_evento("Iniciando geração de relatório inteligente...")
 
             timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -0,0 +1,155 @@
+"""
+Módulo: scenario_optimizer.py
+Descrição: Busca das melhores combinações fungo × condição ambiental para cada plástico,
+           combinando a heurística do Preditor e (opcionalmente) o MLModel treinado.
+Autor: Samuel
+Data: 2025
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+from core.heuristic_predictor import (
+    TEMPO_BASE, PESOS_PLASTICOS, PESOS_FUNGOS, FATORES_AMBIENTE
+)
+from utils.constants import SCENARIO_CONFIG
+from utils.logger import registrar_evento, registrar_erro
+
+# Todos os estados ambientais possíveis (2^n combinações de favorável/desfavorável)
+ESTADOS_AMBIENTE = np.array(list(itertools.product([True, False], repeat=len(FATORES_AMBIENTE))))
+
+
+# =============================================================================
+# 🧮 Grade de cenários
+# =============================================================================
+
+def montar_grade(plasticos=None, fungos=None) -> pd.DataFrame:
+    """
+    Produto cartesiano plásticos × fungos × estados ambientais, montado por índices.
+    """
+    plasticos = list(plasticos or PESOS_PLASTICOS)
+    fungos = list(fungos or PESOS_FUNGOS)
+
+    ip, if_, ie = np.meshgrid(
+        np.arange(len(plasticos)), np.arange(len(fungos)), np.arange(len(ESTADOS_AMBIENTE)),
+        indexing="ij"
+    )
+    grade = pd.DataFrame({
+        "plastico": pd.Categorical.from_codes(ip.ravel(), plasticos),
+        "fungo": pd.Categorical.from_codes(if_.ravel(), fungos),
+    })
+    estados = ESTADOS_AMBIENTE[ie.ravel()]
+    for j, condicao in enumerate(FATORES_AMBIENTE):
+        grade[condicao] = estados[:, j]
+    return grade
+
+
+def _tempo_heuristico(grade: pd.DataFrame) -> np.ndarray:
+    """
+    Heurística aplicada direto sobre os códigos categóricos da grade.
+    """
+    peso_p = np.array([PESOS_PLASTICOS[p] for p in grade["plastico"].cat.categories])
+    peso_f = np.array([PESOS_FUNGOS[f] for f in grade["fungo"].cat.categories])
+    condicoes = grade[list(FATORES_AMBIENTE)].to_numpy(dtype=bool)
+    fator = np.where(condicoes, np.fromiter(FATORES_AMBIENTE.values(), dtype=float), 1.0).prod(axis=1)
+
+    return TEMPO_BASE * peso_p[grade["plastico"].cat.codes] * peso_f[grade["fungo"].cat.codes] * fator
+
+
+def _score_modelo(modelo, grade: pd.DataFrame) -> np.ndarray:
+    """
+    Predição do MLModel para cada cenário, convertida para número (maior = melhor).
+    Devolve NaN se o modelo não existir, prever rótulos não numéricos ou tiver sido
+    treinado com features que a grade não fornece (seriam todas preenchidas com 0).
+    """
+    if modelo is None:
+        return np.full(len(grade), np.nan)
+    entrada = grade.astype({"plastico": str, "fungo": str})
+    cobertura = modelo.cobertura_features(entrada)
+    if cobertura < SCENARIO_CONFIG["cobertura_minima_modelo"]:
+        registrar_evento(f"Otimizador: a grade cobre só {cobertura:.0%} das features do modelo; "
+                         "ranking apenas pela heurística.", "warning")
+        return np.full(len(grade), np.nan)
+    preds = pd.to_numeric(pd.Series(modelo.predict(entrada)), errors="coerce").to_numpy(dtype=float)
+    return preds if len(preds) == len(grade) else np.full(len(grade), np.nan)
+
+
+def _normalizar(valores: np.ndarray, grupos: np.ndarray) -> np.ndarray:
+    """
+    Min-max por grupo (plástico), para que os critérios fiquem na mesma escala.
+    """
+    serie = pd.Series(valores)
+    minimo = serie.groupby(grupos).transform("min").to_numpy()
+    maximo = serie.groupby(grupos).transform("max").to_numpy()
+    amplitude = np.where(maximo > minimo, maximo - minimo, 1.0)
+    return (valores - minimo) / amplitude
+
+
+# =============================================================================
+# ✂️ Poda de opções dominadas
+# =============================================================================
+
+def _podar_dominados(custos: np.ndarray, grupos: np.ndarray, top_k: int) -> np.ndarray:
+    """
+    Máscara das opções que ainda podem entrar no top-k do seu grupo (plástico).
+    Uma opção dominada (pior ou igual em todos os critérios) por k ou mais
+    alternativas nunca fica entre as k melhores, qualquer que seja a ponderação.
+    `custos` (n × critérios) deve estar orientado para minimização; a comparação
+    é feita em bloco (todos contra todos do mesmo plástico) com NumPy.
+    """
+    mascara = np.ones(len(custos), dtype=bool)
+    for g in np.unique(grupos):
+        idx = np.flatnonzero(grupos == g)
+        c = custos[idx]
+        menor_igual = (c[:, None, :] <= c[None, :, :]).all(axis=2)
+        menor = (c[:, None, :] < c[None, :, :]).any(axis=2)
+        n_dominantes = (menor_igual & menor).sum(axis=0)  # linhas i que dominam a coluna j
+        mascara[idx] = n_dominantes < top_k
+    return mascara
+
+
+# =============================================================================
+# 🏆 Otimizador
+# =============================================================================
+
+def otimizar_cenarios(modelo=None, top_k: int = 3, peso_modelo: float = 0.5,
+                      plasticos=None, fungos=None) -> pd.DataFrame:
+    """
+    Avalia toda a grade de cenários e retorna as top-k combinações por plástico.
+
+    - Critérios: menor tempo heurístico e maior predição do MLModel (quando houver).
+    - Opções dominadas por k ou mais alternativas são descartadas antes do ranqueamento.
+    - O score final é a média ponderada dos critérios normalizados (0 = melhor).
+    """
+    try:
+        grade = montar_grade(plasticos, fungos)
+        grupos = grade["plastico"].cat.codes.to_numpy()
+
+        grade["tempo_estimado"] = _tempo_heuristico(grade)
+        grade["score_modelo"] = _score_modelo(modelo, grade)
+        usa_modelo = not np.isnan(grade["score_modelo"]).all()
+
+        custos = grade["tempo_estimado"].to_numpy()[:, None]
+        if usa_modelo:
+            custos = np.column_stack([custos[:, 0], -grade["score_modelo"].fillna(-np.inf).to_numpy()])
+
+        candidatos = grade[_podar_dominados(custos, grupos, top_k)].copy()
+        registrar_evento(f"Otimizador: {len(grade)} cenários avaliados, {len(candidatos)} após a poda.")
+
+        g = grupos[candidatos.index]
+        score = _normalizar(candidatos["tempo_estimado"].to_numpy(), g)
+        if usa_modelo:
+            score_ml = 1 - _normalizar(candidatos["score_modelo"].to_numpy(), g)
+            score = (1 - peso_modelo) * score + peso_modelo * np.nan_to_num(score_ml, nan=1.0)
+        candidatos["score"] = score
+
+        candidatos = candidatos.sort_values(["plastico", "score", "tempo_estimado"])
+        candidatos["ranking"] = candidatos.groupby("plastico", observed=True).cumcount() + 1
+        melhores = candidatos[candidatos["ranking"] <= top_k]
+
+        return melhores.astype({"plastico": str, "fungo": str}).reset_index(drop=True)
+
+    except Exception as e:
+        registrar_erro("Scenario_Optimizer", e)
+        return pd.DataFrame()
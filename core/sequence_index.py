@@ -0,0 +1,225 @@
+"""
+Módulo: sequence_index.py
+Descrição: Índice invertido de k-mers sobre as sequências de enzimas do catálogo de
+           degradadores. As listas de postagem ficam em arrays contíguos (formato CSR)
+           gravados em .npy e abertos por memory-map; a busca filtra candidatos pelos
+           k-mers em comum e pontua todos de uma vez, sem alinhamento par a par.
+Autor: Samuel
+Data: 2025
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from core.degraders_catalog import carregar_catalogo_degradadores
+from utils.cache import cache_recurso, hash_arquivo
+from utils.constants import DEGRADERS_SQL_PATH, SEQUENCE_INDEX_CONFIG
+from utils.logger import registrar_evento, registrar_erro
+
+# =============================================================================
+# 🔤 Codificação das sequências
+# =============================================================================
+
+def limpar_sequencia(texto: str) -> str:
+    """
+    Aceita FASTA ou texto livre: remove cabeçalhos (">..."), espaços, números e
+    converte para maiúsculas.
+    """
+    linhas = [l for l in str(texto or "").splitlines() if not l.startswith(">")]
+    return re.sub(r"[^A-Za-z]", "", "".join(linhas)).upper()
+
+
+class IndiceKmers:
+    """
+    Índice invertido k-mer → sequências. `offsets[c]:offsets[c + 1]` delimita em
+    `postagens` os ids das sequências que contêm o k-mer de código c; `tamanhos`
+    guarda quantos k-mers distintos cada sequência tem.
+    """
+
+    ARQUIVOS = ("offsets", "postagens", "tamanhos")
+
+    def __init__(self, offsets, postagens, tamanhos, k: int, alfabeto: str):
+        self.offsets = offsets
+        self.postagens = postagens
+        self.tamanhos = tamanhos
+        self.k = k
+        self.alfabeto = alfabeto
+        self.base = len(alfabeto) + 1   # o último símbolo (X) marca letras fora do alfabeto
+
+        self._tabela = np.full(256, len(alfabeto), dtype=np.int64)
+        self._tabela[np.frombuffer(alfabeto.encode("ascii"), dtype=np.uint8)] = np.arange(len(alfabeto))
+
+    def __len__(self):
+        return len(self.tamanhos)
+
+    def codificar(self, sequencia: str) -> np.ndarray:
+        """
+        Códigos distintos (ordenados) dos k-mers da sequência; k-mers com X são ignorados.
+        """
+        simbolos = self._tabela[np.frombuffer(sequencia.encode("ascii", "replace"), dtype=np.uint8)]
+        n = len(simbolos) - self.k + 1
+        if n <= 0:
+            return np.array([], dtype=np.int64)
+        codigos = np.zeros(n, dtype=np.int64)
+        invalido = np.zeros(n, dtype=bool)
+        for i in range(self.k):
+            janela = simbolos[i:i + n]
+            codigos = codigos * self.base + janela
+            invalido |= janela == self.base - 1
+        return np.unique(codigos[~invalido])
+
+    # -------------------------------------------------------------------------
+    # 🏗️ Construção e persistência
+    # -------------------------------------------------------------------------
+    @classmethod
+    def construir(cls, sequencias, k: int = None, alfabeto: str = None) -> "IndiceKmers":
+        k = k or SEQUENCE_INDEX_CONFIG["k"]
+        alfabeto = alfabeto or SEQUENCE_INDEX_CONFIG["alfabeto"]
+        vazio = cls(np.zeros(1, dtype=np.int64), np.array([], dtype=np.int32), np.array([], dtype=np.int32), k, alfabeto)
+
+        kmers = [vazio.codificar(s) for s in sequencias]
+        tamanhos = np.array([len(c) for c in kmers], dtype=np.int32)
+        codigos = np.concatenate(kmers) if kmers else np.array([], dtype=np.int64)
+        ids = np.repeat(np.arange(len(kmers), dtype=np.int32), tamanhos)
+
+        ordem = np.argsort(codigos, kind="stable")   # estável: ids crescentes em cada lista
+        contagem = np.bincount(codigos, minlength=vazio.base ** k)
+        offsets = np.concatenate([[0], np.cumsum(contagem)]).astype(np.int64)
+        return cls(offsets, ids[ordem], tamanhos, k, alfabeto)
+
+    def salvar(self, diretorio: str):
+        """
+        Grava num diretório temporário e o renomeia: quem abre o índice nunca vê arquivos pela metade.
+        """
+        pai = os.path.dirname(os.path.abspath(diretorio))
+        os.makedirs(pai, exist_ok=True)
+        temporario = tempfile.mkdtemp(dir=pai, prefix=".indice-")
+        try:
+            for nome in self.ARQUIVOS:
+                np.save(os.path.join(temporario, f"{nome}.npy"), getattr(self, nome))
+            with open(os.path.join(temporario, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"k": self.k, "alfabeto": self.alfabeto, "sequencias": len(self)}, f)
+            os.replace(temporario, diretorio)
+        except OSError:
+            shutil.rmtree(temporario, ignore_errors=True)
+            if not os.path.isdir(diretorio):   # outro processo pode ter gravado o mesmo índice antes
+                raise
+
+    @classmethod
+    def abrir(cls, diretorio: str) -> "IndiceKmers":
+        with open(os.path.join(diretorio, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {nome: np.load(os.path.join(diretorio, f"{nome}.npy"), mmap_mode="r") for nome in cls.ARQUIVOS}
+        return cls(k=meta["k"], alfabeto=meta["alfabeto"], **arrays)
+
+    # -------------------------------------------------------------------------
+    # 🔎 Consulta
+    # -------------------------------------------------------------------------
+    def compartilhados(self, codigos: np.ndarray) -> np.ndarray:
+        """
+        Quantos k-mers da consulta cada sequência indexada contém (uma contagem por sequência).
+        """
+        if not len(codigos) or not len(self):
+            return np.zeros(len(self), dtype=np.int64)
+        inicios = np.asarray(self.offsets[codigos])
+        tamanhos = np.asarray(self.offsets[codigos + 1]) - inicios
+        # Posições de todas as listas concatenadas, sem laço em Python
+        deslocamento = np.repeat(inicios - np.cumsum(tamanhos) + tamanhos, tamanhos)
+        posicoes = deslocamento + np.arange(tamanhos.sum())
+        return np.bincount(self.postagens[posicoes], minlength=len(self))
+
+    def buscar(self, sequencia: str, limite: int = 10, min_compartilhados: int = None,
+               max_candidatos: int = None) -> dict:
+        """
+        Candidatos com pelo menos `min_compartilhados` k-mers em comum, pontuados pelo
+        coeficiente de Dice entre os conjuntos de k-mers. Devolve arrays alinhados:
+        ids, compartilhados, similaridade (Dice) e cobertura (fração da consulta encontrada).
+        """
+        min_compartilhados = min_compartilhados or SEQUENCE_INDEX_CONFIG["min_compartilhados"]
+        max_candidatos = max_candidatos or SEQUENCE_INDEX_CONFIG["max_candidatos"]
+        codigos = self.codificar(sequencia)
+
+        contagem = self.compartilhados(codigos)
+        candidatos = np.flatnonzero(contagem >= min_compartilhados)
+        if len(candidatos) > max_candidatos:
+            candidatos = candidatos[np.argpartition(-contagem[candidatos], max_candidatos)[:max_candidatos]]
+
+        comuns = contagem[candidatos]
+        dice = 2 * comuns / (len(codigos) + np.asarray(self.tamanhos)[candidatos])
+        ordem = np.lexsort((-comuns, -dice))[:limite]
+        return {
+            "ids": candidatos[ordem],
+            "compartilhados": comuns[ordem],
+            "similaridade": dice[ordem],
+            "cobertura": comuns[ordem] / max(len(codigos), 1),
+        }
+
+
+# =============================================================================
+# 🦠 Índice do catálogo de degradadores
+# =============================================================================
+
+def _sequencias_do_catalogo(catalogo: pd.DataFrame) -> pd.DataFrame:
+    """
+    Uma linha por sequência distinta, com os microrganismos, enzimas e plásticos associados.
+    """
+    com_sequencia = catalogo[catalogo["Sequence"] != ""].assign(Sequence=lambda d: d["Sequence"].str.upper())
+    unir = lambda c: ", ".join(sorted({v for v in c if v}))
+    return com_sequencia.groupby("Sequence", sort=True).agg(
+        Microorganism=("Microorganism", unir),
+        Enzyme=("Enzyme", unir),
+        Plastic=("Plastic", unir),
+        GenbankID=("GenbankID", unir),
+    ).reset_index()
+
+
+@cache_recurso(arquivos=("caminho",))
+def indice_sequencias(caminho: str = DEGRADERS_SQL_PATH) -> tuple:
+    """
+    (IndiceKmers, tabela de sequências). O índice fica em disco, num diretório
+    identificado pelo hash do catálogo, e só é reconstruído quando o catálogo muda.
+    """
+    k, alfabeto = SEQUENCE_INDEX_CONFIG["k"], SEQUENCE_INDEX_CONFIG["alfabeto"]
+    tabela = _sequencias_do_catalogo(carregar_catalogo_degradadores(caminho))
+    diretorio = os.path.join(
+        SEQUENCE_INDEX_CONFIG["dir"], f"{hash_arquivo(caminho)[:16]}_k{k}_{len(alfabeto)}"
+    )
+    if not os.path.exists(os.path.join(diretorio, "meta.json")):
+        inicio = time.perf_counter()
+        IndiceKmers.construir(tabela["Sequence"], k, alfabeto).salvar(diretorio)
+        registrar_evento(
+            f"Índice de k-mers (k={k}) construído: {len(tabela)} sequência(s) "
+            f"em {time.perf_counter() - inicio:.2f}s."
+        )
+    return IndiceKmers.abrir(diretorio), tabela
+
+
+def buscar_enzimas_similares(sequencia: str, limite: int = 10) -> pd.DataFrame:
+    """
+    Enzimas degradadoras conhecidas mais parecidas com a sequência informada.
+    """
+    colunas = ["Enzyme", "Microorganism", "Plastic", "GenbankID",
+               "kmers_comuns", "similaridade", "cobertura", "tamanho"]
+    try:
+        sequencia = limpar_sequencia(sequencia)
+        indice, tabela = indice_sequencias()
+        if len(sequencia) < indice.k or not len(indice):
+            return pd.DataFrame(columns=colunas)
+
+        achados = indice.buscar(sequencia, limite)
+        resultado = tabela.iloc[achados["ids"]].reset_index(drop=True)
+        resultado["kmers_comuns"] = achados["compartilhados"]
+        resultado["similaridade"] = np.round(achados["similaridade"], 3)
+        resultado["cobertura"] = np.round(achados["cobertura"], 3)
+        resultado["tamanho"] = resultado["Sequence"].str.len()
+        return resultado[colunas]
+
+    except Exception as e:
+        registrar_erro("SequenceIndex", e)
+        return pd.DataFrame(columns=colunas)
@@ -0,0 +1,168 @@
+"""
+Módulo: spatial_aggregation.py
+Descrição: Agregação espacial no servidor para heatmaps — agrupa pontos em grade quadrada
+           ou hexagonal por nível de zoom (NumPy), calcula estatísticas ponderadas por
+           célula e mantém em cache a pirâmide de zooms. Só as células vão ao navegador.
+Autor: Samuel
+Data: 2025
+"""
+
+import numpy as np
+import pandas as pd
+from core.geo_layers import pixels_mercator
+from utils.cache import cache_dados
+from utils.constants import GEO_CONFIG
+from utils.logger import registrar_evento, registrar_erro
+
+COLUNAS_CELULA = ["latitude", "longitude", "contagem", "soma_pesos", "media", "desvio", "maximo"]
+
+_RAIZ3 = np.sqrt(3.0)
+
+# =============================================================================
+# 📐 Geometria das células (em pixels Web Mercator)
+# =============================================================================
+
+def coordenadas_de_pixels(x: np.ndarray, y: np.ndarray, zoom: int):
+    """
+    Inverso de pixels_mercator: pixels do mundo no zoom → (lat, lon).
+    """
+    escala = 256 * 2 ** zoom
+    lon = x / escala * 360.0 - 180.0
+    lat = np.degrees(np.arctan(np.sinh(np.pi * (1.0 - 2.0 * y / escala))))
+    return lat, lon
+
+
+def _celulas_quadradas(x, y, tamanho: float):
+    i = np.floor(x / tamanho).astype(np.int64)
+    j = np.floor(y / tamanho).astype(np.int64)
+    return i, j, (i + 0.5) * tamanho, (j + 0.5) * tamanho
+
+
+def _celulas_hexagonais(x, y, tamanho: float):
+    """
+    Hexágonos "pointy-top" de raio `tamanho`: coordenadas axiais com arredondamento cúbico.
+    """
+    q = (_RAIZ3 / 3.0 * x - y / 3.0) / tamanho
+    r = (2.0 / 3.0 * y) / tamanho
+    s = -q - r
+
+    qi, ri, si = np.rint(q), np.rint(r), np.rint(s)
+    dq, dr, ds = np.abs(qi - q), np.abs(ri - r), np.abs(si - s)
+    corrige_q = (dq > dr) & (dq > ds)
+    corrige_r = ~corrige_q & (dr > ds)
+    qi = np.where(corrige_q, -ri - si, qi)
+    ri = np.where(corrige_r, -qi - si, ri)
+
+    cx = tamanho * _RAIZ3 * (qi + ri / 2.0)
+    cy = tamanho * 1.5 * ri
+    return qi.astype(np.int64), ri.astype(np.int64), cx, cy
+
+
+# =============================================================================
+# 📊 Agregação por zoom
+# =============================================================================
+
+def agregar_celulas(lat, lon, valores=None, pesos=None, zoom: int = 4,
+                    forma: str = None, celula_px: float = None) -> pd.DataFrame:
+    """
+    Agrupa pontos em células de `celula_px` pixels no zoom dado e calcula, por célula:
+    contagem, soma dos pesos, média e desvio ponderados de `valores` e valor máximo.
+    Sem `valores`, a média é a contagem (densidade de pontos).
+    """
+    try:
+        forma = forma or GEO_CONFIG["forma_celula"]
+        celula_px = celula_px or GEO_CONFIG["celula_px"]
+
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        valores = np.ones_like(lat) if valores is None else np.asarray(valores, dtype=float)
+        pesos = np.ones_like(lat) if pesos is None else np.asarray(pesos, dtype=float)
+
+        validos = np.isfinite(lat) & np.isfinite(lon) & np.isfinite(valores) & np.isfinite(pesos)
+        lat, lon, valores, pesos = lat[validos], lon[validos], valores[validos], pesos[validos]
+        if lat.size == 0:
+            return pd.DataFrame(columns=COLUNAS_CELULA)
+
+        x, y = pixels_mercator(lat, lon, zoom)
+        celulas = _celulas_hexagonais if forma == "hex" else _celulas_quadradas
+        i, j, cx, cy = celulas(x, y, float(celula_px))
+
+        # Um id inteiro por célula → grupos via unique + bincount (sem loop em Python)
+        ids = (i << 32) ^ (j & 0xFFFFFFFF)
+        _, primeiro, grupo = np.unique(ids, return_index=True, return_inverse=True)
+        n = primeiro.size
+
+        contagem = np.bincount(grupo, minlength=n)
+        soma_pesos = np.bincount(grupo, weights=pesos, minlength=n)
+        soma_pv = np.bincount(grupo, weights=pesos * valores, minlength=n)
+        soma_pv2 = np.bincount(grupo, weights=pesos * valores ** 2, minlength=n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            media = np.where(soma_pesos > 0, soma_pv / soma_pesos, np.nan)
+            variancia = np.where(soma_pesos > 0, soma_pv2 / soma_pesos - media ** 2, np.nan)
+        maximo = np.full(n, -np.inf)
+        np.maximum.at(maximo, grupo, valores)
+
+        lat_c, lon_c = coordenadas_de_pixels(cx[primeiro], cy[primeiro], zoom)
+        return pd.DataFrame({
+            "latitude": lat_c,
+            "longitude": lon_c,
+            "contagem": contagem,
+            "soma_pesos": soma_pesos,
+            "media": media,
+            "desvio": np.sqrt(np.clip(variancia, 0, None)),
+            "maximo": maximo,
+        })
+
+    except Exception as e:
+        registrar_erro("SpatialAggregation", e)
+        return pd.DataFrame(columns=COLUNAS_CELULA)
+
+
+@cache_dados(ttl=None)
+def piramide(df: pd.DataFrame, coluna_valor: str = None, coluna_peso: str = None,
+             zooms=None, forma: str = None, celula_px: float = None) -> dict:
+    """
+    Células de todos os zooms de uma vez ({zoom: DataFrame}), em cache pelo conteúdo
+    do DataFrame: novas consultas ao mesmo conjunto de pontos não reagregam nada.
+    """
+    z_min, z_max = zooms or GEO_CONFIG["zooms_piramide"]
+    valores = df[coluna_valor] if coluna_valor in df.columns else None
+    pesos = df[coluna_peso] if coluna_peso in df.columns else None
+
+    niveis = {
+        z: agregar_celulas(df["latitude"], df["longitude"], valores, pesos, z, forma, celula_px)
+        for z in range(z_min, z_max + 1)
+    }
+    registrar_evento(
+        f"Pirâmide espacial: {len(df)} ponto(s) → "
+        + ", ".join(f"z{z}={len(c)}" for z, c in niveis.items())
+    )
+    return niveis
+
+
+def celulas_zoom(df: pd.DataFrame, zoom: int, coluna_valor: str = None, coluna_peso: str = None) -> pd.DataFrame:
+    """
+    Células do zoom pedido, limitadas ao intervalo da pirâmide.
+    """
+    z_min, z_max = GEO_CONFIG["zooms_piramide"]
+    return piramide(df, coluna_valor, coluna_peso)[min(max(zoom, z_min), z_max)]
+
+
+# =============================================================================
+# 🔥 Dados para heatmap
+# =============================================================================
+
+def pesos_heatmap(celulas: pd.DataFrame, campo: str = "media") -> list:
+    """
+    [[lat, lon, peso]] com peso normalizado em [0, 1] — formato do folium HeatMap.
+    """
+    if celulas.empty:
+        return []
+    valores = celulas[campo].to_numpy(dtype=float)
+    minimo, maximo = np.nanmin(valores), np.nanmax(valores)
+    normalizados = (valores - minimo) / (maximo - minimo) if maximo > minimo else np.ones_like(valores)
+    # Peso mínimo pequeno para que células de valor mais baixo ainda apareçam
+    normalizados = np.clip(np.nan_to_num(normalizados), 0.05, 1.0)
+    return np.column_stack([
+        celulas["latitude"].to_numpy(), celulas["longitude"].to_numpy(), np.round(normalizados, 3)
+    ]).tolist()
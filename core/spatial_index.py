@@ -0,0 +1,172 @@
+"""
+Módulo: spatial_index.py
+Descrição: Índice espacial (BallTree com distância haversine) sobre os pontos de amostragem
+           e os locais de isolamento do catálogo de degradadores, para responder a um
+           clique no mapa com os vizinhos mais próximos ou os itens dentro de um raio.
+Autor: Samuel
+Data: 2025
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from core.degraders_catalog import carregar_catalogo_degradadores
+from core.geo_layers import carregar_pontos_amostragem
+from core.http_cache import geocodificacao_em_cache, geocodificar
+from utils.cache import cache_recurso
+from utils.constants import DEGRADERS_SQL_PATH, GEO_CONFIG
+from utils.logger import registrar_evento, registrar_erro
+
+RAIO_TERRA_KM = 6371.0088
+
+# =============================================================================
+# 🌐 Índice genérico
+# =============================================================================
+
+class IndiceEspacial:
+    """
+    BallTree em radianos com métrica haversine. `dados` acompanha os pontos linha a linha;
+    as consultas devolvem as linhas correspondentes com a coluna distancia_km.
+    """
+
+    def __init__(self, lat, lon, dados: pd.DataFrame):
+        from sklearn.neighbors import BallTree
+
+        self.dados = dados.reset_index(drop=True)
+        coords = np.radians(np.column_stack([np.asarray(lat, float), np.asarray(lon, float)]))
+        self.arvore = BallTree(coords, metric="haversine") if len(coords) else None
+
+    def __len__(self):
+        return len(self.dados)
+
+    def consultar_vizinhos(self, lat: float, lon: float, k: int = 5):
+        """
+        Índices e distâncias (km) dos k pontos mais próximos, sem montar DataFrame.
+        """
+        if self.arvore is None:
+            return np.array([], dtype=int), np.array([])
+        k = min(k, len(self))
+        dist, ind = self.arvore.query(np.radians([[lat, lon]]), k=k)
+        return ind[0], dist[0] * RAIO_TERRA_KM
+
+    def consultar_raio(self, lat: float, lon: float, raio_km: float):
+        if self.arvore is None:
+            return np.array([], dtype=int), np.array([])
+        ind, dist = self.arvore.query_radius(
+            np.radians([[lat, lon]]), r=raio_km / RAIO_TERRA_KM, return_distance=True, sort_results=True
+        )
+        return ind[0], dist[0] * RAIO_TERRA_KM
+
+    def _tabela(self, indices, distancias) -> pd.DataFrame:
+        resultado = self.dados.iloc[indices].copy()
+        resultado["distancia_km"] = np.round(distancias, 1)
+        return resultado.reset_index(drop=True)
+
+    def vizinhos(self, lat: float, lon: float, k: int = 5) -> pd.DataFrame:
+        return self._tabela(*self.consultar_vizinhos(lat, lon, k))
+
+    def no_raio(self, lat: float, lon: float, raio_km: float) -> pd.DataFrame:
+        return self._tabela(*self.consultar_raio(lat, lon, raio_km))
+
+
+# =============================================================================
+# 📍 Pontos de amostragem
+# =============================================================================
+
+@cache_recurso(arquivos=("caminho",))
+def indice_sitios(caminho: str = GEO_CONFIG["pontos_amostragem"]) -> IndiceEspacial:
+    """
+    Índice dos pontos de coleta; reconstruído só quando o arquivo de pontos muda.
+    """
+    df = carregar_pontos_amostragem(caminho)
+    df = df[np.isfinite(df["latitude"]) & np.isfinite(df["longitude"])]
+    return IndiceEspacial(df["latitude"], df["longitude"], df)
+
+
+# =============================================================================
+# 🦠 Locais de isolamento dos degradadores
+# =============================================================================
+
+_geocodificador = {"thread": None}
+_geocodificador_lock = threading.Lock()
+
+
+def _geocodificar_em_segundo_plano(nomes: list):
+    """
+    Geocodifica os locais que nunca foram consultados, respeitando o limite de
+    1 requisição/s do Nominatim (a espera só acontece depois de uma ida à rede).
+    Lugares não encontrados ficam no cache como resposta vazia e não voltam à fila;
+    o índice só é invalidado se algum local novo ganhou coordenadas.
+    """
+    def tarefa():
+        encontrados = consultados = 0
+        for nome in nomes:
+            if geocodificacao_em_cache(nome)[1]:
+                continue
+            encontrados += geocodificar(nome) is not None
+            consultados += 1
+            time.sleep(1.0)
+        registrar_evento(f"Geocodificação de locais de isolamento: {encontrados}/{consultados} encontrados.")
+        if encontrados:
+            indice_degradadores.limpar()
+
+    with _geocodificador_lock:
+        thread = _geocodificador["thread"]
+        if thread is None or not thread.is_alive():
+            _geocodificador["thread"] = threading.Thread(target=tarefa, name="geocodificacao", daemon=True)
+            _geocodificador["thread"].start()
+
+
+@cache_recurso(arquivos=("caminho",))
+def indice_degradadores(caminho: str = DEGRADERS_SQL_PATH) -> IndiceEspacial:
+    """
+    Índice com um ponto por local de isolamento (país/cidade) do catálogo.
+    Usa apenas coordenadas já em cache; locais nunca consultados são buscados em
+    segundo plano e o índice é reconstruído quando algum deles é encontrado.
+    """
+    catalogo = carregar_catalogo_degradadores(caminho)
+    if catalogo.empty:
+        return IndiceEspacial([], [], pd.DataFrame(columns=["local", "registros"]))
+
+    locais = catalogo.loc[catalogo["Isolation_location"] != "", "Isolation_location"].value_counts()
+    em_cache = {nome: geocodificacao_em_cache(nome) for nome in locais.index}
+    coordenadas = {nome: c for nome, (c, _) in em_cache.items()}
+    faltantes = [nome for nome, (_, consultado) in em_cache.items() if not consultado]
+    if faltantes:
+        _geocodificar_em_segundo_plano(faltantes)
+
+    conhecidos = [nome for nome, c in coordenadas.items() if c is not None]
+    dados = pd.DataFrame({"local": conhecidos, "registros": locais.loc[conhecidos].to_numpy()})
+    registrar_evento(f"Índice de degradadores: {len(conhecidos)} local(is) geocodificado(s), {len(faltantes)} pendente(s), "
+                     f"{len(locais) - len(conhecidos) - len(faltantes)} não encontrado(s).")
+    return IndiceEspacial(
+        [coordenadas[n][0] for n in conhecidos], [coordenadas[n][1] for n in conhecidos], dados
+    )
+
+
+def degradadores_proximos(lat: float, lon: float, k_locais: int = 3, plastico: str = None,
+                          limite: int = 10) -> pd.DataFrame:
+    """
+    Degradadores isolados nos k locais mais próximos do ponto, do mais perto ao mais longe,
+    opcionalmente filtrados pelo tipo de plástico.
+    """
+    colunas = ["Microorganism", "Plastic", "Enzyme", "Isolation_location", "Isolation_environment", "distancia_km"]
+    try:
+        locais = indice_degradadores().vizinhos(lat, lon, k_locais)
+        if locais.empty:
+            return pd.DataFrame(columns=colunas)
+
+        catalogo = carregar_catalogo_degradadores()
+        if plastico:
+            catalogo = catalogo[catalogo["Plastic"].str.upper() == plastico.upper()]
+        resultado = catalogo.merge(
+            locais[["local", "distancia_km"]], left_on="Isolation_location", right_on="local"
+        )
+        resultado = resultado.sort_values(["distancia_km", "Microorganism"], kind="stable")
+        return resultado.drop_duplicates(["Microorganism", "Plastic"])[colunas].head(limite).reset_index(drop=True)
+
+    except Exception as e:
+        registrar_erro("SpatialIndex_Degradadores", e)
+        return pd.DataFrame(columns=colunas)
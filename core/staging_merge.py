@@ -0,0 +1,238 @@
+"""
+Módulo: staging_merge.py
+Descrição: Junção dos arquivos brutos em staging por chaves (organismo, plástico, região, ano).
+           Arquivos de ensaios (tabelas de fatos) são lidos em blocos e cada bloco passa por
+           um hash join contra as tabelas auxiliares, com as chaves convertidas em códigos
+           inteiros. O resultado é uma tabela densa — só linhas reais de ensaio — com tipos
+           declarados em um esquema ao lado do CSV.
+Autor: Samuel
+Data: 2025
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from utils.constants import STAGING_MERGE_CONFIG
+from utils.logger import registrar_evento
+
+# =============================================================================
+# 🔤 Colunas e chaves
+# =============================================================================
+
+def normalizar_colunas(colunas) -> list:
+    """
+    Minúsculas, sem espaços nas pontas e com os sinônimos de STAGING_MERGE_CONFIG aplicados.
+    """
+    sinonimos = STAGING_MERGE_CONFIG["sinonimos"]
+    normalizadas = [str(c).strip().lower() for c in colunas]
+    return [sinonimos.get(c, c) for c in normalizadas]
+
+
+def _valores_chave(serie: pd.Series) -> pd.Series:
+    """
+    Forma comparável de uma chave: números como float (1850 == 1850.0) e textos
+    sem espaços extras e sem diferença de maiúsculas.
+    """
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.astype("float64")
+    return serie.astype("string").str.strip().str.casefold()
+
+
+def _codigos_chave(serie: pd.Series, categorias: pd.Index) -> np.ndarray:
+    """
+    Posição de cada valor em `categorias` (-1 se ausente). Normaliza só os valores
+    distintos do bloco e espalha o resultado pelos códigos da fatoração.
+    """
+    codigos, distintos = pd.factorize(serie)
+    posicoes = categorias.get_indexer(_valores_chave(pd.Series(distintos, dtype=serie.dtype)))
+    return np.where(codigos >= 0, posicoes[codigos] if len(posicoes) else -1, -1)
+
+
+def _ler_cabecalho(caminho: str) -> list:
+    return normalizar_colunas(pd.read_csv(caminho, nrows=0).columns)
+
+
+# =============================================================================
+# 🧮 Tabela auxiliar (lado de construção do hash join)
+# =============================================================================
+
+class TabelaAuxiliar:
+    """
+    Tabela pequena unida aos ensaios. Cada chave vira um código (posição na lista de
+    categorias) e as chaves combinadas viram um único inteiro; o índice pandas sobre esse
+    inteiro é a tabela hash consultada por bloco. Chaves repetidas são resumidas pela
+    média das colunas numéricas.
+    """
+
+    def __init__(self, nome: str, df: pd.DataFrame, chaves: list):
+        self.nome = nome
+        self.chaves = list(chaves)
+        df = df.dropna(subset=self.chaves)
+
+        self.categorias = {}
+        partes = []
+        for chave in self.chaves:
+            codigos, categorias = pd.factorize(_valores_chave(df[chave]))
+            self.categorias[chave] = pd.Index(categorias)
+            partes.append(codigos)
+        codigo = self._combinar(partes)
+
+        valores = df.drop(columns=self.chaves)
+        valores.columns = [f"{nome}_{c}" for c in valores.columns]
+        if pd.Index(codigo).has_duplicates:
+            valores = valores.select_dtypes(include=[np.number]).groupby(codigo).mean()
+        else:
+            valores.index = codigo
+        self.valores = valores
+
+    def _combinar(self, partes: list) -> np.ndarray:
+        """
+        Código misto (base = nº de categorias de cada chave); -1 se alguma chave não existe.
+        """
+        codigo = np.zeros(len(partes[0]), dtype=np.int64)
+        ausente = np.zeros(len(partes[0]), dtype=bool)
+        for chave, codigos in zip(self.chaves, partes):
+            codigo = codigo * len(self.categorias[chave]) + codigos
+            ausente |= codigos < 0
+        codigo[ausente] = -1
+        return codigo
+
+    def juntar(self, bloco: pd.DataFrame) -> pd.DataFrame:
+        """
+        Left join de um bloco de ensaios: linhas sem correspondência ficam com NaN.
+        """
+        partes = [_codigos_chave(bloco[chave], self.categorias[chave]) for chave in self.chaves]
+        encontrados = self.valores.reindex(self._combinar(partes))
+        encontrados.index = bloco.index
+        return pd.concat([bloco, encontrados], axis=1)
+
+
+# =============================================================================
+# 🧾 Esquema (tipos) da tabela de staging
+# =============================================================================
+
+def caminho_esquema(caminho_csv: str) -> str:
+    return os.path.splitext(caminho_csv)[0] + ".schema.json"
+
+
+def _inferir_tipos(bloco: pd.DataFrame) -> dict:
+    """
+    Tipos decididos no primeiro bloco e impostos aos seguintes: números viram float64
+    (chaves inteiras, Int64) e o restante, category. Os blocos seguintes só podem
+    alargar um tipo (ver _aplicar_tipos), nunca perder valores.
+    """
+    tipos = {}
+    for coluna in bloco.columns:
+        serie = bloco[coluna]
+        numeros = pd.to_numeric(serie, errors="coerce")
+        if serie.notna().any() and numeros.notna().sum() == serie.notna().sum():
+            inteira = coluna in STAGING_MERGE_CONFIG["chaves"] and (numeros.dropna() % 1 == 0).all()
+            tipos[coluna] = "Int64" if inteira else "float64"
+        else:
+            tipos[coluna] = "category"
+    return tipos
+
+
+def _aplicar_tipos(bloco: pd.DataFrame, tipos: dict) -> pd.DataFrame:
+    """
+    Impõe `tipos` ao bloco, alargando-os (em `tipos`) quando o bloco não cabe neles:
+    Int64 → float64 para decimais e numérico → category para texto. Blocos já gravados
+    continuam legíveis com o tipo mais largo, que é o que vai para o esquema.
+    """
+    for coluna, tipo in tipos.items():
+        if tipo != "category":
+            numeros = pd.to_numeric(bloco[coluna], errors="coerce")
+            if (numeros.isna() & bloco[coluna].notna()).any():
+                registrar_evento(f"Staging: texto na coluna numérica '{coluna}'; gravada como category.", "warning")
+                tipos[coluna] = tipo = "category"
+            elif tipo == "Int64" and (numeros.dropna() % 1 != 0).any():
+                tipos[coluna] = tipo = "float64"
+        if tipo == "category":
+            bloco[coluna] = bloco[coluna].astype("string").str.strip()
+        else:
+            bloco[coluna] = numeros.astype(tipo)
+    return bloco
+
+
+def ler_staging(caminho: str, colunas=None) -> pd.DataFrame:
+    """
+    Lê a tabela de staging com os tipos do esquema (category para textos).
+    """
+    with open(caminho_esquema(caminho), "r", encoding="utf-8") as f:
+        tipos = json.load(f)["colunas"]
+    if colunas is not None:
+        tipos = {c: t for c, t in tipos.items() if c in colunas}
+    return pd.read_csv(caminho, usecols=list(tipos), dtype=tipos)
+
+
+# =============================================================================
+# 🔗 Junção
+# =============================================================================
+
+def _chaves_da_fonte(arquivo: str, colunas: list, colunas_fato: set) -> list:
+    declaradas = STAGING_MERGE_CONFIG["fontes"].get(os.path.basename(arquivo))
+    candidatas = declaradas or STAGING_MERGE_CONFIG["chaves"]
+    return [c for c in candidatas if c in colunas and c in colunas_fato]
+
+
+def mesclar_staging(arquivos, destino: str) -> int:
+    """
+    Une os CSV brutos em `destino`: ensaios lidos em blocos, unidos às tabelas auxiliares
+    que compartilham alguma chave com eles. Auxiliares sem chave em comum ficam de fora
+    (em vez de empilhadas como linhas vazias). Retorna o número de linhas gravadas.
+    """
+    cfg = STAGING_MERGE_CONFIG
+    cabecalhos = {caminho: _ler_cabecalho(caminho) for caminho in arquivos}
+    fatos = [c for c, colunas in cabecalhos.items() if cfg["fato"] in colunas]
+    if not fatos:
+        raise ValueError(f"Nenhum arquivo de ensaios (coluna '{cfg['fato']}') entre {list(arquivos)}.")
+
+    colunas_fato = list(dict.fromkeys(c for caminho in fatos for c in cabecalhos[caminho]))
+    auxiliares = []
+    for caminho, colunas in cabecalhos.items():
+        if caminho in fatos:
+            continue
+        chaves = _chaves_da_fonte(caminho, colunas, set(colunas_fato))
+        if not chaves:
+            registrar_evento(f"Staging: {os.path.basename(caminho)} não tem chave em comum com os ensaios; ignorado.",
+                             "warning")
+            continue
+        df = pd.read_csv(caminho)
+        df.columns = normalizar_colunas(df.columns)
+        nome = os.path.splitext(os.path.basename(caminho))[0]
+        auxiliares.append(TabelaAuxiliar(nome, df, chaves))
+        registrar_evento(f"Staging: {nome} unido por {chaves} ({len(df)} linhas).")
+
+    os.makedirs(os.path.dirname(os.path.abspath(destino)), exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(destino)), suffix=".tmp")
+    tipos, linhas, descartadas = None, 0, 0
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as saida:
+            for caminho in fatos:
+                for bloco in pd.read_csv(caminho, chunksize=cfg["linhas_por_bloco"]):
+                    bloco.columns = normalizar_colunas(bloco.columns)
+                    bloco = bloco.reindex(columns=colunas_fato)
+                    for auxiliar in auxiliares:
+                        bloco = auxiliar.juntar(bloco)
+                    if tipos is None:
+                        tipos = _inferir_tipos(bloco)
+                    bloco = _aplicar_tipos(bloco, tipos)
+                    validas = bloco.dropna(subset=[c for c in cfg["obrigatorias"] if c in bloco.columns])
+                    descartadas += len(bloco) - len(validas)
+                    validas.to_csv(saida, index=False, header=saida.tell() == 0)
+                    linhas += len(validas)
+        os.replace(temporario, destino)
+    except Exception:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+    esquema = caminho_esquema(destino)
+    with open(esquema, "w", encoding="utf-8") as f:
+        json.dump({"colunas": tipos or {}, "linhas": linhas, "descartadas": descartadas,
+                   "auxiliares": [a.nome for a in auxiliares]}, f, ensure_ascii=False, indent=2)
+    registrar_evento(f"Staging: {linhas} linha(s) de ensaio gravadas em {destino} ({descartadas} descartadas).")
+    return linhas
@@ -0,0 +1,353 @@
+"""
+Módulo: taxonomy_index.py
+Descrição: Árvore taxonômica dos degradadores (linhagem do catálogo + taxonomia dos fungos
+           cadastrados) com numeração de conjuntos aninhados: toda subárvore ocupa um
+           intervalo contíguo, então "todos os degradadores sob Ascomycota que degradam PET"
+           e os agregados por clado saem de uma busca binária e de somas acumuladas.
+           Novos cadastros entram de forma incremental, sem reconstruir a árvore.
+Autor: Samuel
+Data: 2025
+"""
+
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+from core.degraders_catalog import carregar_catalogo_degradadores
+from core.record_store import obter_record_store
+from utils.cache import cache_recurso
+from utils.constants import DEGRADERS_SQL_PATH
+from utils.logger import registrar_evento, registrar_erro
+
+RAIZ = 0
+
+# =============================================================================
+# ⏳ Tempo de degradação em dias
+# =============================================================================
+
+_UNIDADES = {"d": 1, "s": 7, "w": 7, "m": 30, "a": 365, "y": 365}
+
+
+def dias_degradacao(textos: pd.Series) -> pd.Series:
+    """
+    "3-90 days (variable...)" → 46.5; "6 semanas" → 42. Faixas viram o ponto médio;
+    textos sem número e unidade reconhecíveis ficam NaN.
+    """
+    partes = textos.fillna("").astype(str).str.extract(
+        r"(?i)(\d+(?:[.,]\d+)?)\s*(?:-\s*(\d+(?:[.,]\d+)?)\s*)?"
+        r"(dias?|days?|semanas?|weeks?|m[eê]s(?:es)?|months?|anos?|years?)"
+    )
+    inicio = pd.to_numeric(partes[0].str.replace(",", "."), errors="coerce")
+    fim = pd.to_numeric(partes[1].str.replace(",", "."), errors="coerce").fillna(inicio)
+    fator = partes[2].str[0].str.lower().map(_UNIDADES)
+    return (inicio + fim) / 2 * fator
+
+
+# =============================================================================
+# 🌳 Classe Principal — ArvoreTaxonomica
+# =============================================================================
+
+class ArvoreTaxonomica:
+    """
+    Nós com intervalo [entrada, saida]: o intervalo de um nó contém os de todos os
+    descendentes. Cada nó reserva uma folga no fim do intervalo para filhos futuros;
+    só quando a folga acaba a árvore inteira é renumerada.
+
+    Os registros ficam ordenados pela entrada do seu nó (arrays NumPy + somas acumuladas
+    dos dias de degradação); os inseridos depois da última consolidação ficam numa lista
+    pendente pequena, consultada à parte.
+    """
+
+    FOLGA = 16            # números livres reservados por nó a cada renumeração
+    MAX_PENDENTES = 256   # acima disso, os pendentes são incorporados aos arrays ordenados
+    COLUNAS = ["Microorganism", "Plastic", "Enzyme", "dias_degradacao", "origem"]
+
+    def __init__(self):
+        self.nomes, self.niveis, self.pais, self.filhos = ["Vida"], ["raiz"], [-1], [{}]
+        self.entrada, self.saida, self.livre = [0], [0], [0]
+        self.por_nome = {}   # nome em minúsculas → nó (primeira ocorrência)
+        self.plasticos_conhecidos = set()
+        self.cadastrados = set()   # nomes (minúsculos) de fungos cadastrados já na árvore
+        self._lock = threading.RLock()
+        self._em_lote = False
+
+        self._registros = {coluna: [] for coluna in self.COLUNAS}
+        self._no_registro = []
+        self._pendentes = []
+        self._chaves = np.array([], dtype=np.int64)
+        self._ordem = np.array([], dtype=np.int64)
+        self._dias_acum = np.zeros(1)
+        self._com_dias_acum = np.zeros(1, dtype=np.int64)
+        self._numerar()
+
+    def __len__(self):
+        return len(self._no_registro)
+
+    # -------------------------------------------------------------------------
+    # 🔢 Numeração (conjuntos aninhados com folga)
+    # -------------------------------------------------------------------------
+    def _numerar(self):
+        contador, pilha = 0, [(RAIZ, False)]
+        while pilha:
+            no, saindo = pilha.pop()
+            if saindo:
+                self.livre[no] = contador
+                contador += self.FOLGA
+                self.saida[no] = contador
+                contador += 1
+            else:
+                self.entrada[no] = contador
+                contador += 1
+                pilha.append((no, True))
+                pilha.extend((filho, False) for filho in reversed(list(self.filhos[no].values())))
+
+    def _novo_no(self, pai: int, nome: str, nivel: str) -> int:
+        no = len(self.nomes)
+        self.nomes.append(nome)
+        self.niveis.append(nivel)
+        self.pais.append(pai)
+        self.filhos.append({})
+        self.filhos[pai][nome] = no
+        self.por_nome.setdefault(nome.lower(), no)
+
+        # O filho ocupa metade da folga restante do pai (e herda o resto como folga própria)
+        restante = self.saida[pai] - self.livre[pai]
+        if restante >= 2 and not self._em_lote:
+            tamanho = restante // 2
+            self.entrada.append(self.livre[pai])
+            self.livre.append(self.livre[pai] + 1)
+            self.saida.append(self.livre[pai] + tamanho - 1)
+            self.livre[pai] += tamanho
+        else:
+            self.entrada.append(0)
+            self.livre.append(0)
+            self.saida.append(0)
+            if not self._em_lote:
+                self._numerar()
+                self._consolidar()   # as entradas mudaram: as chaves dos registros também
+        return no
+
+    def iniciar_lote(self):
+        """
+        Carga inicial: nós e registros entram sem numeração nem ordenação, feitas uma
+        única vez em concluir_lote().
+        """
+        self._em_lote = True
+
+    def concluir_lote(self):
+        with self._lock:
+            self._em_lote = False
+            self._numerar()
+            self._consolidar()
+
+    def garantir_caminho(self, caminho, pai: int = RAIZ) -> int:
+        """
+        Percorre (e cria, se preciso) a sequência de (nível, nome) a partir de `pai`.
+        """
+        with self._lock:
+            no = pai
+            for nivel, nome in caminho:
+                filho = self.filhos[no].get(nome)
+                no = filho if filho is not None else self._novo_no(no, nome, nivel)
+            return no
+
+    # -------------------------------------------------------------------------
+    # ✍️ Registros
+    # -------------------------------------------------------------------------
+    def _consolidar(self):
+        if not self._no_registro:
+            return
+        chaves = np.asarray(self.entrada, dtype=np.int64)[np.asarray(self._no_registro)]
+        self._ordem = np.argsort(chaves, kind="stable")
+        self._chaves = chaves[self._ordem]
+        dias = np.asarray(self._registros["dias_degradacao"], dtype=float)[self._ordem]
+        self._dias_acum = np.concatenate([[0.0], np.cumsum(np.nan_to_num(dias))])
+        self._com_dias_acum = np.concatenate([[0], np.cumsum(~np.isnan(dias))])
+        self._pendentes = []
+
+    def adicionar(self, no: int, registros: dict):
+        """
+        Acrescenta registros (dicionário coluna → lista) ao nó. Ficam pendentes até a
+        próxima consolidação, que acontece sozinha quando a lista pendente cresce.
+        """
+        with self._lock:
+            total = len(registros["Microorganism"])
+            inicio = len(self._no_registro)
+            for coluna in self.COLUNAS:
+                self._registros[coluna].extend(registros.get(coluna, [None] * total))
+            self._no_registro.extend([no] * total)
+            self._pendentes.extend(range(inicio, inicio + total))
+            if not self._em_lote and len(self._pendentes) > self.MAX_PENDENTES:
+                self._consolidar()
+
+    # -------------------------------------------------------------------------
+    # 🔎 Consultas
+    # -------------------------------------------------------------------------
+    def no(self, nome: str):
+        return self.por_nome.get(str(nome).strip().lower())
+
+    def caminho(self, no: int) -> str:
+        nomes = []
+        while no > RAIZ:
+            nomes.append(self.nomes[no])
+            no = self.pais[no]
+        return " > ".join(reversed(nomes))
+
+    def _faixa(self, no: int):
+        """
+        Posições [lo, hi) dos registros consolidados da subárvore e ids dos pendentes dela.
+        """
+        inicio, fim = self.entrada[no], self.saida[no]
+        lo = int(np.searchsorted(self._chaves, inicio, "left"))
+        hi = int(np.searchsorted(self._chaves, fim, "right"))
+        pendentes = [i for i in self._pendentes if inicio <= self.entrada[self._no_registro[i]] <= fim]
+        return lo, hi, pendentes
+
+    def ids_subarvore(self, no: int) -> np.ndarray:
+        with self._lock:
+            lo, hi, pendentes = self._faixa(no)
+            return np.concatenate([self._ordem[lo:hi], np.asarray(pendentes, dtype=np.int64)])
+
+    def registros(self, no: int, plastico: str = None) -> pd.DataFrame:
+        """
+        Registros da subárvore (com o caminho do nó de cada um), opcionalmente só os do plástico.
+        """
+        with self._lock:
+            ids = self.ids_subarvore(no)
+            if plastico:
+                coluna = self._registros["Plastic"]
+                ids = [i for i in ids if (coluna[i] or "").upper() == plastico.upper()]
+            dados = pd.DataFrame({c: [self._registros[c][i] for i in ids] for c in self.COLUNAS},
+                                 columns=self.COLUNAS)
+            caminhos = [self.caminho(self._no_registro[i]) for i in ids]
+        dados["dias_degradacao"] = pd.to_numeric(dados["dias_degradacao"])
+        dados.insert(0, "clado", caminhos)
+        return dados
+
+    def agregar(self, no: int) -> dict:
+        """
+        Registros, espécies, plásticos distintos e média de dias de degradação da subárvore.
+        Contagem e média vêm das somas acumuladas (O(log n)); os distintos, da fatia da subárvore.
+        """
+        with self._lock:
+            lo, hi, pendentes = self._faixa(no)
+            dias_pendentes = [self._registros["dias_degradacao"][i] for i in pendentes]
+            dias_pendentes = [d for d in dias_pendentes if d is not None and not np.isnan(d)]
+            soma = self._dias_acum[hi] - self._dias_acum[lo] + sum(dias_pendentes)
+            com_dias = int(self._com_dias_acum[hi] - self._com_dias_acum[lo]) + len(dias_pendentes)
+            ids = np.concatenate([self._ordem[lo:hi], np.asarray(pendentes, dtype=np.int64)])
+            especies = {self._registros["Microorganism"][i] for i in ids}
+            plasticos = {self._registros["Plastic"][i] for i in ids} - {"", None}
+        return {
+            "clado": self.nomes[no],
+            "nivel": self.niveis[no],
+            "registros": (hi - lo) + len(pendentes),
+            "especies": len(especies),
+            "plasticos": len(plasticos),
+            "dias_medio": round(float(soma / com_dias), 1) if com_dias else None,
+        }
+
+    def agregar_filhos(self, no: int) -> pd.DataFrame:
+        """
+        Um agregado por clado filho, do mais representado ao menos.
+        """
+        with self._lock:
+            linhas = [self.agregar(filho) for filho in self.filhos[no].values()]
+        colunas = ["clado", "nivel", "registros", "especies", "plasticos", "dias_medio"]
+        return pd.DataFrame(linhas, columns=colunas).sort_values("registros", ascending=False, ignore_index=True)
+
+
+# =============================================================================
+# 🧬 Montagem a partir do catálogo e dos cadastros
+# =============================================================================
+
+def caminho_linhagem(linhagem: str) -> list:
+    """
+    "superkingdom:Bacteria,phylum:...,species:X," → [("superkingdom", "Bacteria"), ...].
+    """
+    return [tuple(p.split(":", 1)) for p in str(linhagem).split(",") if ":" in p]
+
+
+def _plasticos_do_texto(texto: str, conhecidos: set) -> list:
+    tokens = {t.strip().upper() for t in re.split(r"[,;/]", str(texto or ""))}
+    return sorted(tokens & conhecidos)
+
+
+def inserir_cadastro(arvore: ArvoreTaxonomica, registro: dict) -> bool:
+    """
+    Pendura um fungo cadastrado no nó mais profundo da sua taxonomia ("Fungi > Ascomycota > ...")
+    que já exista na árvore; os níveis restantes e a espécie viram nós novos.
+    Fungos que já vêm do catálogo (ou já cadastrados) são ignorados para não contar em dobro.
+    """
+    nome = (registro.get("nome_cientifico") or "").strip()
+    if not nome:
+        return False
+    with arvore._lock:
+        existente = arvore.no(nome)
+        if nome.lower() in arvore.cadastrados or (existente is not None and arvore.niveis[existente] == "species"):
+            return False
+        arvore.cadastrados.add(nome.lower())
+
+        niveis = [n.strip() for n in re.split(r">|/|;", registro.get("taxonomia") or "") if n.strip()]
+        niveis.append(nome)
+        ancora, restante = RAIZ, niveis
+        for i in range(len(niveis) - 1, -1, -1):
+            no = arvore.no(niveis[i])
+            if no is not None:
+                ancora, restante = no, niveis[i + 1:]
+                break
+        no = arvore.garantir_caminho([("", n) for n in restante], ancora)
+
+        plasticos = _plasticos_do_texto(registro.get("degradacao"), arvore.plasticos_conhecidos) or [""]
+        dias = dias_degradacao(pd.Series([registro.get("maturacao")])).iloc[0]
+        arvore.adicionar(no, {
+            "Microorganism": [nome] * len(plasticos),
+            "Plastic": plasticos,
+            "Enzyme": [registro.get("enzima") or ""] * len(plasticos),
+            "dias_degradacao": [dias] * len(plasticos),
+            "origem": ["cadastro"] * len(plasticos),
+        })
+    return True
+
+
+@cache_recurso(arquivos=("caminho",))
+def arvore_taxonomica(caminho: str = DEGRADERS_SQL_PATH) -> ArvoreTaxonomica:
+    """
+    Árvore com os registros do catálogo (um por organismo × plástico) e os fungos cadastrados.
+    """
+    arvore = ArvoreTaxonomica()
+    arvore.iniciar_lote()
+    catalogo = carregar_catalogo_degradadores(caminho)
+    if not catalogo.empty:
+        catalogo = catalogo.assign(dias=dias_degradacao(catalogo["dec-plastic-com-fungi"]))
+        for linhagem, grupo in catalogo.groupby("lineage", sort=False):
+            no = arvore.garantir_caminho(caminho_linhagem(linhagem))
+            arvore.adicionar(no, {
+                "Microorganism": grupo["Microorganism"].tolist(),
+                "Plastic": grupo["Plastic"].tolist(),
+                "Enzyme": grupo["Enzyme"].tolist(),
+                "dias_degradacao": grupo["dias"].tolist(),
+                "origem": ["catálogo"] * len(grupo),
+            })
+        arvore.plasticos_conhecidos = set(catalogo["Plastic"].str.upper()) - {""}
+
+    cadastrados = sum(inserir_cadastro(arvore, r) for r in obter_record_store().listar("fungos"))
+    arvore.concluir_lote()
+    registrar_evento(
+        f"Árvore taxonômica: {len(arvore.nomes)} nós, {len(arvore)} registros "
+        f"({cadastrados} fungo(s) cadastrado(s))."
+    )
+    return arvore
+
+
+def registrar_fungos_na_taxonomia(registros) -> int:
+    """
+    Atualização incremental após um cadastro ou importação de fungos.
+    """
+    try:
+        arvore = arvore_taxonomica()
+        return sum(inserir_cadastro(arvore, r) for r in registros)
+    except Exception as e:
+        registrar_erro("TaxonomyIndex", e)
+        return 0
@@ -0,0 +1,412 @@
+"""
+Módulo: tile_cache.py
+Descrição: Cache offline de tiles de mapa em arquivos MBTiles (SQLite), com pré-carga de
+           regiões configuradas, limite de tamanho com remoção LRU e um servidor HTTP local
+           que os mapas (folium/leafmap) usam no lugar das URLs da internet quando
+           PB_TILES_LOCAL=1 (app e navegador na mesma máquina).
+Autor: Samuel
+Data: 2025
+"""
+
+import argparse
+import math
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import cycle
+
+import requests
+from utils.constants import HTTP_CACHE_CONFIG, TILE_CONFIG
+from utils.logger import registrar_evento, registrar_erro
+
+_TIPOS_MIME = {"png": "image/png", "jpg": "image/jpeg", "jpeg": "image/jpeg", "webp": "image/webp"}
+
+# =============================================================================
+# 🧭 Geometria dos tiles (Web Mercator)
+# =============================================================================
+
+def tile_de_coordenada(lat: float, lon: float, zoom: int):
+    """
+    Índices (x, y) XYZ do tile que contém a coordenada.
+    """
+    n = 2 ** zoom
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tiles_da_regiao(bbox, zooms):
+    """
+    Gera (z, x, y) de todos os tiles que cobrem bbox = (oeste, sul, leste, norte).
+    """
+    oeste, sul, leste, norte = bbox
+    z_min, z_max = zooms
+    for z in range(z_min, z_max + 1):
+        x0, y0 = tile_de_coordenada(norte, oeste, z)
+        x1, y1 = tile_de_coordenada(sul, leste, z)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield z, x, y
+
+
+def contar_tiles(bbox, zooms) -> int:
+    oeste, sul, leste, norte = bbox
+    total = 0
+    for z in range(zooms[0], zooms[1] + 1):
+        x0, y0 = tile_de_coordenada(norte, oeste, z)
+        x1, y1 = tile_de_coordenada(sul, leste, z)
+        total += (x1 - x0 + 1) * (y1 - y0 + 1)
+    return total
+
+
+# =============================================================================
+# 🗄️ Armazenamento MBTiles com LRU
+# =============================================================================
+
+class TileStore:
+    """
+    Um arquivo MBTiles por fonte. A tabela `tiles` segue o padrão (linhas TMS, y invertido)
+    e ganha duas colunas extras: tamanho e último acesso, usadas na remoção LRU.
+    Os acessos são acumulados em memória e gravados em lote para não escrever a cada leitura.
+    """
+
+    def __init__(self, fonte: str, caminho: str = None, tamanho_max_mb: float = None, session=None):
+        self.fonte = fonte
+        self.cfg = TILE_CONFIG["fontes"][fonte]
+        self.caminho = caminho or os.path.join(TILE_CONFIG["dir"], f"{fonte}.mbtiles")
+        self.tamanho_max = int((tamanho_max_mb or TILE_CONFIG["tamanho_max_mb"]) * 1024 * 1024)
+
+        self.session = session or requests.Session()
+        self.session.headers.setdefault("User-Agent", HTTP_CACHE_CONFIG["user_agent"])
+        self._subdominios = cycle("abc")
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._acessos = {}  # (z, x, linha_tms) -> instante do último acesso
+        self.estatisticas = {"acertos": 0, "baixados": 0, "ausentes": 0, "removidos": 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.caminho)), exist_ok=True)
+        conn = self._conexao()
+        with conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE IF NOT EXISTS tiles (
+                    zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB,
+                    tamanho INTEGER NOT NULL, ultimo_acesso REAL NOT NULL,
+                    PRIMARY KEY (zoom_level, tile_column, tile_row)
+                );
+                CREATE INDEX IF NOT EXISTS idx_tiles_acesso ON tiles (ultimo_acesso);
+            """)
+            conn.executemany("INSERT OR IGNORE INTO metadata VALUES (?, ?)", [
+                ("name", fonte), ("format", self.cfg["formato"]),
+                ("attribution", self.cfg["atribuicao"]), ("type", "baselayer"),
+            ])
+        self.tamanho_atual = conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM tiles").fetchone()[0]
+
+    def _conexao(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.caminho, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _linha_tms(z: int, y: int) -> int:
+        return (2 ** z - 1) - y
+
+    # -------------------------------------------------------------------------
+    # 📥 Leitura e escrita
+    # -------------------------------------------------------------------------
+    def obter(self, z: int, x: int, y: int):
+        """
+        Bytes do tile, ou None se não estiver no cache.
+        """
+        chave = (z, x, self._linha_tms(z, y))
+        linha = self._conexao().execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?", chave
+        ).fetchone()
+        if linha is None:
+            return None
+        with self._lock:
+            self._acessos[chave] = time.time()
+            pendentes = len(self._acessos)
+        if pendentes >= 256:
+            self._gravar_acessos()
+        return linha[0]
+
+    def contem(self, z: int, x: int, y: int) -> bool:
+        return self._conexao().execute(
+            "SELECT 1 FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+            (z, x, self._linha_tms(z, y))
+        ).fetchone() is not None
+
+    def guardar(self, z: int, x: int, y: int, dados: bytes):
+        conn = self._conexao()
+        with self._lock, conn:
+            anterior = conn.execute(
+                "SELECT tamanho FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+                (z, x, self._linha_tms(z, y))
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?, ?, ?)",
+                (z, x, self._linha_tms(z, y), sqlite3.Binary(dados), len(dados), time.time())
+            )
+            self.tamanho_atual += len(dados) - (anterior[0] if anterior else 0)
+        if self.tamanho_atual > self.tamanho_max:
+            self.remover_excedente()
+
+    def _gravar_acessos(self):
+        with self._lock:
+            acessos, self._acessos = self._acessos, {}
+        if acessos:
+            conn = self._conexao()
+            with conn:
+                conn.executemany(
+                    "UPDATE tiles SET ultimo_acesso = ? WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+                    [(t, *chave) for chave, t in acessos.items()]
+                )
+
+    def remover_excedente(self, alvo: float = 0.9) -> int:
+        """
+        Remove os tiles acessados há mais tempo até o arquivo ficar em `alvo` do limite.
+        """
+        self._gravar_acessos()
+        conn = self._conexao()
+        removidos = 0
+        with self._lock, conn:
+            excedente = self.tamanho_atual - int(self.tamanho_max * alvo)
+            cursor = conn.execute(
+                "SELECT zoom_level, tile_column, tile_row, tamanho FROM tiles ORDER BY ultimo_acesso"
+            )
+            apagar = []
+            for z, x, linha, tamanho in cursor:
+                if excedente <= 0:
+                    break
+                apagar.append((z, x, linha))
+                excedente -= tamanho
+                self.tamanho_atual -= tamanho
+            conn.executemany(
+                "DELETE FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?", apagar
+            )
+            removidos = len(apagar)
+        self.estatisticas["removidos"] += removidos
+        if removidos:
+            registrar_evento(f"TileStore[{self.fonte}]: {removidos} tile(s) antigos removidos (LRU).")
+        return removidos
+
+    # -------------------------------------------------------------------------
+    # 🌐 Origem remota
+    # -------------------------------------------------------------------------
+    def url_origem(self, z: int, x: int, y: int) -> str:
+        return self.cfg["url"].format(s=next(self._subdominios), z=z, x=x, y=y)
+
+    def baixar(self, z: int, x: int, y: int):
+        resp = self.session.get(self.url_origem(z, x, y), timeout=HTTP_CACHE_CONFIG["timeout"])
+        resp.raise_for_status()
+        self.guardar(z, x, y, resp.content)
+        self.estatisticas["baixados"] += 1
+        return resp.content
+
+    def buscar(self, z: int, x: int, y: int):
+        """
+        Tile do cache; se faltar e houver internet, baixa da origem e guarda.
+        Retorna None quando offline e sem cópia local.
+        """
+        dados = self.obter(z, x, y)
+        if dados is not None:
+            self.estatisticas["acertos"] += 1
+            return dados
+        if z > self.cfg["zoom_max"]:
+            self.estatisticas["ausentes"] += 1
+            return None
+        try:
+            return self.baixar(z, x, y)
+        except Exception:
+            self.estatisticas["ausentes"] += 1
+            return None
+
+    # -------------------------------------------------------------------------
+    # 🌱 Pré-carga de regiões
+    # -------------------------------------------------------------------------
+    def semear(self, bbox, zooms, threads: int = None) -> dict:
+        """
+        Baixa todos os tiles da região que ainda não estão no cache.
+        """
+        zooms = (zooms[0], min(zooms[1], self.cfg["zoom_max"]))
+        faltantes = [t for t in tiles_da_regiao(bbox, zooms) if not self.contem(*t)]
+        falhas = 0
+
+        def baixar(tile):
+            try:
+                self.baixar(*tile)
+                return True
+            except Exception:
+                return False
+
+        with ThreadPoolExecutor(max_workers=threads or TILE_CONFIG["threads_semeadura"]) as pool:
+            for ok in pool.map(baixar, faltantes):
+                falhas += not ok
+
+        resumo = {
+            "fonte": self.fonte, "tiles_regiao": contar_tiles(bbox, zooms),
+            "baixados": len(faltantes) - falhas, "falhas": falhas,
+            "tamanho_mb": round(self.tamanho_atual / 1024 / 1024, 2),
+        }
+        registrar_evento(f"Semeadura de tiles: {resumo}")
+        return resumo
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def obter_store(fonte: str) -> TileStore:
+    with _stores_lock:
+        if fonte not in _stores:
+            _stores[fonte] = TileStore(fonte)
+        return _stores[fonte]
+
+
+def semear_regiao(nome_regiao: str, fontes=None) -> list:
+    """
+    Pré-carrega uma região de TILE_CONFIG["regioes"] para as fontes indicadas (padrão: todas).
+    """
+    regiao = TILE_CONFIG["regioes"][nome_regiao]
+    return [
+        obter_store(fonte).semear(regiao["bbox"], regiao["zoom"])
+        for fonte in (fontes or TILE_CONFIG["fontes"])
+    ]
+
+
+# =============================================================================
+# 🛰️ Servidor local de tiles
+# =============================================================================
+
+class _ManipuladorTiles(BaseHTTPRequestHandler):
+    """
+    GET /<fonte>/<z>/<x>/<y>.<ext>  →  tile do MBTiles (baixando da origem se possível).
+    """
+
+    def do_GET(self):
+        try:
+            partes = self.path.split("?", 1)[0].strip("/").split("/")
+            if partes == ["saude"]:
+                return self._responder(200, b"ok", "text/plain")
+            fonte, z, x, y_ext = partes
+            y = y_ext.split(".", 1)[0]
+            if fonte not in TILE_CONFIG["fontes"]:
+                return self._responder(404, b"fonte desconhecida", "text/plain")
+
+            dados = obter_store(fonte).buscar(int(z), int(x), int(y))
+            if dados is None:
+                return self._responder(404, b"tile indisponivel offline", "text/plain")
+            tipo = _TIPOS_MIME.get(TILE_CONFIG["fontes"][fonte]["formato"], "application/octet-stream")
+            self._responder(200, dados, tipo)
+        except ValueError:
+            self._responder(400, b"caminho invalido", "text/plain")
+        except Exception as e:
+            registrar_erro("TileServer", e)
+            self._responder(500, b"erro interno", "text/plain")
+
+    def _responder(self, status: int, corpo: bytes, tipo: str):
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if status == 200:
+            self.send_header("Cache-Control", "public, max-age=86400")
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass  # sem log por requisição
+
+
+_servidor = None
+_servidor_lock = threading.Lock()
+
+
+def _servidor_ativo(base: str) -> bool:
+    try:
+        return requests.get(f"{base}/saude", timeout=0.5).ok
+    except Exception:
+        return False
+
+
+def iniciar_servidor(host: str = None, porta: int = None) -> str:
+    """
+    Sobe o servidor de tiles numa thread daemon (uma vez por processo) e devolve a URL base.
+    Se a porta já estiver em uso por outro processo do app, reaproveita aquele servidor.
+    """
+    global _servidor
+    host = host or TILE_CONFIG["host"]
+    porta = TILE_CONFIG["porta"] if porta is None else porta
+    base = f"http://{host}:{porta}"
+
+    with _servidor_lock:
+        if _servidor is not None:
+            return f"http://{host}:{_servidor.server_address[1]}"
+        try:
+            _servidor = ThreadingHTTPServer((host, porta), _ManipuladorTiles)
+            _servidor.daemon_threads = True
+            threading.Thread(target=_servidor.serve_forever, name="tile-server", daemon=True).start()
+            registrar_evento(f"Servidor de tiles ativo em http://{host}:{_servidor.server_address[1]}")
+            return f"http://{host}:{_servidor.server_address[1]}"
+        except OSError:
+            if _servidor_ativo(base):
+                return base
+            raise
+
+
+def url_tiles(fonte: str) -> str:
+    """
+    Template {z}/{x}/{y} para o mapa. Por padrão, a URL de origem; com
+    TILE_CONFIG["servidor_local"] (PB_TILES_LOCAL=1), o servidor local de tiles,
+    iniciado aqui sob demanda.
+    """
+    cfg = TILE_CONFIG["fontes"][fonte]
+    if not TILE_CONFIG["servidor_local"]:
+        return cfg["url"].replace("{s}", "a")
+    try:
+        return f"{iniciar_servidor()}/{fonte}/{{z}}/{{x}}/{{y}}.{cfg['formato']}"
+    except Exception as e:
+        registrar_erro("TileServer", e)
+        return cfg["url"].replace("{s}", "a")
+
+
+# =============================================================================
+# 🚀 Linha de comando
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache offline de tiles (MBTiles).")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    semear = sub.add_parser("semear", help="pré-carrega uma região configurada")
+    semear.add_argument("regiao", choices=list(TILE_CONFIG["regioes"]))
+    semear.add_argument("--fonte", action="append", choices=list(TILE_CONFIG["fontes"]))
+
+    servir = sub.add_parser("servir", help="executa o servidor local de tiles")
+    servir.add_argument("--porta", type=int, default=TILE_CONFIG["porta"])
+
+    args = parser.parse_args()
+    if args.comando == "semear":
+        for resumo in semear_regiao(args.regiao, args.fonte):
+            print(resumo)
+    else:
+        print(f"Servindo tiles em {iniciar_servidor(porta=args.porta)} (Ctrl+C para sair)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
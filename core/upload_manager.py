@@ -0,0 +1,187 @@
+"""
+Módulo: upload_manager.py
+Descrição: Recebimento de arquivos de análise enviados pelas interfaces. Grava em blocos
+           num temporário único calculando o hash, aplica limites de tamanho e de quota,
+           move atomicamente para um caminho endereçado por conteúdo e evita regravar e
+           reprocessar arquivos já recebidos. Cada conteúdo lido vira uma versão do dataset
+           "upload_<nome do arquivo>" (core/dataset_snapshots.py).
+Autor: Samuel
+Data: 2025
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+
+import pandas as pd
+from core.data_loader import load_data
+from core.dataset_snapshots import registrar_snapshot
+from utils.cache import cache_dados
+from utils.constants import UPLOAD_CONFIG
+from utils.logger import registrar_evento, registrar_erro
+
+
+class UploadRecusado(ValueError):
+    """Upload acima do limite por arquivo ou da quota total."""
+
+
+PREFIXO_TEMPORARIO = ".upload-"   # arquivos ainda em gravação (fora da conta da quota)
+
+
+# =============================================================================
+# 📏 Limites
+# =============================================================================
+
+def uso_total(diretorio: str = None) -> int:
+    """
+    Bytes ocupados pelos uploads guardados. Temporários em gravação não entram: o do
+    próprio upload em verificação seria contado duas vezes (no uso e no tamanho novo).
+    """
+    total = 0
+    for raiz, _, arquivos in os.walk(diretorio or UPLOAD_CONFIG["dir"]):
+        total += sum(
+            os.path.getsize(os.path.join(raiz, a)) for a in arquivos if not a.startswith(PREFIXO_TEMPORARIO)
+        )
+    return total
+
+
+def _verificar_limites(tamanho: int, diretorio: str):
+    limite = UPLOAD_CONFIG["tamanho_max_mb"] * 1024 * 1024
+    if tamanho > limite:
+        raise UploadRecusado(
+            f"Arquivo com {tamanho / 1024 / 1024:.1f} MB excede o limite de {UPLOAD_CONFIG['tamanho_max_mb']} MB."
+        )
+    quota = UPLOAD_CONFIG["quota_total_mb"] * 1024 * 1024
+    if uso_total(diretorio) + tamanho > quota:
+        raise UploadRecusado(f"Quota de uploads ({UPLOAD_CONFIG['quota_total_mb']} MB) esgotada.")
+
+
+# =============================================================================
+# 📥 Recebimento
+# =============================================================================
+
+def caminho_upload(hash_arquivo: str, extensao: str, diretorio: str = None) -> str:
+    return os.path.join(diretorio or UPLOAD_CONFIG["dir"], hash_arquivo[:2], f"{hash_arquivo}{extensao}")
+
+
+def _pode_reler(arquivo) -> bool:
+    return hasattr(arquivo, "seek") and getattr(arquivo, "seekable", lambda: True)()
+
+
+def _hash_fluxo(arquivo, bloco: int, limite: int):
+    h, tamanho = hashlib.sha256(), 0
+    for pedaco in iter(lambda: arquivo.read(bloco), b""):
+        tamanho += len(pedaco)
+        if tamanho > limite:
+            raise UploadRecusado(f"Arquivo excede o limite de {UPLOAD_CONFIG['tamanho_max_mb']} MB.")
+        h.update(pedaco)
+    return h.hexdigest(), tamanho
+
+
+def receber_upload(arquivo, nome: str = None, diretorio: str = None) -> dict:
+    """
+    Guarda um arquivo enviado (UploadedFile do Streamlit ou arquivo aberto em modo binário).
+    Retorna {"caminho", "hash", "tamanho", "novo"}; `novo` é False quando o mesmo
+    conteúdo já estava guardado (nada é regravado). Levanta UploadRecusado nos limites.
+    """
+    diretorio = diretorio or UPLOAD_CONFIG["dir"]
+    nome = nome or getattr(arquivo, "name", "upload")
+    extensao = os.path.splitext(nome)[1].lower()
+    bloco = UPLOAD_CONFIG["bloco"]
+    limite = UPLOAD_CONFIG["tamanho_max_mb"] * 1024 * 1024
+
+    # Tamanho declarado pelo Streamlit: recusa cedo, sem ler nada
+    if getattr(arquivo, "size", None) is not None and arquivo.size > limite:
+        _verificar_limites(arquivo.size, diretorio)
+
+    # Fluxos relíveis: hash primeiro; conteúdo já guardado não é gravado de novo
+    if _pode_reler(arquivo):
+        arquivo.seek(0)
+        hash_arquivo, tamanho = _hash_fluxo(arquivo, bloco, limite)
+        destino = caminho_upload(hash_arquivo, extensao, diretorio)
+        if os.path.exists(destino):
+            return {"caminho": destino, "hash": hash_arquivo, "tamanho": tamanho, "novo": False}
+        _verificar_limites(tamanho, diretorio)
+        arquivo.seek(0)
+
+    os.makedirs(diretorio, exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=diretorio, prefix=PREFIXO_TEMPORARIO, suffix=".tmp")
+    try:
+        h, tamanho = hashlib.sha256(), 0
+        with os.fdopen(fd, "wb") as saida:
+            for pedaco in iter(lambda: arquivo.read(bloco), b""):
+                tamanho += len(pedaco)
+                if tamanho > limite:
+                    raise UploadRecusado(f"Arquivo excede o limite de {UPLOAD_CONFIG['tamanho_max_mb']} MB.")
+                h.update(pedaco)
+                saida.write(pedaco)
+
+        hash_arquivo = h.hexdigest()
+        destino = caminho_upload(hash_arquivo, extensao, diretorio)
+        if os.path.exists(destino):
+            os.remove(temporario)
+            return {"caminho": destino, "hash": hash_arquivo, "tamanho": tamanho, "novo": False}
+
+        _verificar_limites(tamanho, diretorio)
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        os.replace(temporario, destino)  # atômico: o arquivo aparece completo ou não aparece
+        registrar_evento(f"Upload recebido: {nome} → {destino} ({tamanho} bytes)")
+        return {"caminho": destino, "hash": hash_arquivo, "tamanho": tamanho, "novo": True}
+
+    except Exception:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+# =============================================================================
+# 📊 Leitura com cache pelo conteúdo
+# =============================================================================
+
+@cache_dados(ttl=None)
+def _carregar_por_hash(caminho: str) -> pd.DataFrame:
+    # O caminho já contém o hash do conteúdo: mesma chave = mesmo arquivo.
+    # load_data devolve DataFrame vazio quando falha; a exceção evita guardar a falha no cache.
+    df = load_data(caminho)
+    if df.empty:
+        raise ValueError(f"Nenhum dado lido de {os.path.basename(caminho)}.")
+    return df
+
+
+def nome_dataset(nome: str) -> str:
+    """
+    Dataset de snapshots de um upload: envios com o mesmo nome de arquivo são versões dele.
+    """
+    base = re.sub(r"[^\w.-]+", "_", os.path.splitext(os.path.basename(nome))[0]).strip("._")
+    return f"upload_{base or 'arquivo'}"
+
+
+@cache_dados(ttl=None)
+def _snapshot_upload(caminho: str, dataset: str) -> dict:
+    # Uma vez por conteúdo e dataset: os reruns da página não recalculam o hash das linhas
+    versao = registrar_snapshot(dataset, _carregar_por_hash(caminho), origem="upload")
+    if not versao:
+        raise RuntimeError(f"Snapshot de {dataset} não registrado.")
+    return {"dataset": dataset, "id": versao["id"], "numero": versao["numero"]}
+
+
+def carregar_upload(arquivo) -> tuple:
+    """
+    Recebe o upload e devolve (DataFrame, info). Um arquivo já enviado antes
+    (por qualquer sessão) não é regravado nem reprocessado. `info["snapshot"]`
+    traz {"dataset", "id", "numero"} da versão registrada (vazio se falhar).
+    """
+    info = receber_upload(arquivo)
+    try:
+        df = _carregar_por_hash(info["caminho"])
+    except Exception as e:
+        registrar_erro("UploadManager", e)
+        return pd.DataFrame(), {**info, "snapshot": {}}
+
+    try:
+        info["snapshot"] = _snapshot_upload(info["caminho"], nome_dataset(getattr(arquivo, "name", None) or info["caminho"]))
+    except Exception as e:
+        registrar_erro("UploadManager", e)
+        info["snapshot"] = {}
+    return df, info
@@ -1,7 +1,7 @@
 import streamlit as st
-from core.data_loader import load_data
-from core.preprocessing import preprocess_data
-from core.ml_model import train_model
+from core.upload_manager import UploadRecusado, carregar_upload
+from core.preprocessing import DataPreprocessor
+from core.ml_model import MLModel
 
 def ai_interface():
     st.title("🤖 IA Analítica — Plastic Busters")
@@ -13,17 +13,29 @@ def ai_interface():
     )
 
     if uploaded_file:
-        file_path = f"./data/uploads/{uploaded_file.name}"
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.read())
-
         st.info("🔍 Carregando e estruturando os dados...")
-        df = load_data(file_path)
+        try:
+            df, info = carregar_upload(uploaded_file)
+        except UploadRecusado as e:
+            st.error(f"🚫 {e}")
+            return
+        if not info["novo"]:
+            st.caption("♻️ Arquivo já enviado antes — reaproveitando os dados carregados.")
+        if df.empty:
+            st.error("❌ Nenhum dado foi lido do arquivo.")
+            return
         st.dataframe(df.head())
 
         st.divider()
+        df_clean = DataPreprocessor().clean(df.copy())
+        alvo = st.selectbox("🎯 Coluna alvo", df_clean.columns, index=len(df_clean.columns) - 1)
         if st.button("🚀 Processar e Treinar IA"):
             with st.spinner("Processando dados..."):
-                df_clean = preprocess_data(df)
-                model, acc = train_model(df_clean)
+                # O modelo fica marcado com a versão do upload de onde os dados vieram
+                acc = MLModel().train(df_clean, alvo, snapshot=info["snapshot"] or None)
+            if acc is None:
+                st.error("❌ Falha no treinamento — veja o log do sistema.")
+                return
             st.success(f"✅ Modelo treinado com acurácia de {acc:.2f}")
+            if info["snapshot"]:
+                st.caption(f"🗂️ Dados: {info['snapshot']['dataset']} v{info['snapshot']['numero']} ({info['snapshot']['id']})")
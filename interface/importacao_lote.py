@@ -0,0 +1,54 @@
+"""
+Módulo: importacao_lote.py
+Descrição: Painel Streamlit de importação em lote (CSV/JSONL + .zip de imagens ou
+           catálogo de degradadores), compartilhado pelas páginas de cadastro.
+Autor: Samuel
+Data: 2025
+"""
+
+import streamlit as st
+from core.bulk_import import CAMPOS_CADASTRO, importar_arquivo, importar_catalogo
+
+
+def _exibir_relatorio(relatorio: dict):
+    if relatorio.get("erro"):
+        st.error(f"🚨 Falha na importação: {relatorio['erro']}")
+        return
+
+    st.success(
+        f"✅ {relatorio['inseridos']} de {relatorio['total']} registro(s) importados "
+        f"em {relatorio['tempo_s']} s."
+    )
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Já cadastrados", relatorio["ja_cadastrados"])
+    col2.metric("Repetidos no arquivo", relatorio["duplicados_arquivo"])
+    col3.metric("Inválidos", relatorio["invalidos"])
+    if relatorio.get("imagens") or relatorio.get("imagens_ausentes"):
+        st.caption(f"🖼️ {relatorio['imagens']} imagem(ns) copiada(s), {relatorio['imagens_ausentes']} não encontrada(s) no .zip.")
+    if relatorio["invalidos"]:
+        st.dataframe(relatorio["detalhes_invalidos"], use_container_width=True, hide_index=True)
+
+
+def painel_importacao_lote(colecao: str, rotulo: str):
+    """
+    Expander de importação em lote para a coleção ("fungos" ou "polimeros").
+    """
+    with st.expander(f"📥 Importação em lote — {rotulo}"):
+        st.caption("Colunas aceitas: " + ", ".join(CAMPOS_CADASTRO[colecao]) + ". Obrigatória: nome_cientifico.")
+        arquivo = st.file_uploader("Arquivo CSV ou JSONL", type=["csv", "jsonl", "ndjson"], key=f"lote_{colecao}")
+        imagens = st.file_uploader("Imagens (.zip, opcional)", type=["zip"], key=f"lote_zip_{colecao}")
+
+        col1, col2 = st.columns(2)
+        importar_btn = col1.button("📥 Importar arquivo", use_container_width=True, disabled=arquivo is None,
+                                   key=f"importar_{colecao}")
+        catalogo_btn = col2.button("🦠 Importar do catálogo de degradadores", use_container_width=True,
+                                   key=f"catalogo_{colecao}")
+
+        if importar_btn or catalogo_btn:
+            barra = st.progress(0.0, text="Iniciando...")
+            progresso = lambda fracao, mensagem: barra.progress(fracao, text=mensagem)
+            if importar_btn:
+                relatorio = importar_arquivo(arquivo, colecao, imagens, progresso)
+            else:
+                relatorio = importar_catalogo(colecao, progresso)
+            _exibir_relatorio(relatorio)
@@ -1,8 +1,13 @@
 import streamlit as st
 import leafmap.foliumap as leafmap
-import pandas as pd
-import json
-import os
+from streamlit_folium import st_folium
+from folium.plugins import HeatMap
+from core.env_fetcher import buscar_dados_ambientais
+from core.tile_cache import url_tiles
+from core.geo_layers import carregar_pontos_amostragem, camada_pontos
+from core.spatial_aggregation import celulas_zoom, pesos_heatmap
+from core.spatial_index import indice_sitios, degradadores_proximos
+from utils.constants import TILE_CONFIG
 
 def map_interface():
     st.title("🗺️ Mapa Interativo — Plastic Busters")
@@ -28,66 +33,76 @@ def map_interface():
         mostrar_pontos = st.checkbox("Exibir pontos de amostragem", True)
 
     # Criação do mapa base
-    mapa = leafmap.Map(center=[-15.8, -47.9], zoom=4, tiles="CartoDB.DarkMatter")
-    mapa.add_basemap("Esri.WorldImagery")
+    # Basemaps da origem; com PB_TILES_LOCAL=1, do cache local de tiles (offline nas regiões semeadas)
+    # Centro/zoom vêm da última interação com o mapa: o heatmap usa o nível da pirâmide
+    # correspondente ao zoom que está sendo visto
+    vista = st.session_state.setdefault("mapa_vista", {"centro": [-15.8, -47.9], "zoom": 4})
+    mapa = leafmap.Map(center=vista["centro"], zoom=vista["zoom"], tiles=None)
+    for fonte, nome in [("carto_dark", "CartoDB.DarkMatter"), ("esri_imagery", "Esri.WorldImagery")]:
+        mapa.add_tile_layer(
+            url=url_tiles(fonte), name=nome,
+            attribution=TILE_CONFIG["fontes"][fonte]["atribuicao"]
+        )
+
+    # Carrega dados geográficos (pontos de exemplo se o arquivo não existir)
+    df = carregar_pontos_amostragem()
 
-    # Carrega dados geográficos se existirem
-    dados_geo_path = "./data/processed/pontos_geo.json"
-    if os.path.exists(dados_geo_path):
-        with open(dados_geo_path, "r", encoding="utf-8") as f:
-            geo_data = json.load(f)
-        df = pd.DataFrame(geo_data)
-    else:
-        df = pd.DataFrame({
-            "latitude": [-23.5, -22.9, -3.1],
-            "longitude": [-46.6, -43.2, -60.0],
-            "temperatura": [26, 28, 31],
-            "umidade": [70, 82, 88],
-            "ph": [6.5, 7.1, 5.8],
-            "oxigenio": [8.2, 7.5, 6.9],
-            "tipo": ["Aquático", "Terrestre", "Aquático"]
-        })
+    # Atualiza temperatura/umidade de todos os pontos em lote (requisições concorrentes + cache)
+    if st.sidebar.button("🔄 Atualizar dados ambientais dos pontos"):
+        with st.spinner("Buscando dados climáticos..."):
+            atuais = buscar_dados_ambientais(df, incluir_nomes=False)
+        if not atuais.empty:
+            df["temperatura"] = atuais["temperatura"].fillna(df["temperatura"]).to_numpy()
+            df["umidade"] = atuais["umidade"].fillna(df["umidade"]).to_numpy()
+            st.sidebar.success(f"✅ {atuais['temperatura'].notna().sum()} de {len(df)} pontos atualizados.")
 
-    # Exibe pontos se habilitado
+    # Exibe pontos se habilitado: um único GeoJSON com cluster e popups montados no navegador
+    # (todos os pontos vão ao mapa; o cluster resolve a sobreposição em cada zoom)
     if mostrar_pontos:
-        for _, row in df.iterrows():
-            popup_text = f"""
-            <b>Tipo:</b> {row['tipo']}<br>
-            🌡️ <b>Temperatura:</b> {row['temperatura']} °C<br>
-            💧 <b>Umidade:</b> {row['umidade']} %<br>
-            🧪 <b>pH:</b> {row['ph']}<br>
-            🌬️ <b>Oxigênio:</b> {row['oxigenio']} mg/L
-            """
-            mapa.add_marker(
-                location=[row["latitude"], row["longitude"]],
-                popup=popup_text,
-                icon="info-sign"
-            )
+        camada_pontos(df, {
+            "tipo": "Tipo",
+            "temperatura": "🌡️ Temperatura (°C)",
+            "umidade": "💧 Umidade (%)",
+            "ph": "🧪 pH",
+            "oxigenio": "🌬️ Oxigênio (mg/L)",
+        }).add_to(mapa)
 
-    # Camadas adicionais conforme filtro
-    if "Microplásticos" in camada:
-        mapa.add_heatmap(
-            df[["latitude", "longitude"]].values.tolist(),
-            name="Concentração de Microplásticos",
-            radius=25
-        )
-
-    if "Contaminação" in camada:
-        mapa.add_heatmap(
-            df[["latitude", "longitude"]].values.tolist(),
-            name="Níveis de Contaminação",
-            radius=20,
-            colors="Reds"
-        )
+    # Camadas adicionais conforme filtro: só as células agregadas (média ponderada por célula)
+    # vão ao navegador; sem coluna de medida, o peso é a densidade de pontos
+    camadas_calor = [
+        ("Microplásticos", "microplasticos", "Concentração de Microplásticos", 25, None),
+        ("Contaminação", "contaminacao", "Níveis de Contaminação", 20, {0.4: "yellow", 0.7: "orange", 1.0: "red"}),
+    ]
+    for filtro, coluna, nome, raio, gradiente in camadas_calor:
+        if filtro in camada:
+            celulas = celulas_zoom(df, vista["zoom"], coluna_valor=coluna)
+            campo = "media" if coluna in df.columns else "contagem"
+            HeatMap(pesos_heatmap(celulas, campo), name=nome, radius=raio, gradient=gradiente).add_to(mapa)
 
     # Callback de clique
     st.markdown("---")
     st.markdown("🖱️ **Clique em qualquer ponto no mapa para consultar variáveis ambientais.**")
 
-    clicked = mapa.user_interaction()
+    estado = st_folium(mapa, height=600, key="mapa_interativo", returned_objects=["zoom", "center", "last_clicked"])
+    if estado and estado.get("zoom") is not None and int(estado["zoom"]) != vista["zoom"]:
+        centro = estado.get("center") or {}
+        st.session_state["mapa_vista"] = {
+            "centro": [centro.get("lat", vista["centro"][0]), centro.get("lng", vista["centro"][1])],
+            "zoom": int(estado["zoom"]),
+        }
+        if any(filtro in camada for filtro, *_ in camadas_calor):
+            st.rerun()   # reagrega o heatmap no nível do novo zoom
+
+    clicked = estado.get("last_clicked") if estado else None
     if clicked:
         st.success(f"📍 Ponto clicado: {clicked}")
-        # Aqui dá pra conectar com a IA e mostrar predições locais
-        # Exemplo: modelo.predict([variáveis ambientais do ponto])
-
-    mapa.to_streamlit(height=600)
+        lat = clicked.get("lat") if isinstance(clicked, dict) else None
+        lon = clicked.get("lng", clicked.get("lon")) if isinstance(clicked, dict) else None
+        if lat is not None and lon is not None:
+            col_a, col_b = st.columns(2)
+            with col_a:
+                st.markdown("**Medições mais próximas**")
+                st.dataframe(indice_sitios().vizinhos(lat, lon, k=3), use_container_width=True, hide_index=True)
+            with col_b:
+                st.markdown("**Degradadores isolados na região**")
+                st.dataframe(degradadores_proximos(lat, lon), use_container_width=True, hide_index=True)
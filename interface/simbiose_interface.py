@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 import networkx as nx
 import plotly.graph_objects as go
-from core.data_loader import load_data
+from core.upload_manager import UploadRecusado, carregar_upload
 from core.preprocessing import preprocess_data
 
 def simbiose_interface():
@@ -15,12 +15,12 @@ def simbiose_interface():
     uploaded_file = st.file_uploader("📥 Envie um arquivo de dados (CSV, JSON ou DB)", type=["csv", "json", "db"])
 
     if uploaded_file:
-        file_path = f"./data/uploads/{uploaded_file.name}"
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.read())
-
         with st.spinner("Carregando e estruturando dados..."):
-            df = load_data(file_path)
+            try:
+                df, _ = carregar_upload(uploaded_file)
+            except UploadRecusado as e:
+                st.error(f"🚫 {e}")
+                return
             df = preprocess_data(df)
             st.success("✅ Dados carregados e processados com sucesso!")
             st.dataframe(df.head())
@@ -0,0 +1,103 @@
+import time
+
+import streamlit as st
+from core.catalog_search import buscar_catalogo
+from core.sequence_index import buscar_enzimas_similares, indice_sequencias
+from core.taxonomy_index import arvore_taxonomica
+
+
+def _filtro_faceta(coluna, rotulo: str, faceta) -> str:
+    """
+    Selectbox com os valores da faceta e a contagem de resultados de cada um.
+    """
+    contagens = {} if faceta is None else {v: n for v, n in faceta.itertuples(index=False) if v}
+    return coluna.selectbox(
+        rotulo, [""] + list(contagens),
+        format_func=lambda valor: f"{valor} ({contagens[valor]})" if valor else "Todos",
+    )
+
+
+def catalogo():
+    st.title("📚 Catálogo de Degradadores")
+    st.write("Consulte as enzimas e microrganismos degradadores de plástico catalogados.")
+
+    # ========= Busca textual =========
+    st.subheader("🔎 Buscar no catálogo")
+    texto = st.text_input(
+        "Organismo, plástico, enzima, referência ou local",
+        placeholder="ex.: pseudomonas cutinase, PET, landfill...",
+    )
+    inicio = time.perf_counter()
+    busca = buscar_catalogo(texto)
+
+    col1, col2 = st.columns(2)
+    plastico = _filtro_faceta(col1, "Plástico", busca["facetas"].get("Plastic"))
+    ambiente = _filtro_faceta(col2, "Ambiente de isolamento", busca["facetas"].get("Isolation_environment"))
+
+    if plastico or ambiente:
+        busca = buscar_catalogo(texto, {"Plastic": plastico, "Isolation_environment": ambiente})
+    decorrido_ms = (time.perf_counter() - inicio) * 1000
+
+    st.caption(f"{busca['total']} registro(s) em {decorrido_ms:.1f} ms — exibindo os {len(busca['resultados'])} mais relevantes.")
+    st.dataframe(busca["resultados"], use_container_width=True, hide_index=True)
+
+    st.divider()
+
+    # ========= Taxonomia =========
+    st.subheader("🌳 Degradadores por clado")
+    arvore = arvore_taxonomica()
+    col1, col2 = st.columns([2, 1])
+    clado = col1.text_input("Clado (filo, classe, ordem, família, gênero...)", value="Ascomycota")
+    plastico = col2.selectbox("Que degradam", [""] + sorted(arvore.plasticos_conhecidos),
+                              format_func=lambda p: p or "Qualquer plástico")
+
+    no = arvore.no(clado) if clado.strip() else 0
+    if no is None:
+        st.warning(f"Clado '{clado}' não encontrado na árvore taxonômica.")
+    else:
+        resumo = arvore.agregar(no)
+        st.caption(arvore.caminho(no) or "Todos os organismos")
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("Registros", resumo["registros"])
+        c2.metric("Espécies", resumo["especies"])
+        c3.metric("Plásticos", resumo["plasticos"])
+        c4.metric("Degradação média", f"{resumo['dias_medio']:.0f} dias" if resumo["dias_medio"] else "—")
+
+        filhos = arvore.agregar_filhos(no)
+        if not filhos.empty:
+            st.dataframe(filhos, use_container_width=True, hide_index=True)
+        with st.expander(f"Degradadores sob {arvore.nomes[no]}" + (f" que degradam {plastico}" if plastico else "")):
+            st.dataframe(arvore.registros(no, plastico or None), use_container_width=True, hide_index=True)
+
+    st.divider()
+
+    # ========= Busca por sequência =========
+    st.subheader("🧬 Enzimas semelhantes a uma sequência")
+    indice, tabela = indice_sequencias()
+    st.caption(f"{len(tabela)} sequências de enzimas indexadas (k-mers de {indice.k} aminoácidos).")
+
+    sequencia = st.text_area(
+        "Sequência de proteína (texto ou FASTA)",
+        height=140,
+        placeholder=">minha_enzima\nMKHPYGYRWHWLYALVVTLMTALATFSAHA...",
+    )
+    limite = st.slider("Quantidade de resultados", 1, 50, 10)
+
+    if st.button("🔎 Buscar enzimas semelhantes", disabled=not sequencia.strip()):
+        inicio = time.perf_counter()
+        resultado = buscar_enzimas_similares(sequencia, limite)
+        decorrido_ms = (time.perf_counter() - inicio) * 1000
+
+        if resultado.empty:
+            st.warning("Nenhuma enzima do catálogo compartilha k-mers suficientes com a sequência.")
+        else:
+            st.success(f"✅ {len(resultado)} enzima(s) encontrada(s) em {decorrido_ms:.1f} ms.")
+            st.dataframe(
+                resultado,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "similaridade": st.column_config.ProgressColumn("Similaridade", min_value=0.0, max_value=1.0),
+                    "cobertura": st.column_config.NumberColumn("Cobertura", format="%.3f"),
+                },
+            )
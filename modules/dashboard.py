@@ -1,6 +1,65 @@
+import os
+
+import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
-import numpy as np
+from core.decay_simulation import (
+    RESISTENCIA_PLASTICO, EFICIENCIA_FUNGO, matriz_taxas, taxas_controle, simular_pares, simular_tabela
+)
+from core.data_loader import load_data
+from utils.cache import cache_figura
+from utils.constants import COLUMNAR_STORE_CONFIG
+
+# Fase lag de colonização (1º mês a 20% da taxa), seguida de degradação ativa
+ESTAGIOS_LAG = ((0, 0.2), (1, 1.0))
+
+# Siglas do simulador (em português) → siglas usadas nos ensaios processados
+SIGLAS_ENSAIOS = {"PEAD": "HDPE"}
+
+
+@cache_figura
+def grafico_decomposicao(tipo_fungo: str, tipo_plastico: str, adaptativa: bool, fase_lag: bool):
+    """
+    Curvas com e sem fungo para o par selecionado (cacheado pelos parâmetros do gráfico).
+    """
+    simulacao = simular_pares(adaptativa=adaptativa, estagios=ESTAGIOS_LAG if fase_lag else None)
+    i_fungo = simulacao["fungos"].index(tipo_fungo)
+    i_plastico = simulacao["plasticos"].index(tipo_plastico)
+
+    tempo = simulacao["tempo"]  # meses
+    decomposicao_com_fungo = simulacao["com_fungo"][i_fungo, i_plastico]
+    decomposicao_sem_fungo = simulacao["controle"][i_plastico]
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=tempo, y=decomposicao_sem_fungo,
+        mode="lines",
+        name="Sem Fungo",
+        line=dict(dash="dot", color="#FF6B6B", width=3)
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=tempo, y=decomposicao_com_fungo,
+        mode="lines",
+        name=f"Com {tipo_fungo}",
+        line=dict(color="#00C853", width=4)
+    ))
+
+    fig.update_layout(
+        title=f"📉 Curva de Decomposição — {tipo_plastico}",
+        xaxis_title="Tempo (meses)",
+        yaxis_title="Plástico remanescente (%)",
+        template="plotly_dark",
+        hovermode="x unified",
+        height=450,
+        margin=dict(l=40, r=40, t=60, b=40),
+        font=dict(size=13, color="#E6EDF3"),
+        plot_bgcolor="rgba(10, 12, 16, 0.85)",
+        paper_bgcolor="rgba(10, 12, 16, 0.0)",
+    )
+    return fig
+
 
 def dashboard_analitico():
     # =====================
@@ -22,85 +81,102 @@ def dashboard_analitico():
     col1, col2 = st.columns(2)
 
     with col1:
-        tipo_fungo = st.selectbox(
-            "🍄 Espécie de fungo simbiótico",
-            ["Aspergillus niger", "Penicillium chrysogenum", "Phanerochaete chrysosporium", "Trichoderma reesei"]
-        )
+        tipo_fungo = st.selectbox("🍄 Espécie de fungo simbiótico", list(EFICIENCIA_FUNGO))
 
     with col2:
-        tipo_plastico = st.selectbox(
-            "🧱 Tipo de plástico",
-            ["PET (Polietileno tereftalato)", "PEAD (Polietileno de alta densidade)", "PP (Polipropileno)", "PS (Poliestireno)"]
+        tipo_plastico = st.selectbox("🧱 Tipo de plástico", list(RESISTENCIA_PLASTICO))
+
+    with st.expander("⚙️ Opções de simulação"):
+        col1, col2 = st.columns(2)
+        adaptativa = col1.checkbox("Resolução temporal adaptativa", value=False)
+        fase_lag = col2.checkbox("Cinética em estágios (fase lag no 1º mês)", value=False)
+
+    # Ensaios de laboratório do plástico escolhido: só a partição dele é lida
+    with st.expander(f"🧪 Ensaios de laboratório com {tipo_plastico.split()[0]}"):
+        sigla = SIGLAS_ENSAIOS.get(tipo_plastico.split()[0], tipo_plastico.split()[0])
+        ensaios = load_data(
+            os.path.join(COLUMNAR_STORE_CONFIG["dir"], "symbiose_dataset"),
+            colunas=["fungus_name", "degradation_rate", "temperature", "ph", "simbiotico_score"],
+            filtros={"plastic_type": sigla},
         )
+        if ensaios.empty:
+            st.info("Nenhum ensaio processado para este plástico (rode python -m core.data_pipeline).")
+        else:
+            st.dataframe(ensaios.sort_values("simbiotico_score", ascending=False),
+                         use_container_width=True, hide_index=True)
 
     st.markdown("---")
 
     # =====================
     # PARÂMETROS DE SIMULAÇÃO
     # =====================
-    # Resistência e eficiência simbiótica baseadas em dados empíricos
-    resistencia_plastico = {
-        "PET (Polietileno tereftalato)": 1.0,
-        "PEAD (Polietileno de alta densidade)": 1.3,
-        "PP (Polipropileno)": 1.2,
-        "PS (Poliestireno)": 1.6
-    }
-
-    eficiencia_fungo = {
-        "Aspergillus niger": 0.9,
-        "Penicillium chrysogenum": 0.85,
-        "Phanerochaete chrysosporium": 0.65,
-        "Trichoderma reesei": 0.75
-    }
-
     # Coeficiente simbiótico geral
-    k_fungo = eficiencia_fungo[tipo_fungo]
-    r_plastico = resistencia_plastico[tipo_plastico]
-
-    # Taxa efetiva de degradação (quanto menor, mais resistente)
-    taxa_fungo = 0.15 * (k_fungo / r_plastico)
-    taxa_controle = 0.05 * (1 / r_plastico)
+    k_fungo = EFICIENCIA_FUNGO[tipo_fungo]
+    r_plastico = RESISTENCIA_PLASTICO[tipo_plastico]
 
     # =====================
     # GERAÇÃO DE DADOS SIMULADOS
     # =====================
-    tempo = np.linspace(0, 12, 100)  # meses
-    decomposicao_com_fungo = np.exp(-taxa_fungo * tempo) * 100
-    decomposicao_sem_fungo = np.exp(-taxa_controle * tempo) * 100
+    # Todos os pares fungo × plástico são simulados de uma vez (cacheado por parâmetros)
+    simulacao = simular_pares(adaptativa=adaptativa, estagios=ESTAGIOS_LAG if fase_lag else None)
+    tempo = simulacao["tempo"]  # meses
+    if tipo_fungo not in simulacao["fungos"] or tipo_plastico not in simulacao["plasticos"]:
+        st.error("🚨 Não foi possível simular as curvas de decomposição (detalhes no log).")
+        return
 
     # =====================
     # GRÁFICO INTERATIVO
     # =====================
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=tempo, y=decomposicao_sem_fungo,
-        mode="lines",
-        name="Sem Fungo",
-        line=dict(dash="dot", color="#FF6B6B", width=3)
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=tempo, y=decomposicao_com_fungo,
-        mode="lines",
-        name=f"Com {tipo_fungo}",
-        line=dict(color="#00C853", width=4)
-    ))
+    fig = grafico_decomposicao(tipo_fungo, tipo_plastico, adaptativa, fase_lag)
+    st.plotly_chart(fig, use_container_width=True)
 
-    fig.update_layout(
-        title=f"📉 Curva de Decomposição — {tipo_plastico}",
-        xaxis_title="Tempo (meses)",
-        yaxis_title="Plástico remanescente (%)",
-        template="plotly_dark",
-        hovermode="x unified",
-        height=450,
-        margin=dict(l=40, r=40, t=60, b=40),
-        font=dict(size=13, color="#E6EDF3"),
-        plot_bgcolor="rgba(10, 12, 16, 0.85)",
-        paper_bgcolor="rgba(10, 12, 16, 0.0)",
-    )
+    # =====================
+    # COMPARAÇÃO DE CURVAS
+    # =====================
+    with st.expander("📊 Comparar pares fungo × plástico"):
+        pares = [f"{f} × {p}" for f in simulacao["fungos"] for p in simulacao["plasticos"]]
+        selecionados = st.multiselect("Pares", pares, default=[f"{tipo_fungo} × {tipo_plastico}"])
 
-    st.plotly_chart(fig, use_container_width=True)
+        # Apenas fatia o array já simulado — nenhuma curva é recalculada
+        curvas = simulacao["com_fungo"].reshape(len(pares), -1)
+        fig_comp = go.Figure()
+        for par in selecionados:
+            fig_comp.add_trace(go.Scatter(x=tempo, y=curvas[pares.index(par)], mode="lines", name=par))
+        fig_comp.update_layout(
+            xaxis_title="Tempo (meses)",
+            yaxis_title="Plástico remanescente (%)",
+            template="plotly_dark",
+            height=400,
+        )
+        st.plotly_chart(fig_comp, use_container_width=True)
+
+    # =====================
+    # TAXAS PRÓPRIAS
+    # =====================
+    with st.expander("✍️ Simular com taxas próprias"):
+        st.caption("Edite ou acrescente linhas (taxa mensal de degradação); as curvas são recalculadas de uma vez.")
+        tabela = st.data_editor(
+            pd.DataFrame({
+                "nome": [f"{tipo_fungo} × {tipo_plastico.split()[0]}", f"Controle × {tipo_plastico.split()[0]}"],
+                "taxa": [matriz_taxas().loc[tipo_fungo, tipo_plastico], taxas_controle()[tipo_plastico]],
+            }),
+            num_rows="dynamic", use_container_width=True, hide_index=True, key="taxas_proprias",
+        ).dropna()
+
+        longo = simular_tabela(tabela, adaptativa=adaptativa, estagios=ESTAGIOS_LAG if fase_lag else None)
+        if longo.empty:
+            st.warning("⚠️ Informe ao menos uma linha com nome e taxa numérica.")
+        else:
+            fig_taxas = go.Figure()
+            for nome, curva in longo.groupby("nome", sort=False):
+                fig_taxas.add_trace(go.Scatter(x=curva["tempo"], y=curva["remanescente"], mode="lines", name=nome))
+            fig_taxas.update_layout(
+                xaxis_title="Tempo (meses)",
+                yaxis_title="Plástico remanescente (%)",
+                template="plotly_dark",
+                height=400,
+            )
+            st.plotly_chart(fig_taxas, use_container_width=True)
 
     # =====================
     # MÉTRICAS CORPORATIVAS
@@ -1,29 +1,25 @@
 import streamlit as st
-import json
 import os
+from utils.image_pipeline import gerar_miniaturas
+from core.record_store import obter_record_store
+from core.blob_store import obter_blob_store
+from core.taxonomy_index import registrar_fungos_na_taxonomia
+from interface.importacao_lote import painel_importacao_lote
 
 # ==========================
 # CONFIGURAÇÕES GERAIS
 # ==========================
 DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
 DATA_PATH = os.path.join(DATA_DIR, "fungos.json")
-IMAGES_DIR = os.path.join(DATA_DIR, "imagens_fungos")
-
-os.makedirs(IMAGES_DIR, exist_ok=True)
 
 
 def salvar_dados_fungo(dados):
-    """Salva os dados do fungo no JSON central do sistema."""
-    if os.path.exists(DATA_PATH):
-        with open(DATA_PATH, "r", encoding="utf-8") as f:
-            existentes = json.load(f)
-    else:
-        existentes = []
-
-    existentes.append(dados)
-
-    with open(DATA_PATH, "w", encoding="utf-8") as f:
-        json.dump(existentes, f, ensure_ascii=False, indent=4)
+    """Salva os dados do fungo no banco de cadastros (inserção atômica)."""
+    store = obter_record_store()
+    store.migrar_json("fungos", DATA_PATH)  # importa o JSON legado, se ainda existir
+    id_registro = store.inserir("fungos", dados)
+    registrar_fungos_na_taxonomia([dados])
+    return id_registro
 
 
 # ==========================
@@ -66,20 +62,31 @@ def inserir_fungo():
             "imagem": imagem.name if imagem else None,
         }
 
+        if imagem:
+            # Endereçamento por conteúdo: nomes iguais não se sobrescrevem e
+            # imagens idênticas ocupam um único arquivo
+            blobs = obter_blob_store()
+            dados["imagem_hash"] = blobs.guardar(imagem)
+            gerar_miniaturas(blobs.caminho(dados["imagem_hash"]))
+
         salvar_dados_fungo(dados)
         st.success("✅ Dados do fungo salvos com sucesso!")
 
         if imagem:
-            caminho_imagem = os.path.join(IMAGES_DIR, imagem.name)
-            with open(caminho_imagem, "wb") as f:
-                f.write(imagem.getbuffer())
-            st.info(f"🖼️ Imagem salva em: {caminho_imagem}")
+            st.info(f"🖼️ Imagem armazenada: {dados['imagem_hash'][:12]}…")
+
+    store = obter_record_store()
+    if exportar_btn:
+        store.migrar_json("fungos", DATA_PATH)
+    if exportar_btn and store.contar("fungos"):
+        st.download_button(
+            label="⬇️ Baixar JSON Gerado",
+            data=store.exportar_json("fungos"),
+            file_name="fungos.json",
+            mime="application/json"
+        )
 
-    if exportar_btn and os.path.exists(DATA_PATH):
-        with open(DATA_PATH, "rb") as f:
-            st.download_button(
-                label="⬇️ Baixar JSON Gerado",
-                data=f,
-                file_name="fungos.json",
-                mime="application/json"
-            )
\ No newline at end of file
+    # ==========================
+    # Importação em lote
+    # ==========================
+    painel_importacao_lote("fungos", "Fungos")
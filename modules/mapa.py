@@ -1,7 +1,33 @@
 import streamlit as st
 from streamlit_folium import st_folium
 import folium
-import requests
+from utils.cache import cache_figura
+from core.http_cache import nome_local, clima_atual, idade_clima
+from core.tile_cache import url_tiles
+from core.spatial_index import indice_sitios, degradadores_proximos
+from utils.constants import HTTP_CACHE_CONFIG, TILE_CONFIG
+
+
+# Função que monta o mapa (cacheada pelas coordenadas do marcador)
+@cache_figura
+def build_map(lat=None, lon=None):
+    # Tiles da origem; com PB_TILES_LOCAL=1, do cache MBTiles local (offline nas áreas semeadas)
+    m = folium.Map(location=[0, 0], zoom_start=2, tiles=None)
+    folium.TileLayer(
+        tiles=url_tiles("nasa_bluemarble"), attr=TILE_CONFIG["fontes"]["nasa_bluemarble"]["atribuicao"],
+        name="NASA Realista", overlay=False, max_native_zoom=TILE_CONFIG["fontes"]["nasa_bluemarble"]["zoom_max"]
+    ).add_to(m)
+
+    if lat is not None and lon is not None:
+        folium.Marker(
+            [lat, lon],
+            popup=f"<b>Coordenadas:</b> {lat:.4f}, {lon:.4f}",
+            tooltip="Local selecionado"
+        ).add_to(m)
+        m.location = [lat, lon]
+        m.zoom_start = 6
+    return m
+
 
 def mapa():
     st.title("🌍 Mapa Ambiental Interativo — NASA GIBS + Open Data")
@@ -13,36 +39,6 @@ def mapa():
         st.session_state['clicked_lon'] = None
         st.session_state['local_name'] = None
 
-    # Função para obter o nome do local a partir das coordenadas
-    def obter_nome_local(lat, lon):
-        try:
-            url = f"https://nominatim.openstreetmap.org/reverse?format=jsonv2&lat={lat}&lon={lon}"
-            resp = requests.get(url, headers={"User-Agent": "streamlit-app"})
-            data = resp.json()
-            return data.get("display_name", "Local desconhecido")
-        except:
-            return "Local não identificado"
-
-    # Função que monta o mapa
-    def build_map(lat=None, lon=None):
-        nasa_tiles = (
-            "https://gibs.earthdata.nasa.gov/wmts/epsg3857/best/"
-            "BlueMarble_ShadedRelief_Bathymetry/default/2013-12-01/"
-            "GoogleMapsCompatible_Level8/{z}/{y}/{x}.jpg"
-        )
-        m = folium.Map(location=[0, 0], zoom_start=2, tiles=None)
-        folium.TileLayer(tiles=nasa_tiles, attr="NASA GIBS BlueMarble", name="NASA Realista", overlay=False).add_to(m)
-        
-        if lat is not None and lon is not None:
-            folium.Marker(
-                [lat, lon],
-                popup=f"<b>Coordenadas:</b> {lat:.4f}, {lon:.4f}",
-                tooltip="Local selecionado"
-            ).add_to(m)
-            m.location = [lat, lon]
-            m.zoom_start = 6
-        return m
-
     # Layout de colunas
     col1, col2 = st.columns([2.5, 1])
 
@@ -58,7 +54,7 @@ def mapa():
             if (st.session_state['clicked_lat'] != lat) or (st.session_state['clicked_lon'] != lon):
                 st.session_state['clicked_lat'] = lat
                 st.session_state['clicked_lon'] = lon
-                st.session_state['local_name'] = obter_nome_local(lat, lon)
+                st.session_state['local_name'] = nome_local(lat, lon)
                 st.rerun()
 
     with col2:
@@ -75,16 +71,10 @@ def mapa():
             st.markdown(f"**🌐 Coordenadas:**  \nLatitude: `{lat:.4f}`  \nLongitude: `{lon:.4f}`")
 
             try:
-                # API de dados climáticos
-                url = (
-                    f"https://api.open-meteo.com/v1/forecast?"
-                    f"latitude={lat}&longitude={lon}"
-                    f"&current=temperature_2m,relative_humidity_2m"
-                )
-                resp = requests.get(url, timeout=10)
-                resp.raise_for_status()
-                data = resp.json()
-                current = data.get('current', {})
+                # API de dados climáticos (cache em disco por coordenada arredondada)
+                current = clima_atual(lat, lon)
+                if not current:
+                    raise RuntimeError("serviço de clima indisponível e sem dados em cache")
 
                 temp = current.get('temperature_2m', "N/A")
                 hum = current.get('relative_humidity_2m', "N/A")
@@ -94,7 +84,16 @@ def mapa():
                 ph_agua = round(7.0 + (abs(lon) % 0.3), 2)
                 oxigenio = round(8 + ((abs(lat) + abs(lon)) % 1), 2)
 
-                st.success("✅ Dados coletados com sucesso!")
+                # Leituras servidas do cache (janela stale ou sem rede) são sinalizadas pela idade
+                idade = idade_clima(current)
+                validade = HTTP_CACHE_CONFIG["endpoints"]["open_meteo"]
+                if idade is not None and idade > validade["ttl"] + validade["stale"]:
+                    st.warning(f"⚠️ Leitura de {current['time']} UTC (há {idade / 60:.0f} min): "
+                               "pode não refletir o clima atual.")
+                else:
+                    st.success("✅ Dados coletados com sucesso!")
+                    if idade is not None:
+                        st.caption(f"🕒 Leitura de {current['time']} UTC")
                 st.markdown(f"""
                 - 🌡️ **Temperatura:** {temp} °C  
                 - 💧 **Umidade:** {hum} %  
@@ -106,5 +105,20 @@ def mapa():
             except Exception as e:
                 st.error(f"🚨 Erro ao buscar dados: {e}")
 
+            # Consultas no índice espacial (sem varrer os conjuntos de dados)
+            st.markdown("### 📍 Pontos de amostragem próximos")
+            sitios = indice_sitios().vizinhos(lat, lon, k=3)
+            if sitios.empty:
+                st.caption("Nenhum ponto de amostragem cadastrado.")
+            else:
+                st.dataframe(sitios, use_container_width=True, hide_index=True)
+
+            st.markdown("### 🦠 Degradadores isolados na região")
+            degradadores = degradadores_proximos(lat, lon, k_locais=3, limite=8)
+            if degradadores.empty:
+                st.caption("Locais do catálogo ainda sendo geocodificados ou sem registros próximos.")
+            else:
+                st.dataframe(degradadores, use_container_width=True, hide_index=True)
+
 if __name__ == "__main__":
     mapa()
@@ -1,29 +1,22 @@
 import streamlit as st
-import json
 import os
+from utils.image_pipeline import gerar_miniaturas
+from core.record_store import obter_record_store
+from core.blob_store import obter_blob_store
+from interface.importacao_lote import painel_importacao_lote
 
 # ==========================
 # CONFIGURAÇÕES GERAIS
 # ==========================
 DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
 DATA_PATH = os.path.join(DATA_DIR, "plasticos.json")
-IMAGES_DIR = os.path.join(DATA_DIR, "imagens_plasticos")
-
-os.makedirs(IMAGES_DIR, exist_ok=True)
 
 
 def salvar_dados(dados):
-    """Salva os dados do plástico no JSON central do sistema."""
-    if os.path.exists(DATA_PATH):
-        with open(DATA_PATH, "r", encoding="utf-8") as f:
-            existentes = json.load(f)
-    else:
-        existentes = []
-
-    existentes.append(dados)
-
-    with open(DATA_PATH, "w", encoding="utf-8") as f:
-        json.dump(existentes, f, ensure_ascii=False, indent=4)
+    """Salva os dados do plástico no banco de cadastros (inserção atômica)."""
+    store = obter_record_store()
+    store.migrar_json("polimeros", DATA_PATH)  # importa o JSON legado, se ainda existir
+    return store.inserir("polimeros", dados)
 
 
 # ==========================
@@ -63,23 +56,34 @@ def inserir_plastico():
             "imagem": imagem.name if imagem else None,
         }
 
+        if imagem:
+            # Endereçamento por conteúdo: nomes iguais não se sobrescrevem e
+            # imagens idênticas ocupam um único arquivo
+            blobs = obter_blob_store()
+            dados["imagem_hash"] = blobs.guardar(imagem)
+            gerar_miniaturas(blobs.caminho(dados["imagem_hash"]))
+
         salvar_dados(dados)
         st.success("✅ Dados salvos com sucesso!")
 
         if imagem:
-            caminho_imagem = os.path.join(IMAGES_DIR, imagem.name)
-            with open(caminho_imagem, "wb") as f:
-                f.write(imagem.getbuffer())
-            st.info(f"🖼️ Imagem salva em: {caminho_imagem}")
+            st.info(f"🖼️ Imagem armazenada: {dados['imagem_hash'][:12]}…")
 
-    if exportar_btn and os.path.exists(DATA_PATH):
-        with open(DATA_PATH, "rb") as f:
-            st.download_button(
-                label="⬇️ Baixar JSON Gerado",
-                data=f,
-                file_name="plasticos.json",
-                mime="application/json"
-            )
+    store = obter_record_store()
+    if exportar_btn:
+        store.migrar_json("polimeros", DATA_PATH)
+    if exportar_btn and store.contar("polimeros"):
+        st.download_button(
+            label="⬇️ Baixar JSON Gerado",
+            data=store.exportar_json("polimeros"),
+            file_name="plasticos.json",
+            mime="application/json"
+        )
         st.success("✅ Arquivo JSON pronto para download!")
     elif exportar_btn:
-        st.warning("⚠️ Nenhum dado para exportar. Por favor, salve algum plástico primeiro.")
\ No newline at end of file
+        st.warning("⚠️ Nenhum dado para exportar. Por favor, salve algum plástico primeiro.")
+
+    # ==========================
+    # Importação em lote
+    # ==========================
+    painel_importacao_lote("polimeros", "Plásticos")
@@ -1,7 +1,152 @@
+import os
 import streamlit as st
 import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patheffects as path_effects
+from core.ml_model import MLModel
+from core.explainability import resumo_contribuicoes
+from core.heuristic_predictor import (
+    PESOS_PLASTICOS, PESOS_FUNGOS, estimar_tempo_degradacao, nivel_e_cor
+)
+from core.scenario_optimizer import otimizar_cenarios
+from utils.constants import MODEL_PATH, SCENARIO_CONFIG
+from utils.cache import cache_dados, cache_figura
+
+CAMINHO_MODELO = os.path.join(MODEL_PATH, "model.pkl")
+
+
+@cache_figura
+def grafico_pizza(tempo_estimado: float):
+    """
+    Gráfico de pizza compacto com a fração degradada (cacheado pela estimativa).
+    """
+    degradado = min(tempo_estimado * 0.3, tempo_estimado - 1)
+    restante = tempo_estimado - degradado
+
+    labels = ["Degradado", "Restante"]
+    sizes = [degradado, restante]
+    cores = ["#00E676", "#263238"]
+
+    fig, ax = plt.subplots(figsize=(4, 4))
+    fig.patch.set_facecolor("#0B0F19")
+    ax.set_facecolor("#0B0F19")
+
+    wedges, texts, autotexts = ax.pie(
+        sizes,
+        labels=labels,
+        autopct=lambda p: f"{p:.1f}%" if p > 5 else "",
+        startangle=90,
+        colors=cores,
+        textprops={"color": "#E0F7FA", "fontsize": 10},
+        wedgeprops={"linewidth": 2, "edgecolor": "#00BFA5"}
+    )
+
+    for autotext in autotexts:
+        autotext.set_path_effects([
+            path_effects.Stroke(linewidth=2, foreground="#00E5FF"),
+            path_effects.Normal()
+        ])
+
+    ax.text(
+        0, 0,
+        f"{tempo_estimado:.1f}\nmeses",
+        ha="center", va="center",
+        fontsize=14, color="#A7FFEB", fontweight="bold"
+    )
+
+    ax.set_title(
+        "🧬 Estimativa de Degradação",
+        color="#A7FFEB",
+        fontsize=13,
+        pad=20,
+        fontweight="bold"
+    )
+
+    plt.setp(ax, aspect="equal")
+    return fig
+
+
+@cache_dados(arquivos=("caminho_modelo",))
+def importancia_modelo(caminho_modelo: str):
+    """
+    Importância por permutação da versão atual do modelo (invalidada quando model.pkl muda).
+    """
+    return MLModel(os.path.dirname(caminho_modelo)).importancia_features()
+
+
+@cache_dados(arquivos=("caminho_modelo",))
+def ranking_cenarios(caminho_modelo: str, top_k: int, peso_modelo: float):
+    """
+    Ranking do otimizador de cenários, recalculado só quando parâmetros ou modelo mudam.
+    """
+    modelo = MLModel(os.path.dirname(caminho_modelo)) if os.path.exists(caminho_modelo) else None
+    return otimizar_cenarios(modelo, top_k=top_k, peso_modelo=peso_modelo)
+
+
+@cache_dados(arquivos=("caminho_modelo",))
+def explicar_predicao(caminho_modelo: str, cenario: dict):
+    """
+    Classe prevista pelo MLModel para um cenário e a contribuição de cada variável
+    (caminhos de decisão das árvores). Recalculado só quando cenário ou modelo mudam.
+    """
+    modelo = MLModel(os.path.dirname(caminho_modelo))
+    entrada = pd.DataFrame([cenario])
+    if modelo.cobertura_features(entrada) < SCENARIO_CONFIG["cobertura_minima_modelo"]:
+        return None, resumo_contribuicoes({}, 0)   # modelo treinado com outras variáveis
+    previsto = modelo.predict(entrada)
+    contribuicoes = resumo_contribuicoes(modelo.explicar(entrada), 0)
+    return (previsto[0] if len(previsto) else None), contribuicoes
+
+
+def exibir_explicacao_predicao(cenario: dict):
+    """
+    Mostra, para o cenário calculado, o que o modelo treinado prevê e por quê.
+    """
+    if not os.path.exists(CAMINHO_MODELO):
+        return
+
+    previsto, contribuicoes = explicar_predicao(CAMINHO_MODELO, cenario)
+    with st.expander("🧩 Por que o modelo de IA previu isso?"):
+        if previsto is None or contribuicoes.empty:
+            st.caption("Sem predição explicável: o modelo atual foi treinado com outras variáveis ou está indisponível.")
+            return
+
+        st.markdown(f"**Predição do modelo:** {previsto}")
+        st.bar_chart(contribuicoes.head(10).set_index("feature")["contribuicao"])
+        st.caption("Contribuição de cada variável para a classe prevista (caminhos de decisão das árvores).")
+
+
+def exibir_importancia_modelo():
+    """
+    Mostra a importância das variáveis ambientais do modelo treinado.
+    Lê o resultado salvo junto ao modelo (sem recalcular a permutação).
+    """
+    importancia = importancia_modelo(CAMINHO_MODELO)
+
+    with st.expander("🔎 Quais fatores ambientais mais pesam no modelo?"):
+        if importancia.empty:
+            st.caption("Nenhum modelo treinado com explicações disponíveis ainda.")
+            return
+
+        st.bar_chart(importancia.set_index("feature")["importancia_media"])
+        st.caption("Queda média de acurácia ao embaralhar cada variável (importância por permutação).")
+
+
+def exibir_melhores_combinacoes():
+    """
+    Ranking das melhores combinações fungo × condição ambiental por plástico.
+    Usa o MLModel como segundo critério quando há um modelo treinado.
+    """
+    with st.expander("🏆 Melhores combinações por plástico"):
+        col1, col2 = st.columns(2)
+        top_k = col1.slider("Combinações por plástico", 1, 10, 3)
+        tem_modelo = os.path.exists(CAMINHO_MODELO)
+        peso_modelo = col2.slider("Peso do modelo de IA", 0.0, 1.0, 0.5, disabled=not tem_modelo)
+
+        ranking = ranking_cenarios(CAMINHO_MODELO, top_k, peso_modelo)
+        st.dataframe(ranking, use_container_width=True, hide_index=True)
+
 
 def predictor():
     """
@@ -26,11 +171,7 @@ def predictor():
     col1, col2 = st.columns(2)
 
     with col1:
-        tipo_plastico = st.selectbox(
-            "🧱 Tipo de plástico",
-            ["PET (Polietileno tereftalato)", "PEAD (Polietileno de alta densidade)",
-             "PP (Polipropileno)", "PS (Poliestireno)"]
-        )
+        tipo_plastico = st.selectbox("🧱 Tipo de plástico", list(PESOS_PLASTICOS))
 
         temperatura_ideal = st.radio(
             "🌡️ Temperatura agradável?",
@@ -43,11 +184,7 @@ def predictor():
         )
 
     with col2:
-        tipo_fungo = st.selectbox(
-            "🍄 Espécie de fungo simbiótico",
-            ["Aspergillus niger", "Penicillium chrysogenum",
-             "Phanerochaete chrysosporium", "Trichoderma reesei"]
-        )
+        tipo_fungo = st.selectbox("🍄 Espécie de fungo simbiótico", list(PESOS_FUNGOS))
 
         oxigenacao_ideal = st.radio(
             "🫧 Oxigenação a favor?",
@@ -60,59 +197,17 @@ def predictor():
     # BOTÃO DE PREDIÇÃO
     # =====================
     if st.button("🚀 Calcular previsão"):
-        # =====================
-        # PESOS HEURÍSTICOS
-        # =====================
-        pesos_plasticos = {
-            "PET (Polietileno tereftalato)": 1.0,
-            "PEAD (Polietileno de alta densidade)": 1.4,
-            "PP (Polipropileno)": 1.2,
-            "PS (Poliestireno)": 1.8
-        }
-
-        pesos_fungos = {
-            "Aspergillus niger": 0.9,
-            "Penicillium chrysogenum": 0.8,
-            "Phanerochaete chrysosporium": 0.6,
-            "Trichoderma reesei": 0.7
-        }
-
-        # =====================
-        # FATORES AMBIENTAIS
-        # =====================
-        fatores_ambiente = 1.0
-        if temperatura_ideal == "Sim":
-            fatores_ambiente *= 0.9
-        if umidade_ideal == "Sim":
-            fatores_ambiente *= 0.9
-        if oxigenacao_ideal == "Sim":
-            fatores_ambiente *= 0.85
-
-        # =====================
-        # CÁLCULO DA PREVISÃO
-        # =====================
-        tempo_base = 12  # meses base para decomposição parcial
-        tempo_estimado = (
-            tempo_base
-            * pesos_plasticos[tipo_plastico]
-            * pesos_fungos[tipo_fungo]
-            * fatores_ambiente
-        )
+        tempo_estimado = float(estimar_tempo_degradacao(
+            tipo_plastico, tipo_fungo,
+            temperatura_ideal, umidade_ideal, oxigenacao_ideal
+        )[0])
 
         # =====================
         # RESULTADO E FEEDBACK
         # =====================
         st.success(f"🧬 Tempo estimado de degradação: **{tempo_estimado:.2f} meses**")
 
-        if tempo_estimado < 3:
-            nivel = "🚀 Degradação ultrarrápida — condições ideais!"
-            cor = "#3FC380"
-        elif tempo_estimado < 6:
-            nivel = "⚙️ Degradação eficiente — simbionte ativo."
-            cor = "#F5D76E"
-        else:
-            nivel = "🐢 Degradação lenta — otimização ambiental recomendada."
-            cor = "#F64747"
+        nivel, cor = nivel_e_cor(tempo_estimado)
 
         st.markdown(f"""
             <div style='padding:15px; background-color:{cor}; color:white; border-radius:10px;'>
@@ -123,51 +218,18 @@ def predictor():
         # =====================
         # GRÁFICO DE PIZZA — TEMPO DE DEGRADAÇÃO (Compacto)
         # =====================
-        degradado = min(tempo_estimado * 0.3, tempo_estimado - 1)
-        restante = tempo_estimado - degradado
-
-        labels = ["Degradado", "Restante"]
-        sizes = [degradado, restante]
-        cores = ["#00E676", "#263238"]
-
-        fig, ax = plt.subplots(figsize=(4, 4))
-        fig.patch.set_facecolor("#0B0F19")
-        ax.set_facecolor("#0B0F19")
-
-        wedges, texts, autotexts = ax.pie(
-            sizes,
-            labels=labels,
-            autopct=lambda p: f"{p:.1f}%" if p > 5 else "",
-            startangle=90,
-            colors=cores,
-            textprops={"color": "#E0F7FA", "fontsize": 10},
-            wedgeprops={"linewidth": 2, "edgecolor": "#00BFA5"}
-        )
-
-        for autotext in autotexts:
-            autotext.set_path_effects([
-                path_effects.Stroke(linewidth=2, foreground="#00E5FF"),
-                path_effects.Normal()
-            ])
-
-        ax.text(
-            0, 0,
-            f"{tempo_estimado:.1f}\nmeses",
-            ha="center", va="center",
-            fontsize=14, color="#A7FFEB", fontweight="bold"
-        )
-
-        ax.set_title(
-            "🧬 Estimativa de Degradação",
-            color="#A7FFEB",
-            fontsize=13,
-            pad=20,
-            fontweight="bold"
-        )
-
-        plt.setp(ax, aspect="equal")
+        fig = grafico_pizza(round(tempo_estimado, 2))
         st.pyplot(fig, use_container_width=False)
 
+        # Mesmas colunas da grade do otimizador de cenários (condições como booleanos)
+        exibir_explicacao_predicao({
+            "plastico": tipo_plastico,
+            "fungo": tipo_fungo,
+            "temperatura_ideal": temperatura_ideal == "Sim",
+            "umidade_ideal": umidade_ideal == "Sim",
+            "oxigenacao_ideal": oxigenacao_ideal == "Sim",
+        })
+
         # =====================
         # INSIGHT ADICIONAL
         # =====================
@@ -177,3 +239,6 @@ def predictor():
             ambiental dinâmico e será integrado a um sistema de machine learning
             preditivo na versão **Symbiose 2.0**.
         """)
+
+    exibir_importancia_modelo()
+    exibir_melhores_combinacoes()
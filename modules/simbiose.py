@@ -3,20 +3,12 @@ import pandas as pd
 import plotly.express as px
 import networkx as nx
 import matplotlib.pyplot as plt
+from utils.cache import cache_dados, cache_figura
 
-def simbiose():
-    st.title("🧬 Simbiose — Fungo e Microrganismos Auxiliares")
-    st.markdown(
-        """
-        ### 🌿 Interações simbióticas microbianas
-        Explore as **parcerias simbióticas** entre fungos degradadores e microrganismos
-        (bactérias, algas e actinomicetos) que **potencializam a decomposição de polímeros plásticos**.
-        """
-    )
 
-    # ======================
-    # BASE EXPERIMENTAL
-    # ======================
+@cache_dados
+def carregar_dados_simbiose() -> pd.DataFrame:
+    """Base experimental de pares simbióticos, ordenada do melhor ao pior."""
     dados = pd.DataFrame({
         "Fungo": [
             "Penicillium chrysogenum",
@@ -45,13 +37,12 @@ def simbiose():
 
     # Ordena do melhor (maior eficiência) ao pior
     dados = dados.sort_values(by="Eficiência da Degradação (%)", ascending=False)
+    return dados
 
 
-    # ======================
-    # VISUALIZAÇÃO 1: GRÁFICO DE BARRAS REFINADO
-    # ======================
-    st.markdown("### 📊 Eficiência simbiótica por par microbiano")
-
+@cache_figura
+def grafico_eficiencia(dados: pd.DataFrame):
+    """Gráfico de barras de eficiência por par microbiano (cacheado pelo conteúdo dos dados)."""
     fig = px.bar(
         dados,
         x="Eficiência da Degradação (%)",
@@ -78,6 +69,28 @@ def simbiose():
             title=""
         )
     )
+    return fig
+
+
+def simbiose():
+    st.title("🧬 Simbiose — Fungo e Microrganismos Auxiliares")
+    st.markdown(
+        """
+        ### 🌿 Interações simbióticas microbianas
+        Explore as **parcerias simbióticas** entre fungos degradadores e microrganismos
+        (bactérias, algas e actinomicetos) que **potencializam a decomposição de polímeros plásticos**.
+        """
+    )
+
+    dados = carregar_dados_simbiose()
+
+
+    # ======================
+    # VISUALIZAÇÃO 1: GRÁFICO DE BARRAS REFINADO
+    # ======================
+    st.markdown("### 📊 Eficiência simbiótica por par microbiano")
+
+    fig = grafico_eficiencia(dados)
     st.plotly_chart(fig, use_container_width=True)
 
 
@@ -1,5 +1,6 @@
 import streamlit as st
-from PIL import Image
+from utils.cache import carregar_bytes
+from utils.image_pipeline import miniatura
 
 def sobre():
     # ========= Estilos personalizados =========
@@ -120,8 +121,7 @@ def sobre():
     for i, (img, nome, cargo) in enumerate(membros):
         with [col1, col2, col3, col4, col5, col6 ][i]:
             try:
-                foto = Image.open(img)
-                st.image(foto, use_container_width=True, caption=nome)
+                st.image(carregar_bytes(miniatura(img, 240)), use_container_width=True, caption=nome)
             except:
                 st.markdown(f"#### {nome}")
             st.markdown(f"<p class='texto' style='text-align:center;'>{cargo}</p>", unsafe_allow_html=True)
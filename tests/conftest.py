@@ -0,0 +1,125 @@
+"""
+Fixtures compartilhadas: servidor HTTP local que imita o Open-Meteo e o Nominatim
+(e serve arquivos estáticos com ETag e Range, para o downloader) e um HttpCache
+apontado para ele, com banco em diretório temporário.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from core.http_cache import HttpCache
+
+
+class _Servidor(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Stub)
+        self.requisicoes = []      # (caminho, parâmetros, instante)
+        self.respostas_429 = 0     # quantas respostas 429 devolver antes de atender
+        self.encurtar = False      # devolve uma resposta a menos que o pedido
+        self.atraso = 0.0          # segundos antes de responder
+        self.arquivos = {}         # /arquivos/<nome> -> conteúdo (bytes)
+        self.truncar = None        # corta o próximo arquivo após N bytes (conexão cai)
+        self.cabecalhos = []       # cabeçalhos de cada requisição, na ordem de `requisicoes`
+        self._lock = threading.Lock()
+
+
+class _Stub(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _json(self, status: int, corpo, headers: dict = None):
+        dados = json.dumps(corpo).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(dados)))
+        for nome, valor in (headers or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _arquivo(self, nome: str):
+        servidor = self.server
+        if nome not in servidor.arquivos:
+            return self._json(404, {})
+        dados = servidor.arquivos[nome]
+        etag = f'"{hashlib.sha256(dados).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        inicio, status = 0, 200
+        if self.headers.get("Range") and self.headers.get("If-Range", etag) == etag:
+            inicio, status = int(self.headers["Range"].split("=")[1].rstrip("-")), 206
+        corpo = dados[inicio:]
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(corpo)))
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {inicio}-{len(dados) - 1}/{len(dados)}")
+        self.end_headers()
+
+        with servidor._lock:
+            corte, servidor.truncar = servidor.truncar, None
+        self.wfile.write(corpo if corte is None else corpo[:corte])
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        servidor = self.server
+        with servidor._lock:
+            servidor.requisicoes.append((url.path, params, time.monotonic()))
+            servidor.cabecalhos.append(dict(self.headers))
+            limitar = servidor.respostas_429 > 0
+            servidor.respostas_429 -= limitar
+
+        time.sleep(servidor.atraso)
+        if limitar:
+            return self._json(429, {"reason": "Too many requests"}, {"Retry-After": "1"})
+        if url.path == "/v1/forecast":
+            latitudes = params["latitude"].split(",")
+            longitudes = params["longitude"].split(",")
+            if servidor.encurtar:
+                latitudes = latitudes[:-1]
+            corpo = [
+                {"latitude": float(lat), "longitude": float(lon),
+                 "current": {"temperature_2m": float(lat), "relative_humidity_2m": 50}}
+                for lat, lon in zip(latitudes, longitudes)
+            ]
+            return self._json(200, corpo[0] if len(corpo) == 1 else corpo)
+        if url.path == "/reverse":
+            return self._json(200, {"display_name": f"Local {params['lat']},{params['lon']}"})
+        if url.path.startswith("/arquivos/"):
+            return self._arquivo(url.path.rsplit("/", 1)[1])
+        return self._json(404, {})
+
+
+@pytest.fixture
+def servidor():
+    srv = _Servidor()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def cache(servidor, tmp_path):
+    base = f"http://127.0.0.1:{servidor.server_address[1]}"
+    endpoints = {
+        "open_meteo": {"url": base + "/v1/forecast", "parametros_coordenadas": ("latitude", "longitude"),
+                       "ttl": 900, "stale": 900},
+        "nominatim_reverse": {"url": base + "/reverse", "parametros_coordenadas": ("lat", "lon"),
+                              "ttl": 900, "stale": 900},
+    }
+    return HttpCache(caminho_db=str(tmp_path / "http_cache.db"), endpoints=endpoints, timeout=5)
@@ -0,0 +1,50 @@
+"""
+Testes do cache central em memória (utils/cache.py).
+"""
+
+import pickle
+
+import folium
+
+from utils import cache
+from utils.cache import _tamanho_estimado
+
+
+class _FiguraPlotly:
+    """Imita plotly.graph_objects.Figure: só o módulo e o to_json importam aqui."""
+    __module__ = "plotly.graph_objs._figure"
+
+    def to_json(self):
+        return '{"data": [], "layout": {}}'
+
+
+def test_figuras_estimadas_sem_pickle(monkeypatch):
+    def proibido(*args, **kwargs):
+        raise AssertionError("figuras não devem ser serializadas com pickle")
+
+    monkeypatch.setattr(pickle, "dumps", proibido)
+    monkeypatch.setitem(cache.CACHE_CONFIG, "custo_figura_kb", 100)
+
+    assert _tamanho_estimado(folium.Map(location=[0, 0])) == 100 * 1024
+    assert _tamanho_estimado(_FiguraPlotly()) == len(_FiguraPlotly().to_json())
+
+
+def test_outros_valores_continuam_estimados():
+    assert _tamanho_estimado(b"x" * 10) == 10
+    assert _tamanho_estimado({"a": list(range(100))}) > 100
+
+
+def test_figura_cacheada_entra_no_teto_com_custo_fixo(monkeypatch):
+    monkeypatch.setitem(cache.CACHE_CONFIG, "custo_figura_kb", 64)
+    chamadas = []
+
+    @cache.cache_figura
+    def mapa(zoom: int):
+        chamadas.append(zoom)
+        return folium.Map(location=[0, 0], zoom_start=zoom)
+
+    antes = cache._armazenamento.memoria_usada
+    assert mapa(3) is mapa(3)
+    assert chamadas == [3]
+    assert cache._armazenamento.memoria_usada - antes == 64 * 1024
+    mapa.limpar()
@@ -0,0 +1,113 @@
+"""
+Testes do armazenamento colunar (core/columnar_store.py): poda de arquivos pelo
+catálogo e troca de versões do dataset.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from core import columnar_store
+from core.columnar_store import catalogo, gravar_dataset, ler_dataset
+from utils.constants import SNAPSHOT_CONFIG
+
+
+@pytest.fixture
+def loja(tmp_path, monkeypatch):
+    monkeypatch.setitem(columnar_store.COLUMNAR_STORE_CONFIG, "dir", str(tmp_path / "colunar"))
+    monkeypatch.setitem(columnar_store.COLUMNAR_STORE_CONFIG, "catalogo", str(tmp_path / "colunar" / "catalogo.json"))
+    monkeypatch.setitem(SNAPSHOT_CONFIG, "dir", str(tmp_path / "snapshots"))
+    return tmp_path / "colunar"
+
+
+@pytest.fixture
+def lidos(monkeypatch) -> list:
+    """Partições (diretório) de cada arquivo Parquet aberto pela leitura."""
+    caminhos, original = [], pq.read_table
+
+    def registrar(caminho, *args, **kwargs):
+        caminhos.append(os.path.basename(os.path.dirname(caminho)))
+        return original(caminho, *args, **kwargs)
+
+    monkeypatch.setattr(pq, "read_table", registrar)
+    return caminhos
+
+
+def _ensaios() -> pd.DataFrame:
+    return pd.DataFrame({
+        "plastic_type": ["PET", "PET", "PP", "PP", None],
+        "fungus_name": ["A", "B", "A", "C", "D"],
+        "taxa": [0.1, 0.3, 0.5, 0.7, 0.9],
+    })
+
+
+def _ler(filtros, lidos) -> tuple:
+    lidos.clear()
+    df = ler_dataset("ensaios", filtros=filtros)
+    return df, sorted(lidos)
+
+
+def test_poda_por_particao(loja, lidos):
+    gravar_dataset(_ensaios(), "ensaios", particoes=["plastic_type"])
+
+    df, arquivos = _ler({"plastic_type": "PET"}, lidos)
+    assert arquivos == ["plastic_type=PET"]
+    assert df["fungus_name"].tolist() == ["A", "B"]
+
+    df, arquivos = _ler([("plastic_type", "in", ["PP", "PET"])], lidos)
+    assert arquivos == ["plastic_type=PET", "plastic_type=PP"]
+    assert len(df) == 4
+
+
+def test_poda_por_intervalo_das_estatisticas(loja, lidos):
+    gravar_dataset(_ensaios(), "ensaios", particoes=["plastic_type"])
+
+    df, arquivos = _ler([("taxa", ">", 0.4)], lidos)
+    assert arquivos == ["plastic_type=PP", "plastic_type=__nulo__"]
+    assert df["taxa"].tolist() == [0.5, 0.7, 0.9]
+
+    df, arquivos = _ler([("taxa", ">=", 0.2), ("taxa", "<", 0.6)], lidos)
+    assert arquivos == ["plastic_type=PET", "plastic_type=PP"]
+    assert df["taxa"].tolist() == [0.3, 0.5]
+
+
+def test_particao_de_valores_ausentes(loja, lidos):
+    gravar_dataset(_ensaios(), "ensaios", particoes=["plastic_type"])
+    assert os.path.isdir(os.path.join(loja, catalogo()["ensaios"]["caminho"], "plastic_type=__nulo__"))
+
+    # Igualdade nunca casa com a partição nula; diferença a inclui
+    _, arquivos = _ler({"plastic_type": "PP"}, lidos)
+    assert arquivos == ["plastic_type=PP"]
+    df, arquivos = _ler([("plastic_type", "!=", "PET")], lidos)
+    assert arquivos == ["plastic_type=PP", "plastic_type=__nulo__"]
+    assert sorted(df["fungus_name"]) == ["A", "C", "D"]
+    assert pd.isna(ler_dataset("ensaios", filtros={"fungus_name": "D"})["plastic_type"]).all()
+
+
+def test_filtro_em_coluna_inexistente(loja, lidos):
+    gravar_dataset(_ensaios(), "ensaios", particoes=["plastic_type"])
+    with pytest.raises(KeyError, match="inexistente"):
+        _ler({"ph": 7}, lidos)
+    assert lidos == []
+
+
+def test_nova_versao_so_vale_depois_do_catalogo(loja):
+    gravar_dataset(_ensaios(), "ensaios", particoes=["plastic_type"])
+    primeira = catalogo()["ensaios"]["caminho"]
+
+    novos = _ensaios().assign(taxa=np.arange(5.0))
+    gravar_dataset(novos, "ensaios", particoes=["plastic_type"])
+    segunda = catalogo()["ensaios"]["caminho"]
+    assert segunda != primeira
+    # A versão anterior continua lá para quem leu o catálogo antigo
+    assert os.path.isdir(loja / primeira) and os.path.isdir(loja / segunda)
+    assert sorted(ler_dataset("ensaios")["taxa"]) == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    gravar_dataset(_ensaios(), "ensaios", particoes=["plastic_type"])
+    assert not os.path.exists(loja / primeira)
+    assert sorted(os.listdir(loja / "ensaios")) == sorted(
+        os.path.basename(c) for c in (segunda, catalogo()["ensaios"]["caminho"])
+    )
@@ -0,0 +1,17 @@
+"""
+Testes do carregamento com projeção de colunas (core/data_loader.py).
+"""
+
+import pandas as pd
+
+from core.data_loader import load_data
+
+
+def test_csv_ignora_colunas_pedidas_que_nao_existem(tmp_path):
+    caminho = tmp_path / "ensaios.csv"
+    pd.DataFrame({"plastic_type": ["PET", "PP"], "degradation_rate": [0.4, 0.1]}).to_csv(caminho, index=False)
+
+    df = load_data(str(caminho), colunas=["plastic_type", "coluna_inexistente"], filtros={"plastic_type": "PET"})
+
+    assert list(df.columns) == ["plastic_type"]
+    assert df["plastic_type"].tolist() == ["PET"]
@@ -0,0 +1,41 @@
+"""
+Testes do versionamento de datasets (core/dataset_snapshots.py).
+"""
+
+import pandas as pd
+
+from core.dataset_snapshots import RepositorioSnapshots, id_conteudo
+
+
+def _tabela() -> pd.DataFrame:
+    return pd.DataFrame({"fungo": ["A", "B", "C"], "taxa": [0.1, 0.2, 0.3]})
+
+
+def test_ordem_das_linhas_nao_muda_o_id():
+    df = _tabela()
+    assert id_conteudo(df) == id_conteudo(df.iloc[::-1])
+
+
+def test_esquema_faz_parte_do_id():
+    df = _tabela()
+    ids = {
+        id_conteudo(df),
+        id_conteudo(df.rename(columns={"taxa": "velocidade"})),
+        id_conteudo(df[["taxa", "fungo"]]),
+        id_conteudo(df.astype({"taxa": "float32"})),
+    }
+    assert len(ids) == 4
+
+
+def test_coluna_renomeada_vira_nova_versao_materializavel(tmp_path):
+    repositorio = RepositorioSnapshots(str(tmp_path))
+    df = _tabela()
+    primeira = repositorio.registrar("ensaios", df)
+    renomeada = df.rename(columns={"taxa": "velocidade"})
+    segunda = repositorio.registrar("ensaios", renomeada)
+
+    assert segunda["numero"] == 2 and segunda["id"] != primeira["id"]
+    pd.testing.assert_frame_equal(repositorio.materializar("ensaios"), renomeada, check_dtype=False)
+    pd.testing.assert_frame_equal(repositorio.materializar("ensaios", 1), df, check_dtype=False)
+    # Mesmo conteúdo e esquema: nenhuma versão nova
+    assert repositorio.registrar("ensaios", renomeada.iloc[::-1])["numero"] == 2
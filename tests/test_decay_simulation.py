@@ -0,0 +1,47 @@
+"""
+Testes da simulação de decomposição (core/decay_simulation.py).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.decay_simulation import simular_curvas, simular_pares, simular_tabela
+
+
+def test_simular_pares_formatos():
+    simulacao = simular_pares(n_pontos=50)
+    n_fungos, n_plasticos = len(simulacao["fungos"]), len(simulacao["plasticos"])
+
+    assert simulacao["com_fungo"].shape == (n_fungos, n_plasticos, 50)
+    assert simulacao["controle"].shape == (n_plasticos, 50)
+
+
+def test_simular_pares_com_erro_mantem_as_chaves():
+    simulacao = simular_pares(n_pontos=-1)
+
+    assert simulacao["fungos"] == [] and simulacao["plasticos"] == []
+    assert len(simulacao["tempo"]) == 0
+    assert simulacao["com_fungo"].size == 0 and simulacao["controle"].size == 0
+
+
+def test_matriz_de_taxas_por_estagio_nao_reaplica_multiplicadores():
+    estagios = ((0, 0.2), (1, 1.0))
+    tempo = np.array([0.0, 1.0, 3.0])
+
+    por_vetor = simular_curvas([0.1], tempo, estagios)
+    por_matriz = simular_curvas([[0.02, 0.1]], tempo, estagios)
+    np.testing.assert_allclose(por_matriz, por_vetor)
+    np.testing.assert_allclose(por_matriz[0], 100 * np.exp(-np.array([0.0, 0.02, 0.02 + 0.2])))
+
+    with pytest.raises(ValueError):
+        simular_curvas([[0.02, 0.1, 0.3]], tempo, estagios)
+
+
+def test_simular_tabela_formato_longo():
+    tabela = pd.DataFrame({"nome": ["A", "B"], "taxa": [0.1, 0.3]})
+    longo = simular_tabela(tabela, horizonte=6, n_pontos=7)
+
+    assert list(longo.columns) == ["nome", "tempo", "remanescente"]
+    assert len(longo) == 14
+    assert (longo.groupby("nome")["remanescente"].first() == 100).all()
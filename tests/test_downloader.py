@@ -0,0 +1,94 @@
+"""
+Testes do download dos datasets brutos (core/downloader.py) contra o servidor
+HTTP local de tests/conftest.py.
+"""
+
+import hashlib
+import os
+
+import pytest
+
+from core import downloader
+from core.downloader import Downloader
+
+CONTEUDO = bytes(range(256)) * 1024   # 256 KiB: vários blocos de 64 KiB
+
+
+@pytest.fixture(autouse=True)
+def sem_espera(monkeypatch):
+    monkeypatch.setitem(downloader.DOWNLOAD_CONFIG, "espera_base", 0.0)
+
+
+def _base(servidor) -> str:
+    return f"http://127.0.0.1:{servidor.server_address[1]}"
+
+
+def _downloader(servidor, tmp_path, sha256=None, **kwargs) -> Downloader:
+    fontes = {"ensaios": {"url": f"{_base(servidor)}/arquivos/ensaios.csv", "arquivo": "ensaios.csv", "sha256": sha256}}
+    return Downloader(destino=str(tmp_path / "raw"), fontes=fontes,
+                      manifesto=str(tmp_path / "downloads.json"), **kwargs)
+
+
+def _arquivos(servidor) -> list:
+    return [c for (caminho, _, _), c in zip(servidor.requisicoes, servidor.cabecalhos) if caminho.startswith("/arquivos/")]
+
+
+def test_retoma_apos_corpo_truncado(servidor, tmp_path):
+    servidor.arquivos["ensaios.csv"] = CONTEUDO
+    servidor.truncar = 150 * 1024
+    resultado = _downloader(servidor, tmp_path).baixar("ensaios")
+
+    assert resultado["status"] == "retomado"
+    assert (tmp_path / "raw" / "ensaios.csv").read_bytes() == CONTEUDO
+    # A segunda tentativa pediu só o que faltava, condicionada ao mesmo ETag
+    primeira, segunda = _arquivos(servidor)
+    inicio = int(segunda["Range"].split("=")[1].rstrip("-"))
+    assert "Range" not in primeira and 0 < inicio <= 150 * 1024
+    assert resultado["bytes"] == len(CONTEUDO) - inicio
+    assert not os.path.exists(tmp_path / "raw" / "ensaios.csv.part")
+
+
+def test_etag_inalterado_nao_regrava(servidor, tmp_path):
+    servidor.arquivos["ensaios.csv"] = CONTEUDO
+    baixador = _downloader(servidor, tmp_path)
+    assert baixador.baixar_todas()["status"].tolist() == ["baixado"]
+    destino = tmp_path / "raw" / "ensaios.csv"
+    modificado = destino.stat().st_mtime_ns
+
+    relatorio = baixador.baixar_todas()
+    assert relatorio["status"].tolist() == ["inalterado"]
+    assert relatorio["bytes"].tolist() == [0]
+    assert _arquivos(servidor)[-1]["If-None-Match"] == baixador.ler_manifesto()["ensaios"]["etag"]
+    assert destino.stat().st_mtime_ns == modificado
+
+
+def test_checksum_divergente_descarta_parcial(servidor, tmp_path, monkeypatch):
+    monkeypatch.setitem(downloader.DOWNLOAD_CONFIG, "tentativas", 1)
+    servidor.arquivos["ensaios.csv"] = CONTEUDO
+    resultado = _downloader(servidor, tmp_path, sha256="0" * 64).baixar("ensaios")
+
+    assert resultado["status"] == "erro" and "SHA-256" in resultado["erro"]
+    assert sorted(os.listdir(tmp_path / "raw")) == []
+
+
+def test_espelhos(servidor, tmp_path):
+    sha256 = hashlib.sha256(CONTEUDO).hexdigest()
+
+    # Diretório espelho: copia sem rede e confere o checksum
+    espelho = tmp_path / "espelho"
+    espelho.mkdir()
+    (espelho / "ensaios.csv").write_bytes(CONTEUDO)
+    resultado = _downloader(servidor, tmp_path, sha256, espelho_dir=str(espelho)).baixar("ensaios")
+    assert resultado["status"] == "espelho"
+    assert _arquivos(servidor) == []
+    assert _downloader(servidor, tmp_path, sha256, espelho_dir=str(espelho)).baixar("ensaios")["status"] == "inalterado"
+
+    # Servidor substituto: a URL da fonte é trocada por <espelho_url>/<arquivo>
+    servidor.arquivos["ensaios.csv"] = CONTEUDO
+    baixador = Downloader(
+        destino=str(tmp_path / "raw_url"), manifesto=str(tmp_path / "downloads.json"),
+        fontes={"ensaios": {"url": "http://origem.invalid/ensaios.csv", "arquivo": "ensaios.csv", "sha256": sha256}},
+        espelho_url=f"{_base(servidor)}/arquivos/",
+    )
+    assert baixador.baixar("ensaios")["status"] == "baixado"
+    assert (tmp_path / "raw_url" / "ensaios.csv").read_bytes() == CONTEUDO
@@ -0,0 +1,77 @@
+"""
+Testes da busca concorrente de dados ambientais (core/env_fetcher.py) contra o
+servidor HTTP local de tests/conftest.py.
+"""
+
+import time
+
+from core import env_fetcher
+from core.env_fetcher import BuscadorAmbiental, buscar_dados_ambientais
+
+
+LIMITES = {
+    "open_meteo": {"concorrencia": 4, "req_por_segundo": 100.0},
+    "nominatim_reverse": {"concorrencia": 1, "req_por_segundo": 100.0},
+}
+
+
+def _pontos(n: int) -> list:
+    return [(-20.0 + i * 0.01, -45.0 + i * 0.01) for i in range(n)]
+
+
+def _executar(buscador, pontos, incluir_nomes=False):
+    return env_fetcher._executar(buscador.buscar_lote(pontos, incluir_nomes))
+
+
+def test_clima_agrupado_em_requisicoes_de_100_pontos(servidor, cache):
+    pontos = _pontos(250)
+    buscador = BuscadorAmbiental(cache, LIMITES)
+    linhas = _executar(buscador, pontos)
+
+    tamanhos = sorted(len(p["latitude"].split(",")) for _, p, _ in servidor.requisicoes)
+    assert tamanhos == [50, 100, 100]
+    assert [linha["temperatura"] for linha in linhas] == [round(lat, 3) for lat, _ in pontos]
+
+    # Cada ponto ficou no cache individualmente: a segunda busca não vai à rede
+    servidor.requisicoes.clear()
+    segunda = BuscadorAmbiental(cache, LIMITES)
+    _executar(segunda, pontos)
+    assert servidor.requisicoes == []
+    assert segunda.contagem["cache"] == 250
+
+
+def test_retry_after_respeitado(servidor, cache, monkeypatch):
+    # Backoff exponencial bem maior que o Retry-After: só passa rápido se o cabeçalho for usado
+    monkeypatch.setitem(env_fetcher.ENV_FETCH_CONFIG, "espera_base", 30.0)
+    servidor.respostas_429 = 1
+    buscador = BuscadorAmbiental(cache, LIMITES)
+
+    inicio = time.monotonic()
+    linhas = _executar(buscador, _pontos(1))
+    decorrido = time.monotonic() - inicio
+
+    assert 1.0 <= decorrido < 5.0
+    assert buscador.contagem["tentativas_extras"] == 1
+    assert buscador.contagem["falhas"] == 0
+    assert linhas[0]["temperatura"] == -20.0
+
+
+def test_balde_de_fichas_limita_a_taxa(servidor, cache):
+    limites = {**LIMITES, "nominatim_reverse": {"concorrencia": 1, "req_por_segundo": 5.0}}
+    buscador = BuscadorAmbiental(cache, limites)
+    linhas = _executar(buscador, _pontos(6), incluir_nomes=True)
+
+    instantes = sorted(t for caminho, _, t in servidor.requisicoes if caminho == "/reverse")
+    assert len(instantes) == 6
+    # Rajada de 1 ficha a 5 req/s: 5 intervalos de ~0,2 s entre as 6 requisições
+    assert instantes[-1] - instantes[0] >= 0.9
+    assert all(linha["local"].startswith("Local ") for linha in linhas)
+
+
+def test_resposta_com_menos_pontos_nao_grava_cache(servidor, cache):
+    servidor.encurtar = True
+    resultado = buscar_dados_ambientais(_pontos(3), incluir_nomes=False, cache=cache)
+
+    assert resultado["temperatura"].isna().all()
+    for lat, lon in _pontos(3):
+        assert cache.consultar("open_meteo", lat, lon, env_fetcher.PARAMS_CLIMA)[1] == "ausente"
@@ -0,0 +1,44 @@
+"""
+Testes da montagem de GeoJSON (core/geo_layers.py).
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from core.geo_layers import camada_pontos, feature_collection
+from utils.constants import GEO_CONFIG
+
+
+def test_feature_collection_serializa_datas_e_nulos():
+    df = pd.DataFrame({
+        "latitude": [-23.5, -22.9],
+        "longitude": [-46.6, -43.2],
+        "coletado_em": pd.to_datetime(["2024-05-01 10:30", None]),
+        "temperatura": [21.23456, np.nan],
+    })
+    geojson = json.loads(json.dumps(feature_collection(df)))
+
+    primeira, segunda = (f["properties"] for f in geojson["features"])
+    assert primeira == {"coletado_em": "2024-05-01T10:30:00", "temperatura": 21.235}
+    assert segunda == {"coletado_em": None, "temperatura": None}
+
+
+def _contar_pontos(camada) -> int:
+    # Sem cluster a camada é o próprio GeoJson; com cluster, o GeoJson é filho do MarkerCluster
+    geojson = camada if hasattr(camada, "data") else next(iter(camada._children.values()))
+    return len(geojson.data["features"])
+
+
+def test_cluster_recebe_todos_os_pontos(monkeypatch):
+    monkeypatch.setitem(GEO_CONFIG, "max_pontos", 10)
+    # 200 pontos num raio de poucos metros: no zoom 4 caem todos na mesma célula de tela
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "latitude": -23.5 + rng.uniform(0, 1e-4, 200),
+        "longitude": -46.6 + rng.uniform(0, 1e-4, 200),
+    })
+
+    assert _contar_pontos(camada_pontos(df, {}, zoom=4, cluster=True)) == 200
+    assert _contar_pontos(camada_pontos(df, {}, zoom=4, cluster=False)) == 1
@@ -0,0 +1,33 @@
+"""
+Testes da heurística de degradação (core/heuristic_predictor.py).
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.heuristic_predictor import COLUNAS_CENARIO, estimar_tempo_degradacao, main
+
+
+def test_condicao_ausente_conta_como_desfavoravel():
+    tempos = estimar_tempo_degradacao("PET", "Aspergillus niger", np.array([np.nan, 0.0]))
+    assert tempos[0] == tempos[1]
+
+
+def test_cli_com_e_sem_blocos_da_mesmo_resultado(tmp_path):
+    entrada = tmp_path / "cenarios.csv"
+    pd.DataFrame(
+        [
+            ["PS (Poliestireno)", "Trichoderma reesei", None, None, None],
+            ["PET (Polietileno tereftalato)", "Aspergillus niger", "Sim", "Não", 1],
+            ["PP (Polipropileno)", "Penicillium chrysogenum", "Não", None, 0],
+        ],
+        columns=COLUNAS_CENARIO,
+    ).to_csv(entrada, index=False)
+
+    inteiro, em_blocos = tmp_path / "inteiro.csv", tmp_path / "blocos.csv"
+    assert main([str(entrada), "-o", str(inteiro)]) == 0
+    assert main([str(entrada), "-o", str(em_blocos), "--chunksize", "1"]) == 0
+
+    esperado, obtido = pd.read_csv(inteiro), pd.read_csv(em_blocos)
+    assert list(esperado["tempo_estimado"]) == list(obtido["tempo_estimado"])
+    assert list(esperado["nivel"]) == list(obtido["nivel"])
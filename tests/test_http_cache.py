@@ -0,0 +1,108 @@
+"""
+Testes do cache HTTP persistente (core/http_cache.py): estados fresco/velho/expirado,
+coalescência de requisições simultâneas, revalidação única por chave e arredondamento
+das coordenadas.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from core.http_cache import idade_clima
+
+PARAMS = {"format": "jsonv2"}
+
+
+def _envelhecer(cache, segundos: float):
+    with cache._conexao() as conn:
+        conn.execute("UPDATE respostas SET armazenado_em = armazenado_em - ?", (segundos,))
+
+
+def _reversas(servidor) -> list:
+    return [params for caminho, params, _ in servidor.requisicoes if caminho == "/reverse"]
+
+
+def test_coordenadas_arredondadas_compartilham_a_chave(servidor, cache):
+    primeira = cache.buscar_json("nominatim_reverse", -23.55052, -46.63331, PARAMS)
+    segunda = cache.buscar_json("nominatim_reverse", -23.5508, -46.6326, PARAMS)
+
+    assert primeira == segunda
+    assert len(_reversas(servidor)) == 1
+    # A requisição usa as coordenadas arredondadas, válidas para toda a chave
+    assert _reversas(servidor)[0]["lat"] == "-23.551"
+    assert _reversas(servidor)[0]["lon"] == "-46.633"
+    assert cache.consultar("nominatim_reverse", -23.551, -46.633, PARAMS)[1] == "fresco"
+
+
+def test_estados_pela_idade(servidor, cache):
+    ttl = cache.endpoints["nominatim_reverse"]["ttl"]
+    stale = cache.endpoints["nominatim_reverse"]["stale"]
+    assert cache.consultar("nominatim_reverse", 1.0, 2.0, PARAMS) == (None, "ausente")
+
+    dados = cache.atualizar("nominatim_reverse", 1.0, 2.0, PARAMS)
+    assert cache.consultar("nominatim_reverse", 1.0, 2.0, PARAMS) == (dados, "fresco")
+
+    _envelhecer(cache, ttl + 1)
+    assert cache.consultar("nominatim_reverse", 1.0, 2.0, PARAMS) == (dados, "velho")
+
+    _envelhecer(cache, stale)
+    assert cache.consultar("nominatim_reverse", 1.0, 2.0, PARAMS) == (dados, "expirado")
+    assert cache.limpar_expirados() == 1
+    assert cache.consultar("nominatim_reverse", 1.0, 2.0, PARAMS) == (None, "ausente")
+
+
+def test_resposta_velha_servida_e_revalidada_em_segundo_plano(servidor, cache):
+    cache.atualizar("nominatim_reverse", 1.0, 2.0, PARAMS)
+    _envelhecer(cache, cache.endpoints["nominatim_reverse"]["ttl"] + 1)
+    servidor.atraso = 0.3
+
+    inicio = time.monotonic()
+    dados = cache.buscar_json("nominatim_reverse", 1.0, 2.0, PARAMS)
+    assert time.monotonic() - inicio < 0.3   # não esperou pela rede
+    assert dados["display_name"].startswith("Local ")
+    assert cache.estatisticas["velhos"] == 1
+
+    limite = time.monotonic() + 5
+    while cache.consultar("nominatim_reverse", 1.0, 2.0, PARAMS)[1] != "fresco" and time.monotonic() < limite:
+        time.sleep(0.05)
+    assert cache.consultar("nominatim_reverse", 1.0, 2.0, PARAMS)[1] == "fresco"
+    assert len(_reversas(servidor)) == 2
+
+
+def test_acertos_velhos_repetidos_revalidam_uma_vez(servidor, cache):
+    cache.atualizar("nominatim_reverse", 1.0, 2.0, PARAMS)
+    _envelhecer(cache, cache.endpoints["nominatim_reverse"]["ttl"] + 1)
+    servidor.atraso = 0.3
+
+    # Três pontos próximos (mesma chave) e a mesma consulta repetida durante a revalidação
+    for lat in (1.0, 1.0001, 0.9999) * 10:
+        assert cache.buscar_json("nominatim_reverse", lat, 2.0, PARAMS) is not None
+    assert cache.estatisticas["velhos"] == 30
+
+    cache._revalidador.shutdown(wait=True)   # espera tudo o que foi enfileirado
+    assert len(_reversas(servidor)) == 2
+    assert cache.consultar("nominatim_reverse", 1.0, 2.0, PARAMS)[1] == "fresco"
+
+
+def test_requisicoes_simultaneas_coalescidas(servidor, cache):
+    servidor.atraso = 0.5
+    resultados = []
+
+    def consultar():
+        resultados.append(cache.atualizar("nominatim_reverse", 5.0, 6.0, PARAMS))
+
+    threads = [threading.Thread(target=consultar) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(_reversas(servidor)) == 1
+    assert cache.estatisticas["coalescidos"] == 7
+    assert len(resultados) == 8 and all(r == resultados[0] for r in resultados)
+
+
+def test_idade_da_leitura_de_clima():
+    leitura = (datetime.now(timezone.utc) - timedelta(hours=2)).strftime("%Y-%m-%dT%H:%M")
+    assert 7000 < idade_clima({"time": leitura}) < 7300
+    assert idade_clima({}) is None
@@ -0,0 +1,25 @@
+"""
+Testes das miniaturas (utils/image_pipeline.py).
+"""
+
+import pytest
+from PIL import Image
+
+from utils import image_pipeline
+from utils.image_pipeline import miniatura
+
+
+@pytest.mark.parametrize("modo", ["1", "P"])
+def test_imagens_de_paleta_e_1_bit_suavizadas(tmp_path, monkeypatch, modo):
+    monkeypatch.setitem(image_pipeline.IMAGE_CONFIG, "dir_miniaturas", str(tmp_path / "miniaturas"))
+    # Listras pretas e brancas de 1 px: reduzidas com filtro, viram tons de cinza
+    original = Image.new("L", (200, 100))
+    original.putdata([255 * (x % 2) for _ in range(100) for x in range(200)])
+    caminho = tmp_path / f"listras_{modo}.png"
+    original.convert(modo).save(caminho)
+
+    with Image.open(miniatura(str(caminho), 50, "PNG")) as gerada:
+        assert gerada.size == (50, 25)
+        assert gerada.mode == "RGB"
+        minimo, maximo = gerada.getchannel("R").getextrema()
+    assert 60 < minimo and maximo < 200
@@ -0,0 +1,55 @@
+"""
+Testes de persistência do MLModel (core/ml_model.py).
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.ml_model import MLModel
+from utils.constants import EXPLAIN_CONFIG
+
+
+def _dados(n: int = 60) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    temperatura = rng.uniform(10, 40, n)
+    return pd.DataFrame({
+        "temperatura": temperatura,
+        "plastico": rng.choice(["PET", "PP", "PS"], n),
+        "nivel": np.where(temperatura > 25, "rapido", "lento"),
+    })
+
+
+def test_modelo_sem_meta_carrega_features_do_scaler(tmp_path):
+    df = _dados()
+    treinado = MLModel(str(tmp_path))
+    assert treinado.train(df, "nivel") is not None
+    esperado = treinado.predict(df.drop(columns=["nivel"]))
+
+    os.remove(tmp_path / "meta.pkl")
+    carregado = MLModel(str(tmp_path))
+    obtido = carregado.predict(df.drop(columns=["nivel"]))
+
+    assert carregado.feature_names == treinado.feature_names
+    assert carregado.versao == treinado.versao
+    assert carregado.snapshot is None
+    assert list(obtido) == list(esperado)
+
+
+def test_explicacao_segue_a_ordem_das_linhas(tmp_path, monkeypatch):
+    df = _dados()
+    modelo = MLModel(str(tmp_path))
+    modelo.train(df, "nivel")
+    entrada = df.drop(columns=["nivel"]).head(5)
+    invertida = entrada.iloc[::-1].reset_index(drop=True)
+
+    direta = modelo.explicar(entrada.reset_index(drop=True))["contribuicoes"]
+    reversa = modelo.explicar(invertida)["contribuicoes"]
+    np.testing.assert_allclose(reversa, direta[::-1])
+
+    # O cache de explicações é limitado
+    monkeypatch.setitem(EXPLAIN_CONFIG, "max_explicacoes", 2)
+    for i in range(4):
+        modelo.explicar(entrada.iloc[[i]])
+    assert len(modelo._explicacoes) == 2
@@ -0,0 +1,84 @@
+"""
+Testes do executor de pipelines em grafo (core/pipeline_runner.py).
+"""
+
+import pytest
+
+from core.pipeline_runner import Pipeline
+
+
+def _status(relatorio) -> dict:
+    return dict(zip(relatorio["etapa"], relatorio["status"]))
+
+
+def _pipeline(tmp_path) -> Pipeline:
+    """
+    bruto/*.csv → limpar (um arquivo por entrada) → limpo/*.csv → juntar → final.csv
+    """
+    bruto, limpo = tmp_path / "bruto", tmp_path / "limpo"
+    bruto.mkdir()
+    (bruto / "a.csv").write_text("x\n1\n2\n")
+    pipeline = Pipeline("teste", caminho_estado=str(tmp_path / "estado.json"), workers=2)
+
+    @pipeline.etapa(entradas=[str(bruto / "*.csv")], saidas=[str(limpo / "a.csv")])
+    def limpar(arquivo):
+        limpo.mkdir(exist_ok=True)
+        (limpo / "a.csv").write_text(open(arquivo).read().strip() + "\n")
+        return 2
+
+    @pipeline.etapa(entradas=[str(limpo / "*.csv")], saidas=[str(tmp_path / "final.csv")])
+    def juntar(*arquivos):
+        (tmp_path / "final.csv").write_text("".join(open(a).read() for a in arquivos))
+        return 2
+
+    return pipeline
+
+
+def test_reexecucao_sem_dados_novos_nao_faz_nada(tmp_path):
+    pipeline = _pipeline(tmp_path)
+    assert _status(pipeline.executar()) == {"limpar": "executada", "juntar": "executada"}
+    final = (tmp_path / "final.csv").stat().st_mtime_ns
+
+    assert _status(pipeline.executar()) == {"limpar": "pulada", "juntar": "pulada"}
+    assert (tmp_path / "final.csv").stat().st_mtime_ns == final
+
+    # Nova entrada: as duas etapas voltam a rodar
+    (tmp_path / "bruto" / "a.csv").write_text("x\n1\n2\n3\n")
+    assert _status(pipeline.executar()) == {"limpar": "executada", "juntar": "executada"}
+
+
+def test_padrao_glob_depende_do_produtor_da_saida(tmp_path):
+    # limpo/a.csv ainda não existe: a dependência vem só da saída declarada por `limpar`
+    pipeline = _pipeline(tmp_path)
+    assert pipeline.dependencias() == {"limpar": [], "juntar": ["limpar"]}
+    assert pipeline.niveis() == [["limpar"], ["juntar"]]
+
+
+def test_falha_bloqueia_as_etapas_seguintes(tmp_path):
+    pipeline = Pipeline("falha", caminho_estado=str(tmp_path / "estado.json"))
+
+    @pipeline.etapa(saidas=[str(tmp_path / "a.txt")])
+    def origem():
+        raise RuntimeError("fonte indisponível")
+
+    @pipeline.etapa(entradas=[str(tmp_path / "a.txt")], saidas=[str(tmp_path / "b.txt")])
+    def meio(a):
+        (tmp_path / "b.txt").write_text("b")
+
+    @pipeline.etapa(entradas=[str(tmp_path / "b.txt")], saidas=[str(tmp_path / "c.txt")])
+    def fim(b):
+        (tmp_path / "c.txt").write_text("c")
+
+    relatorio = pipeline.executar()
+    assert _status(relatorio) == {"origem": "erro", "meio": "bloqueada", "fim": "bloqueada"}
+    assert "fonte indisponível" in relatorio.set_index("etapa").loc["origem", "erro"]
+    assert not (tmp_path / "b.txt").exists()
+
+
+def test_ciclo_detectado(tmp_path):
+    pipeline = Pipeline("ciclo", caminho_estado=str(tmp_path / "estado.json"))
+    pipeline.etapa("ida", entradas=[str(tmp_path / "b.txt")], saidas=[str(tmp_path / "a.txt")])(lambda b: None)
+    pipeline.etapa("volta", entradas=[str(tmp_path / "a.txt")], saidas=[str(tmp_path / "b.txt")])(lambda a: None)
+
+    with pytest.raises(ValueError, match="Ciclo"):
+        pipeline.niveis()
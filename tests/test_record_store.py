@@ -0,0 +1,64 @@
+"""
+Testes da deduplicação por nome científico (core/record_store.py e core/bulk_import.py)
+e da migração dos arquivos JSON legados.
+"""
+
+import json
+import os
+import sqlite3
+
+import pandas as pd
+
+from core.bulk_import import validar
+from core.record_store import RecordStore
+from utils.constants import DB_TABLES
+
+
+def test_nomes_nao_ascii_deduplicados_como_no_arquivo(tmp_path):
+    store = RecordStore(str(tmp_path / "cadastros.db"))
+    store.inserir("fungos", {"nome_cientifico": "Émericella NIDULANS"})
+
+    arquivo = pd.DataFrame({"nome_cientifico": ["émericella nidulans", "ÉMERICELLA Nidulans", "Aspergillus niger"]})
+    partes = validar(arquivo, "fungos", store.nomes_existentes("fungos"))
+
+    assert len(partes["ja_cadastrados"]) == 1
+    assert len(partes["duplicados_arquivo"]) == 1
+    assert partes["validos"]["nome_cientifico"].tolist() == ["Aspergillus niger"]
+    assert len(store.buscar_por_nome("fungos", " émericella nidulans ")) == 1
+
+
+def test_banco_antigo_ganha_coluna_de_chave(tmp_path):
+    caminho = str(tmp_path / "antigo.db")
+    with sqlite3.connect(caminho) as conn:
+        for tabela in DB_TABLES.values():
+            conn.execute(f"""
+                CREATE TABLE {tabela} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, nome_cientifico TEXT,
+                    dados TEXT NOT NULL, criado_em REAL NOT NULL
+                )
+            """)
+        conn.execute(f"INSERT INTO {DB_TABLES['fungos']} (nome_cientifico, dados, criado_em) "
+                     "VALUES ('Ünculina Test', '{\"nome_cientifico\": \"Ünculina Test\"}', 0)")
+
+    store = RecordStore(caminho)
+
+    assert store.nomes_existentes("fungos") == {"ünculina test"}
+    assert store.buscar_por_nome("fungos", "ÜNCULINA TEST") == [{"nome_cientifico": "Ünculina Test"}]
+
+
+def test_migracao_interrompida_retomada_sem_duplicar(tmp_path):
+    legado = tmp_path / "fungos.json"
+    registros = [{"nome_cientifico": "Aspergillus niger"}, {"nome_cientifico": "Penicillium sp."}]
+    store = RecordStore(str(tmp_path / "cadastros.db"))
+
+    # Processo interrompido logo depois de renomear o arquivo
+    (tmp_path / "fungos.json.migrando").write_text(json.dumps(registros), encoding="utf-8")
+    assert store.migrar_json("fungos", str(legado)) == 2
+    assert (tmp_path / "fungos.json.migrado").exists()
+    assert not (tmp_path / "fungos.json.migrando").exists()
+
+    # Interrompido depois do commit e antes de renomear: só conclui a renomeação
+    os.replace(tmp_path / "fungos.json.migrado", tmp_path / "fungos.json.migrando")
+    assert RecordStore(str(tmp_path / "cadastros.db")).migrar_json("fungos", str(legado)) == 0
+    assert store.contar("fungos") == 2
+    assert (tmp_path / "fungos.json.migrado").exists()
@@ -0,0 +1,44 @@
+"""
+Testes do otimizador de cenários (core/scenario_optimizer.py) com e sem MLModel compatível.
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.heuristic_predictor import FATORES_AMBIENTE
+from core.ml_model import MLModel
+from core.scenario_optimizer import montar_grade, otimizar_cenarios
+
+
+def _treinar(tmp_path, df: pd.DataFrame, alvo: str) -> MLModel:
+    modelo = MLModel(str(tmp_path))
+    assert modelo.train(df, alvo) is not None
+    return MLModel(str(tmp_path))
+
+
+def test_modelo_com_outras_features_fica_fora_do_ranking(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"ph": rng.uniform(4, 9, 60), "oxigenio": rng.uniform(2, 10, 60)})
+    df["eficiencia"] = (df["ph"] > 6.5).astype(int)
+    modelo = _treinar(tmp_path, df, "eficiencia")
+
+    ranking = otimizar_cenarios(modelo, top_k=2, peso_modelo=1.0)
+
+    assert not ranking.empty
+    assert ranking["score_modelo"].isna().all()
+    assert (ranking.groupby("plastico")["ranking"].max() == 2).all()
+
+
+def test_modelo_compativel_pontua_cenarios_de_uma_linha(tmp_path):
+    grade = montar_grade().astype({"plastico": str, "fungo": str})
+    grade["eficiencia"] = grade["temperatura_ideal"].astype(int) + (grade["fungo"] == grade["fungo"].iloc[-1])
+    modelo = _treinar(tmp_path, grade, "eficiencia")
+
+    # Uma linha isolada mantém a dummy da sua categoria (não é descartada por drop_first)
+    linha = grade.drop(columns=["eficiencia"]).iloc[[-1]]
+    assert modelo.cobertura_features(linha) >= 0.5
+    assert modelo.predict(linha)[0] == grade["eficiencia"].iloc[-1]
+
+    ranking = otimizar_cenarios(modelo, top_k=1, peso_modelo=1.0)
+    assert ranking["score_modelo"].notna().all()
+    assert ranking[list(FATORES_AMBIENTE)[0]].all()
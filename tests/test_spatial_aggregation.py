@@ -0,0 +1,24 @@
+"""
+Testes da agregação espacial para heatmaps (core/spatial_aggregation.py).
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.spatial_aggregation import celulas_zoom
+
+
+def test_nivel_acompanha_o_zoom_do_mapa():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "latitude": rng.uniform(-24.0, -23.0, 500),
+        "longitude": rng.uniform(-47.0, -46.0, 500),
+        "microplasticos": rng.uniform(0, 10, 500),
+    })
+
+    contagens = [len(celulas_zoom(df, z, coluna_valor="microplasticos")) for z in (2, 6, 10)]
+    # Aproximar divide a região em mais células; todas somam os mesmos 500 pontos
+    assert contagens[0] < contagens[1] < contagens[2]
+    assert celulas_zoom(df, 10, coluna_valor="microplasticos")["contagem"].sum() == 500
+    # Fora do intervalo da pirâmide, usa o nível mais próximo
+    pd.testing.assert_frame_equal(celulas_zoom(df, 30), celulas_zoom(df, 12))
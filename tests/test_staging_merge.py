@@ -0,0 +1,85 @@
+"""
+Testes da junção dos arquivos brutos em staging (core/staging_merge.py).
+"""
+
+import json
+
+import pandas as pd
+
+from core import staging_merge
+from core.staging_merge import caminho_esquema, ler_staging, mesclar_staging
+
+
+def _escrever(caminho, texto: str) -> str:
+    caminho.write_text(texto.strip() + "\n", encoding="utf-8")
+    return str(caminho)
+
+
+def _arquivos(tmp_path) -> list:
+    return [
+        _escrever(tmp_path / "ensaios.csv", """
+Organism,Plastic,Year,degradation_rate
+Aspergillus niger,PET,2020,0.8
+Penicillium sp.,PP,2021,0.5
+,PET,2021,0.4
+Trichoderma reesei,PS,2019,0.3
+"""),
+        # Chave com espaços e maiúsculas diferentes; linha sem ensaio correspondente (PE)
+        _escrever(tmp_path / "polimeros.csv", """
+Polymer,densidade,familia
+ pet ,1.38,poliéster
+PP,0.90,poliolefina
+PE,0.94,poliolefina
+"""),
+        # Auxiliar declarada por ano (STAGING_MERGE_CONFIG["fontes"]), com ano repetido
+        _escrever(tmp_path / "env_conditions.csv", """
+Year,temperature
+2020,21.0
+2020,23.0
+2021,25.0
+"""),
+    ]
+
+
+def test_juncao_por_chaves_gera_tabela_densa(tmp_path):
+    destino = str(tmp_path / "staging.csv")
+    assert mesclar_staging(_arquivos(tmp_path), destino) == 3
+
+    df = ler_staging(destino).set_index("fungus_name")
+    # Só linhas reais de ensaio: o polímero sem ensaio e o ensaio sem fungo ficam de fora
+    assert list(df.index) == ["Aspergillus niger", "Penicillium sp.", "Trichoderma reesei"]
+    assert df.loc["Aspergillus niger", "polimeros_densidade"] == 1.38
+    assert df.loc["Penicillium sp.", "polimeros_familia"] == "poliolefina"
+    assert df.loc["Aspergillus niger", "env_conditions_temperature"] == 22.0
+    assert df.loc["Penicillium sp.", "env_conditions_temperature"] == 25.0
+    assert pd.isna(df.loc["Trichoderma reesei", "polimeros_densidade"])
+
+
+def test_esquema_ao_lado_do_csv(tmp_path):
+    destino = str(tmp_path / "staging.csv")
+    mesclar_staging(_arquivos(tmp_path), destino)
+
+    with open(caminho_esquema(destino), encoding="utf-8") as f:
+        esquema = json.load(f)
+    assert esquema["linhas"] == 3 and esquema["descartadas"] == 1
+    assert sorted(esquema["auxiliares"]) == ["env_conditions", "polimeros"]
+    assert esquema["colunas"]["year"] == "Int64"
+    assert esquema["colunas"]["degradation_rate"] == "float64"
+    assert esquema["colunas"]["polimeros_familia"] == "category"
+    assert ler_staging(destino)["plastic_type"].dtype == "category"
+
+
+def test_texto_em_bloco_posterior_alarga_a_coluna(tmp_path, monkeypatch):
+    monkeypatch.setitem(staging_merge.STAGING_MERGE_CONFIG, "linhas_por_bloco", 2)
+    ensaios = _escrever(tmp_path / "ensaios.csv", """
+fungus_name,plastic_type,degradation_rate
+A,PET,0.8
+B,PP,0.5
+C,PS,n/d
+""")
+    destino = str(tmp_path / "staging.csv")
+    assert mesclar_staging([ensaios], destino) == 3
+
+    df = ler_staging(destino)
+    assert df["degradation_rate"].dtype == "category"
+    assert df["degradation_rate"].astype(str).tolist() == ["0.8", "0.5", "n/d"]
@@ -0,0 +1,23 @@
+"""
+Testes da escolha da URL de tiles (core/tile_cache.py).
+"""
+
+from core import tile_cache
+
+
+def test_url_de_origem_por_padrao(monkeypatch):
+    monkeypatch.setitem(tile_cache.TILE_CONFIG, "servidor_local", False)
+    iniciado = []
+    monkeypatch.setattr(tile_cache, "iniciar_servidor", lambda *a, **k: iniciado.append(1))
+
+    url = tile_cache.url_tiles("carto_dark")
+
+    assert url == "https://a.basemaps.cartocdn.com/dark_all/{z}/{x}/{y}.png"
+    assert iniciado == []
+
+
+def test_servidor_local_opcional(monkeypatch):
+    monkeypatch.setitem(tile_cache.TILE_CONFIG, "servidor_local", True)
+    monkeypatch.setattr(tile_cache, "iniciar_servidor", lambda *a, **k: "http://127.0.0.1:9999")
+
+    assert tile_cache.url_tiles("carto_dark") == "http://127.0.0.1:9999/carto_dark/{z}/{x}/{y}.png"
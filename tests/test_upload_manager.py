@@ -0,0 +1,71 @@
+"""
+Testes do recebimento de uploads (core/upload_manager.py).
+"""
+
+import io
+
+from core import upload_manager
+from core.dataset_snapshots import RepositorioSnapshots
+from core.upload_manager import _carregar_por_hash, receber_upload, uso_total
+from utils.constants import SNAPSHOT_CONFIG
+
+
+class _Fluxo(io.RawIOBase):
+    """Fluxo não relível (como um corpo de requisição): força a gravação no temporário."""
+
+    def __init__(self, dados: bytes):
+        self._dados = io.BytesIO(dados)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+    def read(self, n=-1):
+        return self._dados.read(n)
+
+
+def test_upload_no_limite_da_quota_nao_conta_o_temporario(tmp_path, monkeypatch):
+    monkeypatch.setitem(upload_manager.UPLOAD_CONFIG, "quota_total_mb", 1)
+    (tmp_path / "ja_guardado.bin").write_bytes(b"x" * (600 * 1024))
+
+    info = receber_upload(_Fluxo(b"y" * (400 * 1024)), "novo.csv", str(tmp_path))
+
+    assert info["novo"]
+    assert uso_total(str(tmp_path)) == 1000 * 1024
+    assert not [p for p in tmp_path.rglob(".upload-*")]
+
+
+def test_falha_de_leitura_nao_fica_no_cache(tmp_path):
+    caminho = tmp_path / "ab" / "abc.csv"
+    caminho.parent.mkdir()
+    caminho.write_text("")   # ilegível para o pandas
+
+    _carregar_por_hash.limpar()
+    try:
+        _carregar_por_hash(str(caminho))
+    except ValueError:
+        pass
+    caminho.write_text("a,b\n1,2\n")   # mesmo caminho (mesmo hash na prática), agora legível
+
+    assert len(_carregar_por_hash(str(caminho))) == 1
+
+
+def test_upload_registra_versao_do_dataset(tmp_path, monkeypatch):
+    monkeypatch.setitem(upload_manager.UPLOAD_CONFIG, "dir", str(tmp_path / "uploads"))
+    monkeypatch.setitem(SNAPSHOT_CONFIG, "dir", str(tmp_path / "snapshots"))
+
+    def enviar(conteudo: bytes):
+        arquivo = io.BytesIO(conteudo)
+        arquivo.name = "ensaios campo.csv"
+        return upload_manager.carregar_upload(arquivo)
+
+    df, info = enviar(b"fungo,taxa\nA,0.1\nB,0.2\n")
+    assert len(df) == 2
+    assert info["snapshot"]["dataset"] == "upload_ensaios_campo"
+    assert info["snapshot"]["numero"] == 1
+
+    _, info = enviar(b"fungo,taxa\nA,0.1\nB,0.2\nC,0.3\n")
+    assert info["snapshot"]["numero"] == 2
+    assert RepositorioSnapshots().info("upload_ensaios_campo")["id"] == info["snapshot"]["id"]
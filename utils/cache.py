@@ -0,0 +1,318 @@
+"""
+Módulo: cache.py
+Descrição: Cache central em memória compartilhado entre execuções (reruns) do Streamlit.
+           Decorators tipados para dados, figuras e recursos, com TTL, chaves por hash
+           de conteúdo, teto de memória com eviction LRU e estatísticas de acerto.
+Autor: Samuel
+Data: 2025
+"""
+
+import copy
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from utils.constants import CACHE_CONFIG
+from utils.logger import registrar_evento
+
+# =============================================================================
+# 🔑 Hash de conteúdo
+# =============================================================================
+
+def _modulo_carregado(nome: str):
+    """
+    pandas/numpy só são consultados se já tiverem sido importados por alguém:
+    um valor não pode ser DataFrame se o pandas nem foi carregado. Assim o cache
+    não pesa na inicialização das páginas leves.
+    """
+    return sys.modules.get(nome)
+
+
+def _eh_pandas(valor) -> bool:
+    pd = _modulo_carregado("pandas")
+    return pd is not None and isinstance(valor, (pd.DataFrame, pd.Series))
+
+
+def _eh_ndarray(valor) -> bool:
+    np = _modulo_carregado("numpy")
+    return np is not None and isinstance(valor, np.ndarray)
+
+
+# caminho -> (mtime, tamanho, hash): evita reler arquivos que não mudaram
+_hash_arquivos = {}
+
+
+def hash_arquivo(caminho: str) -> str:
+    """
+    SHA-256 do conteúdo do arquivo, recalculado só quando mtime/tamanho mudam.
+    """
+    info = os.stat(caminho)
+    assinatura = (info.st_mtime_ns, info.st_size)
+    em_cache = _hash_arquivos.get(caminho)
+    if em_cache and em_cache[:2] == assinatura:
+        return em_cache[2]
+
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    _hash_arquivos[caminho] = (*assinatura, h.hexdigest())
+    return h.hexdigest()
+
+
+def hash_conteudo(valor) -> str:
+    """
+    Hash estável de um valor de argumento (DataFrames e arrays pelo conteúdo).
+    """
+    h = hashlib.blake2b(digest_size=16)
+    if _eh_pandas(valor):
+        pd = sys.modules["pandas"]
+        h.update(pd.util.hash_pandas_object(valor, index=True).to_numpy().tobytes())
+        rotulos = valor.columns if valor.ndim == 2 else [valor.name]
+        h.update(repr(list(rotulos)).encode())
+    elif _eh_ndarray(valor):
+        h.update(str((valor.dtype, valor.shape)).encode())
+        h.update(sys.modules["numpy"].ascontiguousarray(valor).tobytes())
+    elif isinstance(valor, bytes):
+        h.update(valor)
+    else:
+        try:
+            h.update(pickle.dumps(valor, protocol=4))
+        except Exception:
+            h.update(repr(valor).encode())
+    return h.hexdigest()
+
+
+# Figuras sem serialização barata: entram no teto com custo fixo (CACHE_CONFIG["custo_figura_kb"])
+_MODULOS_FIGURA = {"matplotlib", "folium", "branca", "leafmap"}
+
+
+def _tamanho_figura(valor):
+    """
+    Plotly pelo tamanho do JSON (o que a página envia ao navegador); matplotlib e
+    folium por um custo fixo. None se o valor não é uma figura conhecida.
+    """
+    modulo = type(valor).__module__.split(".")[0]
+    if modulo == "plotly":
+        try:
+            return len(valor.to_json())
+        except Exception:
+            return int(CACHE_CONFIG["custo_figura_kb"] * 1024)
+    if modulo in _MODULOS_FIGURA:
+        return int(CACHE_CONFIG["custo_figura_kb"] * 1024)
+    return None
+
+
+def _tamanho_estimado(valor) -> int:
+    """
+    Estimativa do tamanho em memória (bytes) usada pelo teto de memória. Figuras não
+    são serializadas com pickle (lento e, para mapas folium, do tamanho da página).
+    """
+    figura = _tamanho_figura(valor)
+    if figura is not None:
+        return figura
+    if _eh_pandas(valor):
+        uso = valor.memory_usage(deep=True)
+        return int(uso.sum() if hasattr(uso, "sum") else uso)
+    if _eh_ndarray(valor):
+        return valor.nbytes
+    if isinstance(valor, (bytes, bytearray, str)):
+        return len(valor)
+    try:
+        return len(pickle.dumps(valor, protocol=4))
+    except Exception:
+        return sys.getsizeof(valor)
+
+
+# =============================================================================
+# 🗄️ Armazenamento LRU com TTL e teto de memória
+# =============================================================================
+
+class _Entrada:
+    __slots__ = ("valor", "expira_em", "tamanho", "funcao")
+
+    def __init__(self, valor, expira_em, tamanho, funcao):
+        self.valor = valor
+        self.expira_em = expira_em
+        self.tamanho = tamanho
+        self.funcao = funcao
+
+
+class _CacheLRU:
+    """
+    Um único armazenamento para todos os decorators, para que o teto de memória
+    seja global. Seguro para as threads de sessão do Streamlit.
+    """
+
+    def __init__(self, memoria_max_bytes: int):
+        self.memoria_max = memoria_max_bytes
+        self.memoria_usada = 0
+        self._entradas = OrderedDict()
+        self._lock = threading.RLock()
+        self.estatisticas = {}  # nome da função -> contadores
+
+    def _contar(self, funcao: str, tipo: str, campo: str):
+        stats = self.estatisticas.setdefault(
+            funcao, {"tipo": tipo, "hits": 0, "misses": 0, "expirados": 0, "evictions": 0}
+        )
+        stats[campo] += 1
+
+    def obter(self, chave, funcao: str, tipo: str):
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None and entrada.expira_em is not None and entrada.expira_em < time.monotonic():
+                self._remover(chave)
+                self._contar(funcao, tipo, "expirados")
+                entrada = None
+            if entrada is None:
+                self._contar(funcao, tipo, "misses")
+                return False, None
+            self._entradas.move_to_end(chave)
+            self._contar(funcao, tipo, "hits")
+            return True, entrada.valor
+
+    def guardar(self, chave, valor, ttl, funcao: str, tipo: str):
+        tamanho = _tamanho_estimado(valor)
+        if tamanho > self.memoria_max:
+            registrar_evento(f"Cache: valor de {funcao} ({tamanho} bytes) excede o teto e não foi guardado.", "warning")
+            return
+        with self._lock:
+            if chave in self._entradas:
+                self._remover(chave)
+            expira_em = time.monotonic() + ttl if ttl else None
+            self._entradas[chave] = _Entrada(valor, expira_em, tamanho, funcao)
+            self.memoria_usada += tamanho
+            while self.memoria_usada > self.memoria_max:
+                chave_antiga, antiga = next(iter(self._entradas.items()))
+                self._remover(chave_antiga)
+                self._contar(antiga.funcao, self.estatisticas[antiga.funcao]["tipo"], "evictions")
+
+    def _remover(self, chave):
+        entrada = self._entradas.pop(chave)
+        self.memoria_usada -= entrada.tamanho
+
+    def limpar(self, funcao: str = None):
+        with self._lock:
+            for chave in [c for c, e in self._entradas.items() if funcao is None or e.funcao == funcao]:
+                self._remover(chave)
+
+    def resumo(self) -> list:
+        with self._lock:
+            por_funcao = {}
+            for entrada in self._entradas.values():
+                n, b = por_funcao.get(entrada.funcao, (0, 0))
+                por_funcao[entrada.funcao] = (n + 1, b + entrada.tamanho)
+
+            linhas = []
+            for funcao, stats in self.estatisticas.items():
+                n, b = por_funcao.get(funcao, (0, 0))
+                consultas = stats["hits"] + stats["misses"]
+                linhas.append({
+                    "funcao": funcao, **stats,
+                    "taxa_acerto": round(stats["hits"] / consultas, 3) if consultas else 0.0,
+                    "entradas": n, "memoria_kb": round(b / 1024, 1),
+                })
+            return sorted(linhas, key=lambda l: l["hits"] + l["misses"], reverse=True)
+
+
+_armazenamento = _CacheLRU(int(CACHE_CONFIG["memoria_max_mb"] * 1024 * 1024))
+
+
+# =============================================================================
+# 🎯 Decorators tipados
+# =============================================================================
+
+def _criar_decorator(tipo: str, ttl_padrao, copiar):
+    def decorator(func=None, *, ttl=ttl_padrao, arquivos=()):
+        """
+        `ttl` em segundos (None = sem expiração). `arquivos` lista os nomes de argumentos
+        que são caminhos de arquivo: a chave passa a incluir o hash do conteúdo, então
+        o cache é invalidado automaticamente quando o arquivo muda.
+        """
+        def envolver(f):
+            assinatura = inspect.signature(f)
+            nome = f"{f.__module__}.{f.__qualname__}"
+
+            @functools.wraps(f)
+            def wrapper(*args, **kwargs):
+                ligados = assinatura.bind(*args, **kwargs)
+                ligados.apply_defaults()
+                partes = [nome]
+                for arg, valor in ligados.arguments.items():
+                    if arg in arquivos and valor is not None and os.path.exists(valor):
+                        partes.append((arg, "arquivo", hash_arquivo(valor)))
+                    else:
+                        partes.append((arg, hash_conteudo(valor)))
+                chave = hash_conteudo(tuple(partes))
+
+                achou, valor = _armazenamento.obter(chave, nome, tipo)
+                if not achou:
+                    valor = f(*args, **kwargs)
+                    _armazenamento.guardar(chave, valor, ttl, nome, tipo)
+                return copiar(valor)
+
+            wrapper.limpar = lambda: _armazenamento.limpar(nome)
+            return wrapper
+
+        return envolver(func) if callable(func) else envolver
+
+    return decorator
+
+
+def _copia_dados(valor):
+    # Dados são devolvidos como cópia: a página pode modificá-los sem afetar o cache
+    if _eh_pandas(valor) or _eh_ndarray(valor):
+        return valor.copy()
+    if isinstance(valor, (list, dict, set)):
+        return copy.deepcopy(valor)
+    return valor
+
+
+cache_dados = _criar_decorator("dados", CACHE_CONFIG["ttl_dados"], _copia_dados)
+"""DataFrames, arrays e estruturas: devolve cópia a cada chamada."""
+
+cache_figura = _criar_decorator("figura", CACHE_CONFIG["ttl_figuras"], lambda v: v)
+"""Figuras plotly/matplotlib/folium: objeto compartilhado (não modificar após obter)."""
+
+cache_recurso = _criar_decorator("recurso", CACHE_CONFIG["ttl_recursos"], lambda v: v)
+"""Recursos compartilhados (imagens, modelos, conexões): mesmo objeto para todas as sessões."""
+
+
+# =============================================================================
+# 📊 Estatísticas e manutenção
+# =============================================================================
+
+def estatisticas_cache() -> list:
+    """
+    Hits, misses, expirações, evictions e memória por função cacheada.
+    """
+    return _armazenamento.resumo()
+
+
+def memoria_cache() -> dict:
+    return {
+        "usada_mb": round(_armazenamento.memoria_usada / 1024 / 1024, 2),
+        "limite_mb": round(_armazenamento.memoria_max / 1024 / 1024, 2),
+    }
+
+
+def limpar_cache():
+    """
+    Esvazia todos os caches (os contadores de estatística são mantidos).
+    """
+    _armazenamento.limpar()
+
+
+@cache_recurso(arquivos=("caminho",))
+def carregar_bytes(caminho: str) -> bytes:
+    """
+    Conteúdo de um arquivo estático (logo, fotos), lido uma vez por versão do arquivo.
+    """
+    with open(caminho, "rb") as f:
+        return f.read()
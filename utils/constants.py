@@ -14,6 +14,8 @@ DATA_DIR = os.path.join(BASE_DIR, "data")
 UPLOAD_DIR = os.path.join(DATA_DIR, "uploads")
 MODEL_DIR = os.path.join(BASE_DIR, "models")
 REPORT_DIR = os.path.join(BASE_DIR, "reports")
+MODEL_PATH = MODEL_DIR
+REPORTS_PATH = REPORT_DIR
 
 for path in [UPLOAD_DIR, MODEL_DIR, REPORT_DIR]:
     os.makedirs(path, exist_ok=True)
@@ -53,9 +55,255 @@ ML_CONFIG = {
     "target": "eficiencia_biodegradacao"
 }
 
+# Explicabilidade (importância por permutação e contribuições por árvore)
+EXPLAIN_CONFIG = {
+    "n_repeticoes": 10,
+    "n_processos": None,  # None = os.cpu_count()
+    "random_state": 42,
+    "max_explicacoes": 32,  # explicações por entrada guardadas em memória (LRU) por MLModel
+}
+
+# Otimizador de cenários: o MLModel só entra no ranking se a grade cobrir esta fração
+# das features do modelo (as ausentes seriam preenchidas com 0)
+SCENARIO_CONFIG = {
+    "cobertura_minima_modelo": 0.5,
+}
+
+# === CACHE ENTRE EXECUÇÕES DO STREAMLIT ======================================
+
+CACHE_CONFIG = {
+    "memoria_max_mb": 256,     # teto somado de todos os caches (eviction LRU)
+    "ttl_dados": 3600,         # segundos
+    "ttl_figuras": 3600,
+    "ttl_recursos": None,      # None = sem expiração
+    "custo_figura_kb": 512,    # tamanho estimado de figuras matplotlib/folium (não são serializadas)
+}
+
+# === PIPELINE DE IMAGENS ====================================================
+
+IMAGE_CONFIG = {
+    "dir_miniaturas": os.path.join(DATA_DIR, "cache", "miniaturas"),
+    "larguras": [120, 240, 480],   # px (240 = logo de 120 px em telas HiDPI)
+    "formato": "WEBP",             # PNG quando o Pillow não tem suporte a WebP
+    "qualidade": 82
+}
+
+# === CACHE HTTP (GEOCODIFICAÇÃO E CLIMA) ====================================
+# URLs base podem ser trocadas por variáveis de ambiente (p.ex. servidor local em testes)
+
+HTTP_CACHE_CONFIG = {
+    "db": os.path.join(DATA_DIR, "cache", "http_cache.db"),
+    "precisao_coordenadas": 3,   # casas decimais (~110 m)
+    "timeout": 10,               # segundos
+    "pool_conexoes": 16,         # conexões keep-alive por host
+    "user_agent": "PlasticBusters/1.0 (streamlit-app)",
+    "endpoints": {
+        "nominatim_reverse": {
+            "url": os.environ.get("PB_NOMINATIM_URL", "https://nominatim.openstreetmap.org") + "/reverse",
+            "parametros_coordenadas": ("lat", "lon"),
+            "ttl": 30 * 24 * 3600,      # nomes de lugares quase não mudam
+            "stale": 335 * 24 * 3600,   # janela extra servindo resposta antiga enquanto revalida
+        },
+        "nominatim_search": {
+            "url": os.environ.get("PB_NOMINATIM_URL", "https://nominatim.openstreetmap.org") + "/search",
+            "ttl": 180 * 24 * 3600,
+            "stale": 365 * 24 * 3600,
+        },
+        "open_meteo": {
+            "url": os.environ.get("PB_OPEN_METEO_URL", "https://api.open-meteo.com") + "/v1/forecast",
+            "parametros_coordenadas": ("latitude", "longitude"),
+            "ttl": 15 * 60,
+            "stale": 15 * 60,           # leitura "atual" com no máximo ~30 min ao ser exibida
+        },
+    },
+}
+
+# === ARMAZENAMENTO DE IMAGENS POR CONTEÚDO ==================================
+
+BLOB_CONFIG = {
+    "dir": os.path.join(DATA_DIR, "blobs"),   # <dir>/ab/cd/<sha256>
+    "bloco": 1024 * 1024,                      # tamanho do bloco de leitura/escrita
+    "carencia_gc": 3600,                       # segundos antes de apagar um blob sem referências
+}
+
+# === UPLOADS DE ANÁLISE ======================================================
+
+UPLOAD_CONFIG = {
+    "dir": os.path.join(UPLOAD_DIR, "analises"),   # <dir>/ab/<sha256>.<ext>
+    "bloco": 1024 * 1024,
+    "tamanho_max_mb": 50,       # por arquivo
+    "quota_total_mb": 2048,     # soma de todos os uploads guardados
+}
+
+# === CATÁLOGO DE MICRORGANISMOS DEGRADADORES ================================
+
+DEGRADERS_SQL_PATH = os.path.join(UPLOAD_DIR, "degraders_list_with_images.sql")
+
+# Índice de k-mers das sequências de enzimas (busca por similaridade)
+SEQUENCE_INDEX_CONFIG = {
+    "dir": os.path.join(DATA_DIR, "cache", "sequencias"),   # um subdiretório por versão do catálogo
+    "k": 3,                     # tamanho da palavra (aminoácidos)
+    "alfabeto": "ACDEFGHIKLMNPQRSTVWY",   # demais letras viram X
+    "min_compartilhados": 3,    # k-mers em comum para um candidato ser considerado
+    "max_candidatos": 200,      # candidatos pontuados após a filtragem
+}
+
+# Busca textual (SQLite FTS5): colunas indexadas e peso de cada uma no ranking BM25
+CATALOG_SEARCH_CONFIG = {
+    "db": os.path.join(DATA_DIR, "cache", "catalogo_busca.db"),
+    "colunas": {
+        "Microorganism": 10.0,
+        "Enzyme": 8.0,
+        "Plastic": 6.0,
+        "Isolation_location": 3.0,
+        "Isolation_environment": 3.0,
+        "Isolation_sample_type": 2.0,
+        "lineage": 2.0,
+        "Ref": 1.0,
+    },
+    "facetas": ("Plastic", "Isolation_environment"),
+    "limite": 50,
+}
+
+# === BUSCA EM LOTE DE DADOS AMBIENTAIS ======================================
+# Limites por serviço (o Nominatim público exige no máximo 1 requisição/s)
+
+ENV_FETCH_CONFIG = {
+    "limites": {
+        "nominatim_reverse": {"concorrencia": 1, "req_por_segundo": 1.0},
+        "open_meteo": {"concorrencia": 8, "req_por_segundo": 10.0},
+    },
+    "pontos_por_requisicao_clima": 100,   # Open-Meteo aceita listas de coordenadas
+    "tentativas": 3,          # total de tentativas por requisição
+    "espera_base": 0.5,       # segundos; dobra a cada nova tentativa
+    "threads": 16,            # threads de I/O usadas pelo laço assíncrono
+}
+
+# === CACHE OFFLINE DE TILES (MBTILES) =======================================
+
+TILE_CONFIG = {
+    "dir": os.path.join(DATA_DIR, "cache", "tiles"),   # um arquivo .mbtiles por fonte
+    "tamanho_max_mb": 512,        # por fonte; acima disso, remove os tiles menos acessados
+    # O mapa só aponta para o servidor local com PB_TILES_LOCAL=1 (uso offline na mesma máquina):
+    # o navegador resolve 127.0.0.1 no computador de quem acessa, não no do servidor
+    "servidor_local": os.environ.get("PB_TILES_LOCAL", "").strip().lower() in ("1", "true", "sim"),
+    "host": "127.0.0.1",
+    "porta": 8765,
+    "threads_semeadura": 8,
+    "fontes": {
+        "nasa_bluemarble": {
+            "url": ("https://gibs.earthdata.nasa.gov/wmts/epsg3857/best/"
+                    "BlueMarble_ShadedRelief_Bathymetry/default/2013-12-01/"
+                    "GoogleMapsCompatible_Level8/{z}/{y}/{x}.jpg"),
+            "formato": "jpg",
+            "zoom_max": 8,
+            "atribuicao": "NASA GIBS BlueMarble",
+        },
+        "carto_dark": {
+            "url": "https://{s}.basemaps.cartocdn.com/dark_all/{z}/{x}/{y}.png",
+            "formato": "png",
+            "zoom_max": 18,
+            "atribuicao": "© OpenStreetMap contributors © CARTO",
+        },
+        "esri_imagery": {
+            "url": "https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}",
+            "formato": "jpg",
+            "zoom_max": 18,
+            "atribuicao": "Tiles © Esri",
+        },
+    },
+    # Regiões pré-carregadas para uso em campo: bbox = (oeste, sul, leste, norte)
+    "regioes": {
+        "mundo": {"bbox": (-180, -85, 180, 85), "zoom": (0, 4)},
+        "brasil": {"bbox": (-74.0, -34.0, -34.0, 6.0), "zoom": (5, 7)},
+    },
+}
+
+# === CAMADAS GEOGRÁFICAS (PONTOS DE AMOSTRAGEM) =============================
+
+GEO_CONFIG = {
+    "pontos_amostragem": os.path.join(DATA_DIR, "processed", "pontos_geo.json"),
+    "max_pontos": 20000,        # acima disso, os pontos são rarefeitos por zoom
+    "pixels_por_celula": 4,     # rarefação: no máximo 1 ponto por célula de N×N pixels
+    "casas_decimais": 5,        # precisão das coordenadas no GeoJSON (~1 m)
+    # Agregação espacial para heatmaps
+    "forma_celula": "hex",      # "hex" ou "quadrado"
+    "celula_px": 24,            # tamanho da célula na tela, em pixels
+    "zooms_piramide": (0, 12),
+}
+
+# === PIPELINE DE DADOS (RAW → STAGING → PROCESSED) ==========================
+
+PIPELINE_CONFIG = {
+    "raw": os.path.join(DATA_DIR, "raw"),
+    "staging": os.path.join(DATA_DIR, "staging"),
+    "processed": os.path.join(DATA_DIR, "processed"),
+    "estado": os.path.join(DATA_DIR, "cache", "pipeline_estado.json"),   # hashes da última execução
+    "workers": 4,    # etapas independentes executadas em paralelo
+}
+
+# Download dos datasets brutos. Para uso offline/testes, PB_MIRROR_DIR aponta para um
+# diretório com os mesmos arquivos e PB_MIRROR_URL para um servidor substituto.
+DOWNLOAD_CONFIG = {
+    "manifesto": os.path.join(DATA_DIR, "cache", "downloads.json"),   # ETag, Last-Modified, SHA-256
+    "espelho_dir": os.environ.get("PB_MIRROR_DIR"),
+    "espelho_url": os.environ.get("PB_MIRROR_URL"),
+    "workers": 4,
+    "pool_conexoes": 8,
+    "timeout": 30,
+    "tentativas": 3,
+    "espera_base": 0.5,        # segundos; dobra a cada nova tentativa
+    "bloco": 64 * 1024,        # granularidade do que sobrevive a uma conexão interrompida
+    "fontes": {
+        # sha256 opcional: quando informado, o arquivo baixado precisa bater com ele
+        "env_conditions": {
+            "url": "https://datahub.io/core/global-temp/r/annual.csv",
+            "arquivo": "env_conditions.csv",
+            "sha256": None,
+        },
+    },
+}
+
+# Junção dos arquivos brutos em staging. Arquivos com a coluna "fato" são ensaios
+# (linhas reais); os demais são tabelas auxiliares unidas a eles pelas chaves em comum.
+STAGING_MERGE_CONFIG = {
+    "fato": "fungus_name",
+    "chaves": ["fungus_name", "plastic_type", "region", "year"],
+    "obrigatorias": ["fungus_name", "plastic_type"],    # linhas sem elas não entram em staging
+    "sinonimos": {
+        "organism": "fungus_name", "organismo": "fungus_name", "species": "fungus_name",
+        "fungo": "fungus_name", "plastic": "plastic_type", "plastico": "plastic_type",
+        "polymer": "plastic_type", "regiao": "region", "ano": "year",
+    },
+    # Chaves declaradas por arquivo auxiliar; sem declaração, usa as chaves em comum
+    "fontes": {
+        "env_conditions.csv": ["year"],
+    },
+    "linhas_por_bloco": 100_000,
+}
+
+# Datasets processados em Parquet particionado (diretórios coluna=valor) com catálogo
+# de arquivos e estatísticas por coluna, usado para podar partições na leitura.
+COLUMNAR_STORE_CONFIG = {
+    "dir": os.path.join(DATA_DIR, "processed", "colunar"),
+    "catalogo": os.path.join(DATA_DIR, "processed", "colunar", "catalogo.json"),
+    "particoes": {
+        "correlations": ["plastic_type"],
+        "symbiose_dataset": ["plastic_type"],
+    },
+    "compressao": "zstd",
+}
+
+# Versões dos datasets processados guardadas como diferenças de linhas (por hash da
+# linha): cada versão ocupa só as linhas que entraram e os hashes das que saíram.
+SNAPSHOT_CONFIG = {
+    "dir": os.path.join(DATA_DIR, "snapshots"),
+    "compressao": "zstd",
+}
+
 # === SUPORTE A FORMATOS DE DADOS ============================================
 
-SUPPORTED_FORMATS = ["csv", "json", "pdf", "db"]
+SUPPORTED_FORMATS = ["csv", "json", "pdf", "db", "parquet"]
 DEFAULT_ENCODING = "utf-8"
 
 # === VARIÁVEIS AMBIENTAIS RELEVANTES ========================================
@@ -83,6 +331,12 @@ COLOR_MAPS = {
 LOG_FILE = os.path.join(BASE_DIR, "logs", "system.log")
 os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
 
+# Ações de manutenção (p.ex. coleta de lixo dos blobs) só aparecem com PB_ADMIN=1
+MODO_ADMIN = os.environ.get("PB_ADMIN", "").strip().lower() in ("1", "true", "sim")
+
+# Diagnósticos de desenvolvimento (p.ex. tempo de importação dos módulos) só com PB_DEBUG=1
+MODO_DEBUG = os.environ.get("PB_DEBUG", "").strip().lower() in ("1", "true", "sim")
+
 # === CHAVES E CÓDIGOS =======================================================
 
 VERSION = "1.0.0"
@@ -0,0 +1,116 @@
+"""
+Módulo: image_pipeline.py
+Descrição: Miniaturas redimensionadas (WebP/PNG) para assets estáticos e imagens enviadas.
+           Os arquivos são nomeados pelo hash do conteúdo da imagem original, ficam em cache
+           em disco e são regenerados sob demanda quando a original muda.
+Autor: Samuel
+Data: 2025
+"""
+
+import os
+import tempfile
+
+from utils.cache import hash_arquivo
+from utils.constants import IMAGE_CONFIG
+from utils.logger import registrar_evento, registrar_erro
+
+# =============================================================================
+# 🖼️ Geração de miniaturas
+# =============================================================================
+
+_EXTENSOES = {"WEBP": "webp", "PNG": "png"}
+
+
+def _formato_suportado(formato: str) -> str:
+    """
+    Usa WebP quando disponível no Pillow; caso contrário, PNG.
+    """
+    from PIL import features
+
+    formato = (formato or IMAGE_CONFIG["formato"]).upper()
+    if formato == "WEBP" and not features.check("webp"):
+        return "PNG"
+    return formato if formato in _EXTENSOES else "PNG"
+
+
+def caminho_miniatura(hash_origem: str, largura: int, formato: str) -> str:
+    """
+    Caminho da miniatura no cache: <dir>/<2 primeiros do hash>/<hash>_<largura>.<ext>.
+    """
+    return os.path.join(
+        IMAGE_CONFIG["dir_miniaturas"], hash_origem[:2],
+        f"{hash_origem}_{largura}.{_EXTENSOES[formato]}"
+    )
+
+
+def _gerar(caminho_origem: str, destino: str, largura: int, formato: str):
+    from PIL import Image, ImageOps
+
+    with Image.open(caminho_origem) as img:
+        img = ImageOps.exif_transpose(img)
+        # Converte antes de redimensionar: em P (paleta) e 1 (1 bit) o Pillow só
+        # redimensiona por vizinho mais próximo, e a miniatura sairia serrilhada
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+        if img.width > largura:  # nunca amplia
+            altura = max(1, round(img.height * largura / img.width))
+            img = img.resize((largura, altura), Image.LANCZOS)
+
+        # Escrita atômica: outra sessão nunca lê uma miniatura pela metade
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        fd, temporario = tempfile.mkstemp(dir=os.path.dirname(destino), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                opcoes = {"quality": IMAGE_CONFIG["qualidade"], "method": 4} if formato == "WEBP" else {"optimize": True}
+                img.save(f, format=formato, **opcoes)
+            os.replace(temporario, destino)
+        except Exception:
+            os.remove(temporario)
+            raise
+
+
+def miniatura(caminho_origem: str, largura: int, formato: str = None) -> str:
+    """
+    Retorna o caminho de uma miniatura com a largura pedida, gerando-a no primeiro acesso.
+    Se a original mudar, o hash muda e uma nova miniatura é gerada automaticamente.
+    Em caso de falha, devolve o próprio caminho original.
+    """
+    try:
+        formato = _formato_suportado(formato)
+        destino = caminho_miniatura(hash_arquivo(caminho_origem), largura, formato)
+        if not os.path.exists(destino):
+            _gerar(caminho_origem, destino, largura, formato)
+            registrar_evento(f"Miniatura gerada: {destino} ({largura}px)")
+        return destino
+
+    except Exception as e:
+        registrar_erro("ImagePipeline", e)
+        return caminho_origem
+
+
+def gerar_miniaturas(caminho_origem: str, larguras=None, formato: str = None) -> dict:
+    """
+    Gera todas as larguras configuradas de uma vez (usado no momento do upload).
+    Retorna {largura: caminho}.
+    """
+    return {l: miniatura(caminho_origem, l, formato) for l in (larguras or IMAGE_CONFIG["larguras"])}
+
+
+# =============================================================================
+# 🧹 Manutenção do cache em disco
+# =============================================================================
+
+def limpar_miniaturas_orfas(caminhos_origem) -> int:
+    """
+    Remove miniaturas cujas originais não estão mais entre `caminhos_origem`
+    (p.ex. versões antigas de uma imagem substituída). Retorna quantas foram removidas.
+    """
+    validos = {hash_arquivo(c) for c in caminhos_origem if os.path.exists(c)}
+    removidos = 0
+    for raiz, _, arquivos in os.walk(IMAGE_CONFIG["dir_miniaturas"]):
+        for nome in arquivos:
+            if nome.split("_", 1)[0] not in validos:
+                os.remove(os.path.join(raiz, nome))
+                removidos += 1
+    registrar_evento(f"Limpeza de miniaturas: {removidos} arquivo(s) órfão(s) removido(s).")
+    return removidos
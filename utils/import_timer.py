@@ -0,0 +1,139 @@
+"""
+Módulo: import_timer.py
+Descrição: Mede o tempo de importação de cada módulo (próprio e acumulado) para
+           acompanhar regressões no tempo de inicialização do app.
+Autor: Samuel
+Data: 2025
+
+Uso (CLI):
+    python -m utils.import_timer                 # mede as páginas registradas no app
+    python -m utils.import_timer modules.mapa    # mede módulos específicos
+"""
+
+import sys
+import time
+import importlib
+
+# =============================================================================
+# ⏱️ Cronômetro de importação
+# =============================================================================
+
+# nome do módulo -> {"acumulado": s, "proprio": s}
+TEMPOS_IMPORTACAO = {}
+
+_pilha = []  # [nome, início, tempo dos filhos] dos módulos em execução
+
+
+class _CronometroImportacao:
+    """
+    Finder colocado no início de sys.meta_path. Não resolve nada sozinho: pergunta aos
+    demais finders pelo spec e envolve o `exec_module` do loader com a medição de tempo.
+    """
+
+    def find_spec(self, nome, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(nome, path, target)
+            if spec is not None:
+                _envolver_loader(spec)
+                return spec
+        return None
+
+
+def _envolver_loader(spec):
+    loader = spec.loader
+    # Loaders de classe (builtin/frozen) são compartilhados: não são instrumentados
+    if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+        return
+    if getattr(loader.exec_module, "_cronometrado", False):
+        return
+
+    exec_original = loader.exec_module
+
+    def exec_module(module):
+        _pilha.append([module.__name__, time.perf_counter(), 0.0])
+        try:
+            exec_original(module)
+        finally:
+            nome, inicio, filhos = _pilha.pop()
+            acumulado = time.perf_counter() - inicio
+            TEMPOS_IMPORTACAO[nome] = {"acumulado": acumulado, "proprio": acumulado - filhos}
+            if _pilha:
+                _pilha[-1][2] += acumulado
+
+    exec_module._cronometrado = True
+    loader.exec_module = exec_module
+
+
+_cronometro = _CronometroImportacao()
+
+
+def iniciar_cronometro():
+    """
+    Ativa a medição (idempotente). Só mede módulos importados depois da chamada.
+    """
+    if _cronometro not in sys.meta_path:
+        sys.meta_path.insert(0, _cronometro)
+
+
+def parar_cronometro():
+    """
+    Remove o finder de medição de sys.meta_path.
+    """
+    if _cronometro in sys.meta_path:
+        sys.meta_path.remove(_cronometro)
+
+
+def importar_com_tempo(nome_modulo: str):
+    """
+    Importa um módulo e devolve (módulo, segundos gastos), inclusive dependências novas.
+    """
+    inicio = time.perf_counter()
+    modulo = importlib.import_module(nome_modulo)
+    return modulo, time.perf_counter() - inicio
+
+
+def relatorio_importacao(top: int = 25) -> list:
+    """
+    Lista os módulos mais caros ordenados pelo tempo acumulado (ms).
+    Cada item: {"modulo", "acumulado_ms", "proprio_ms"}.
+    """
+    itens = sorted(TEMPOS_IMPORTACAO.items(), key=lambda kv: kv[1]["acumulado"], reverse=True)
+    return [
+        {
+            "modulo": nome,
+            "acumulado_ms": round(t["acumulado"] * 1000, 1),
+            "proprio_ms": round(t["proprio"] * 1000, 1),
+        }
+        for nome, t in itens[:top]
+    ]
+
+
+# =============================================================================
+# 🖥️ Linha de comando
+# =============================================================================
+
+def main(argv=None) -> int:
+    alvos = list(argv if argv is not None else sys.argv[1:])
+    if not alvos:
+        from utils.pages import PAGINAS
+        alvos = [modulo for modulo, _, _ in PAGINAS.values()]
+
+    iniciar_cronometro()
+    for alvo in alvos:
+        try:
+            _, segundos = importar_com_tempo(alvo)
+            print(f"{alvo:<40} {segundos * 1000:>9.1f} ms")
+        except Exception as e:
+            print(f"{alvo:<40} falhou: {e}")
+    parar_cronometro()
+
+    print(f"\n{'módulo':<50} {'acumulado':>11} {'próprio':>11}")
+    for item in relatorio_importacao():
+        print(f"{item['modulo']:<50} {item['acumulado_ms']:>8.1f} ms {item['proprio_ms']:>8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""
+Módulo: pages.py
+Descrição: Registro das páginas do app com importação preguiçosa (o módulo da página
+           só é carregado na primeira vez em que ela é selecionada).
+Autor: Samuel
+Data: 2025
+"""
+
+import importlib
+
+# =============================================================================
+# 📑 Registro de páginas — título: (módulo, função, ícone do menu)
+# =============================================================================
+
+PAGINAS = {
+    "Home": ("modules.home", "home", "house"),
+    "Mapa": ("modules.mapa", "mapa", "map"),
+    "Dashboard": ("modules.dashboard", "dashboard_analitico", "bar-chart"),
+    "Preditor": ("modules.predictor", "predictor", "robot"),
+    "Catálogo": ("modules.catalogo", "catalogo", "journal-text"),
+    "Inserir Plástico": ("modules.plasticoInsert", "inserir_plastico", "box-seam"),
+    "Inserir Fungo": ("modules.fungoInsert", "inserir_fungo", "bug"),
+    "Sobre": ("modules.sobre", "sobre", "info-circle"),
+}
+
+
+def carregar_pagina(titulo: str):
+    """
+    Retorna a função de renderização da página, importando o módulo sob demanda.
+    Módulos já importados vêm direto de sys.modules (sem custo nas próximas execuções).
+    """
+    modulo, funcao, _ = PAGINAS[titulo]
+    return getattr(importlib.import_module(modulo), funcao)